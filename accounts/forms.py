@@ -94,4 +94,4 @@ class ProfileUpdateForm(forms.ModelForm):
         self.fields['website_url'].widget.attrs.update({'class': 'form-control', 'placeholder': 'https://...'})
         self.fields['default_avatar_choice'].widget.attrs.update({'class': 'form-select'})
 
-        logger.debug(f"ProfileUpdateForm initialized for instance: {self.instance}")
+        logger.debug("ProfileUpdateForm initialized for instance: %s", self.instance)
@@ -1,11 +1,13 @@
 # accounts/models.py
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from django.templatetags.static import static 
 
+from core.page_cache import list_tag, object_tag, purge_instance
+
 class Profile(models.Model):
     """
     Extends Django's base User model to include additional user information,
@@ -115,4 +117,14 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
     # This part ensures that if you save a User, its related Profile
     # is also saved, which can be useful for other signals.
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+
+# --- Page cache invalidation ---
+@receiver([post_save, post_delete], sender=Profile)
+def purge_page_cache_on_profile_change(sender, instance, **kwargs):
+    """
+    Invalidates the public profile page, the user directory and the pages
+    with a user directory widget.
+    """
+    purge_instance(instance, object_tag(instance.user), list_tag(User))
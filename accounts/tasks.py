@@ -0,0 +1,24 @@
+# File: accounts/tasks.py
+import logging
+
+from django.core.files.storage import default_storage
+
+from core.tasks import task
+from .models import Profile
+
+logger = logging.getLogger(__name__)
+
+
+@task
+def delete_avatar_file(name):
+    """
+    Deletes a replaced custom avatar from the storage. The default avatars
+    (static images) are never deleted.
+    """
+    if name in Profile.AvatarChoice.values:
+        return
+    if Profile.objects.filter(avatar=name).exists():
+        # Still in use (e.g. the profile was saved again with it).
+        return
+    default_storage.delete(name)
+    logger.info("Deleted replaced avatar file %s", name)
@@ -17,6 +17,8 @@ from .models import Profile # Model for user profiles
 from blog.models import Post, Comment # Models for posts and comments
 from django.urls import reverse
 from site_settings.models import SiteConfiguration 
+from core.page_cache import add_surrogate_keys, list_tag, object_tag
+from .tasks import delete_avatar_file
 
 # Get a logger instance for this module.
 logger = logging.getLogger(__name__)
@@ -29,12 +31,12 @@ def signup_view(request):
         form = CustomUserCreationForm(request.POST)
         if form.is_valid():
             user = form.save()
-            logger.info(f"New user account created: '{user.username}' (ID: {user.id})")
+            logger.info("New user account created: '%s' (ID: %s)", user.username, user.id)
             login(request, user)
             messages.success(request, gettext("Welcome! Your account has been created successfully."))
             return redirect('home')
         else:
-            logger.warning(f"Signup form failed validation. Errors: {form.errors.as_json()}")
+            logger.warning("Signup form failed validation. Errors: %s", form.errors.as_json())
     else:
         form = CustomUserCreationForm()
         
@@ -61,21 +63,25 @@ def profile_edit_view(request):
                 extension = os.path.splitext(uploaded_file.name)[1]
                 new_filename = f"avatars/{uuid.uuid4().hex}{extension}"
                 
-                # Si ya existe una imagen personalizada, la borramos para no dejar basura.
-                if profile.avatar and os.path.exists(profile.avatar.path):
-                    default_paths = [c[0] for c in profile.AvatarChoice.choices]
-                    if profile.avatar.name not in default_paths:
-                        os.remove(profile.avatar.path)
-                
+                old_avatar = profile.avatar.name
+
                 # Guardamos el nuevo archivo con el nuevo nombre.
                 profile.avatar.save(new_filename, uploaded_file)
-                logger.info(f"User '{request.user.username}' uploaded new avatar, saved as {new_filename}")
+
+                # Si ya existía una imagen personalizada, se borra en segundo plano para no dejar basura.
+                if old_avatar and old_avatar not in profile.AvatarChoice.values:
+                    delete_avatar_file.enqueue(name=old_avatar)
+                logger.info("User '%s' uploaded new avatar, saved as %s", request.user.username, new_filename)
             
             # Caso 2: El usuario marcó "Limpiar".
             elif profile_form.cleaned_data.get('avatar-clear'):
                 chosen_default = profile_form.cleaned_data.get('default_avatar_choice')
+                old_avatar = profile.avatar.name
                 profile.avatar = chosen_default
-                logger.info(f"User '{request.user.username}' cleared avatar, reverting to {chosen_default}")
+                if old_avatar and old_avatar not in profile.AvatarChoice.values:
+                    # Se borra después de profile.save(), en segundo plano.
+                    delete_avatar_file.enqueue_with({'name': old_avatar}, delay=60)
+                logger.info("User '%s' cleared avatar, reverting to %s", request.user.username, chosen_default)
 
             # Actualizamos los otros campos del perfil desde los datos validados del formulario
             profile.display_name = profile_form.cleaned_data['display_name']
@@ -116,19 +122,20 @@ def user_profile_public_view(request, username):
         user_obj = get_object_or_404(User, username=username)
         # Ensure the user has an associated profile
         if not hasattr(user_obj, 'profile') or user_obj.profile is None:
-            logger.warning(f"User '{username}' does not have an associated profile. Creating one.")
+            logger.warning("User '%s' does not have an associated profile. Creating one.", username)
             # This should ideally not happen due to the signal, but as a failsafe
             profile = user_obj.profile = Profile.objects.create(user=user_obj)
         else:
             profile = user_obj.profile
 
-        logger.info(f"Public profile view accessed for user: '{username}'.")
+        logger.info("Public profile view accessed for user: '%s'.", username)
+        add_surrogate_keys(request, object_tag(user_obj), object_tag(profile), list_tag(Post), list_tag(Comment))
 
         # --- User's Blog Posts (Publicly visible) ---
         user_posts = Post.objects.filter(
             author=user_obj, 
             status='published'
-        ).order_by('-published_date')
+        ).for_list().order_by('-published_date')
 
         # --- User's Comments (Approved and publicly visible) ---
         user_comments = Comment.objects.filter(
@@ -165,10 +172,10 @@ def user_profile_public_view(request, username):
         return render(request, 'accounts/public_profile_view.html', context)
 
     except User.DoesNotExist:
-        logger.warning(f"Public profile requested for non-existent user: '{username}'.")
+        logger.warning("Public profile requested for non-existent user: '%s'.", username)
         raise
     except Exception as e:
-        logger.error(f"Error accessing public profile for user '{username}': {e}", exc_info=True)
+        logger.error("Error accessing public profile for user '%s': %s", username, e, exc_info=True)
         raise # Re-raise for Django to handle 500 error page
 
 def user_directory_view(request):
@@ -181,6 +188,7 @@ def user_directory_view(request):
         is_active=True,
         profile__is_listed_publicly=True
     ).order_by('username')
+    add_surrogate_keys(request, list_tag(User), list_tag(Profile))
     
     # 2. Get pagination settings.
     try:
@@ -204,7 +212,7 @@ def user_directory_view(request):
         else:
             users_on_page = []
 
-    logger.info(f"User directory view accessed. Showing page {getattr(users_on_page, 'number', 0)} of {getattr(users_on_page, 'paginator.num_pages', 0)} users.")
+    logger.info("User directory view accessed. Showing page %s of %s.", getattr(users_on_page, 'number', 0), paginator.num_pages)
     breadcrumbs = [
         {"url": "/", "label": gettext("Home")},
         {"url": "", "label": gettext("Users")},
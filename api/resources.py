@@ -0,0 +1,404 @@
+# File: api/resources.py
+"""
+What each endpoint of the JSON API serves (see api/views.py).
+
+A Resource declares:
+
+- get_queryset(): the same optimized querysets as the HTML views (for_list(),
+  published objects only), in the requested language;
+- fields: {name: getter(obj, context)}, and the default ones;
+- field_prefetches / field_undefers: what a field needs loaded. Only the
+  requested fields add their prefetch query (or full-text columns), so a list
+  costs 1 query plus at most one per requested relation;
+- ordering: the order of the lists, also used as the pagination cursor
+  (the last pk is always part of it, to break ties);
+- cache_tags: the page cache tags purged when its data changes (ETag).
+"""
+from django.conf import settings
+from django.db.models import Q
+
+from core.feeds import url_template
+from core.page_cache import list_tag
+
+
+def _date(value):
+    return value.isoformat() if value else None
+
+
+def _file_url(context, file):
+    return context['base_url'] + file.url if file else None
+
+
+def _author(obj, context):
+    author = obj.author
+    return {'id': author.pk, 'username': author.username, 'name': author.get_full_name() or author.username}
+
+
+def _categories(obj, context):
+    return [{'id': category.pk, 'name': category.name, 'slug': category.slug} for category in obj.categories.all()]
+
+
+def _translated(name):
+    """ Getter of a parler field: the active language, or its fallback. """
+    return lambda obj, context: obj.safe_translation_getter(name, any_language=True)
+
+
+class Resource:
+    name = None
+    model = None
+    fields = {}
+    default_fields = ()
+    field_prefetches = {}
+    field_undefers = ()
+    ordering = ('pk',)
+    # Query parameters filtering the list: {parameter: callable(queryset, value)}.
+    filters = {}
+    # Nested lists (/posts/<id>/comments/): the field matching the parent id.
+    parent_field = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_cache_tags(self):
+        return [list_tag(self.model)]
+
+    def get_context(self, request):
+        """ Values computed once per response (not per object). """
+        return {'base_url': f'{request.scheme}://{request.get_host()}'}
+
+    def prepare_queryset(self, queryset, fields):
+        lookups = {lookup for field in fields for lookup in self.field_prefetches.get(field, ())}
+        if lookups:
+            queryset = queryset.prefetch_related(*sorted(lookups))
+        if any(field in self.field_undefers for field in fields):
+            queryset = queryset.defer(None)
+        return queryset
+
+    def serialize(self, obj, fields, context):
+        return {field: self.fields[field](obj, context) for field in fields}
+
+
+# --- blog (modeltranslation) ---
+
+class BlogPostResource(Resource):
+    name = 'blog-posts'
+    ordering = ('-published_date', '-pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'title': lambda obj, context: obj.title,
+        'slug': lambda obj, context: obj.slug,
+        'url': lambda obj, context: context['base_url'] + context['post_url'].format(
+            year=obj.published_date.year, month=obj.published_date.month, day=obj.published_date.day, slug=obj.slug,
+        ),
+        'excerpt': lambda obj, context: obj.excerpt,
+        'content': lambda obj, context: str(obj.rendered_content),
+        'reading_time': lambda obj, context: obj.reading_time,
+        'published_date': lambda obj, context: _date(obj.published_date),
+        'updated_at': lambda obj, context: _date(obj.updated_at),
+        'author': _author,
+        'featured_image': lambda obj, context: _file_url(context, obj.featured_image),
+        'categories': _categories,
+        'tags': lambda obj, context: [tag.name for tag in obj.tags.all()],
+        'views_count': lambda obj, context: obj.views_count,
+    }
+    default_fields = ('id', 'title', 'slug', 'url', 'excerpt', 'published_date', 'author', 'featured_image')
+    field_prefetches = {'categories': ['categories'], 'tags': ['tags']}
+    field_undefers = ('content',)
+    filters = {
+        'category': lambda queryset, value: queryset.filter(categories__slug=value),
+        'tag': lambda queryset, value: queryset.filter(tags__slug=value),
+    }
+
+    @property
+    def model(self):
+        from blog.models import Post
+        return Post
+
+    def get_queryset(self):
+        return self.model.objects.filter(status='published').for_list()
+
+    def get_context(self, request):
+        return {**super().get_context(request), 'post_url': url_template('blog:post_detail', 'year', 'month', 'day', 'slug')}
+
+    def get_cache_tags(self):
+        from categories.models import Category
+        from taggit.models import Tag
+        return [list_tag(self.model), list_tag(Category), list_tag(Tag)]
+
+
+class PageResource(Resource):
+    name = 'pages'
+    # Lower importance_order first, as in the search results.
+    ordering = ('importance_order', 'pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'title': lambda obj, context: obj.title,
+        'slug': lambda obj, context: obj.slug,
+        'url': lambda obj, context: context['base_url'] + context['page_url'].format(slug=obj.slug),
+        'excerpt': lambda obj, context: obj.excerpt,
+        'content': lambda obj, context: str(obj.rendered_content),
+        'reading_time': lambda obj, context: obj.reading_time,
+        'is_homepage': lambda obj, context: obj.is_homepage,
+        'updated_at': lambda obj, context: _date(obj.updated_at),
+        'author': _author,
+        'featured_image': lambda obj, context: _file_url(context, obj.featured_image),
+        'categories': _categories,
+    }
+    default_fields = ('id', 'title', 'slug', 'url', 'excerpt', 'updated_at')
+    field_prefetches = {'categories': ['categories']}
+    field_undefers = ('content',)
+
+    @property
+    def model(self):
+        from pages.models import Page
+        return Page
+
+    def get_queryset(self):
+        return self.model.objects.filter(status='published').for_list().select_related('author')
+
+    def get_context(self, request):
+        return {**super().get_context(request), 'page_url': url_template('pages:page_detail', 'slug')}
+
+    def get_cache_tags(self):
+        from categories.models import Category
+        return [list_tag(self.model), list_tag(Category)]
+
+
+class CategoryResource(Resource):
+    name = 'categories'
+    # Tree order: each category comes after its parent.
+    ordering = ('tree_id', 'lft', 'pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'name': lambda obj, context: obj.name,
+        'slug': lambda obj, context: obj.slug,
+        'description': lambda obj, context: obj.description,
+        'parent': lambda obj, context: obj.parent_id,
+        'level': lambda obj, context: obj.level,
+    }
+    default_fields = ('id', 'name', 'slug', 'parent', 'level')
+
+    @property
+    def model(self):
+        from categories.models import Category
+        return Category
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+
+class BlogTagResource(Resource):
+    """ Tags of the blog posts (django-taggit). """
+    name = 'blog-tags'
+    ordering = ('name', 'pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'name': lambda obj, context: obj.name,
+        'slug': lambda obj, context: obj.slug,
+    }
+    default_fields = ('id', 'name', 'slug')
+
+    @property
+    def model(self):
+        from taggit.models import Tag
+        return Tag
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+
+class BlogCommentResource(Resource):
+    """ Approved comments of a blog post, in thread order. """
+    name = 'blog-comments'
+    ordering = ('tree_id', 'lft', 'pk')
+    parent_field = 'post_id'
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'post': lambda obj, context: obj.post_id,
+        'parent': lambda obj, context: obj.parent_id,
+        'level': lambda obj, context: obj.level,
+        'author': lambda obj, context: obj.user.username if obj.user else obj.author_name,
+        'content': lambda obj, context: obj.content,
+        'created_at': lambda obj, context: _date(obj.created_at),
+    }
+    default_fields = ('id', 'parent', 'level', 'author', 'content', 'created_at')
+
+    @property
+    def model(self):
+        from blog.models import Comment
+        return Comment
+
+    def get_queryset(self):
+        return self.model.objects.filter(is_approved=True, post__status='published').select_related('user')
+
+    def get_cache_tags(self):
+        from blog.models import Post
+        return [list_tag(self.model), list_tag(Post)]
+
+
+# --- posts, tags, comments and publications (parler) ---
+
+class PostResource(Resource):
+    name = 'posts'
+    ordering = ('-published_date', '-pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'title': _translated('title'),
+        'slug': _translated('slug'),
+        'url': lambda obj, context: context['base_url'] + context['post_url'].format(
+            year=obj.published_date.year, month=obj.published_date.month, day=obj.published_date.day,
+            slug=obj.safe_translation_getter('slug', any_language=True),
+        ),
+        'excerpt': _translated('excerpt'),
+        'content': lambda obj, context: str(obj.rendered_content),
+        'reading_time': _translated('reading_time'),
+        'published_date': lambda obj, context: _date(obj.published_date),
+        'updated_at': lambda obj, context: _date(obj.updated_at),
+        'author': _author,
+        'featured_image': lambda obj, context: _file_url(context, obj.featured_image),
+        'categories': _categories,
+        'tags': lambda obj, context: [{'id': tag.pk, 'slug': tag.slug, 'label': str(tag)} for tag in obj.tags.all()],
+        'views_count': lambda obj, context: obj.views_count,
+    }
+    default_fields = ('id', 'title', 'slug', 'url', 'excerpt', 'published_date', 'author', 'featured_image')
+    field_prefetches = {'categories': ['categories'], 'tags': ['tags', 'tags__translations']}
+    filters = {
+        'category': lambda queryset, value: queryset.filter(categories__slug=value),
+        'tag': lambda queryset, value: queryset.filter(tags__slug=value),
+    }
+
+    @property
+    def model(self):
+        from posts.models import Post
+        return Post
+
+    def get_queryset(self):
+        return self.model.objects.filter(status='published').for_list()
+
+    def get_context(self, request):
+        return {**super().get_context(request), 'post_url': url_template('posts:post_detail', 'year', 'month', 'day', 'slug')}
+
+    def get_cache_tags(self):
+        from categories.models import Category
+        from tags.models import Tag
+        return [list_tag(self.model), list_tag(Category), list_tag(Tag)]
+
+
+class TagResource(Resource):
+    """ Tags of the posts (parler). """
+    name = 'tags'
+    ordering = ('slug', 'pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'slug': lambda obj, context: obj.slug,
+        'label': _translated('label'),
+    }
+    default_fields = ('id', 'slug', 'label')
+
+    @property
+    def model(self):
+        from tags.models import Tag
+        return Tag
+
+    def get_queryset(self):
+        return self.model.objects.prefetch_related('translations')
+
+
+class CommentResource(Resource):
+    """ Approved comments of a post, in thread order. """
+    name = 'comments'
+    ordering = ('tree_id', 'lft', 'pk')
+    parent_field = 'post_id'
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'post': lambda obj, context: obj.post_id,
+        'parent': lambda obj, context: obj.parent_id,
+        'level': lambda obj, context: obj.level,
+        'author': lambda obj, context: obj.user.username if obj.user else obj.author_name,
+        'content': lambda obj, context: obj.content,
+        'language': lambda obj, context: obj.language,
+        'created_at': lambda obj, context: _date(obj.created_at),
+    }
+    default_fields = ('id', 'parent', 'level', 'author', 'content', 'language', 'created_at')
+
+    @property
+    def model(self):
+        from comments.models import Comment
+        return Comment
+
+    def get_queryset(self):
+        return self.model.objects.filter(is_approved=True, post__status='published').select_related('user')
+
+    def get_cache_tags(self):
+        from posts.models import Post
+        return [list_tag(self.model), list_tag(Post)]
+
+
+class PublicationResource(Resource):
+    name = 'publications'
+    ordering = ('-publication_date', '-pk')
+    fields = {
+        'id': lambda obj, context: obj.pk,
+        'title': _translated('title'),
+        'slug': _translated('slug'),
+        'url': lambda obj, context: context['base_url'] + context['publication_url'].format(
+            slug=obj.safe_translation_getter('slug', any_language=True),
+        ),
+        'abstract': _translated('abstract'),
+        'content': lambda obj, context: str(obj.rendered_content),
+        'publication_date': lambda obj, context: _date(obj.publication_date),
+        'updated_at': lambda obj, context: _date(obj.updated_at),
+        'doi': lambda obj, context: obj.doi,
+        'featured_image': lambda obj, context: _file_url(context, obj.featured_image),
+        'attachment': lambda obj, context: _file_url(context, obj.attachment),
+        'authors': lambda obj, context: [
+            {'id': author.pk, 'username': author.username, 'name': author.get_full_name() or author.username}
+            for author in obj.authors.all()
+        ],
+        'categories': _categories,
+    }
+    default_fields = ('id', 'title', 'slug', 'url', 'publication_date', 'authors')
+    field_prefetches = {'authors': ['authors'], 'categories': ['categories']}
+
+    @property
+    def model(self):
+        from publications.models import Publication
+        return Publication
+
+    def get_queryset(self):
+        return self.model.objects.filter(is_published=True).prefetch_related('translations')
+
+    def get_context(self, request):
+        return {**super().get_context(request), 'publication_url': url_template('publications:publication_detail', 'slug')}
+
+    def get_cache_tags(self):
+        from categories.models import Category
+        return [list_tag(self.model), list_tag(Category)]
+
+
+RESOURCES = {
+    resource.name: resource
+    for resource in (
+        BlogPostResource(), PageResource(), CategoryResource(), BlogTagResource(), BlogCommentResource(),
+        PostResource(), TagResource(), CommentResource(), PublicationResource(),
+    )
+}
+
+
+def get_languages():
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def cursor_filter(ordering, values):
+    """
+    Q selecting the rows after `values` (the ordering values of the last row
+    of the previous page): (a > x) OR (a = x AND b > y) OR ...
+    """
+    query = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        operator = 'lt' if field.startswith('-') else 'gt'
+        query |= Q(**equal, **{f'{name}__{operator}': value})
+        equal[name] = value
+    return query
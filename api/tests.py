@@ -0,0 +1,61 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from blog.models import Post as BlogPost
+from core.testing import LocMemCacheTestCase
+
+
+class CursorPaginationTests(LocMemCacheTestCase):
+    """ Lists of the JSON API, paginated with a cursor. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        same_day = datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc)
+        # Posts sharing a date: the pk breaks the tie, so no page repeats or skips one.
+        cls.posts = [
+            BlogPost.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', author=author, content='<p>Text</p>', status='published',
+                published_date=same_day if i < 3 else datetime(2025, 6, i, tzinfo=dt_timezone.utc),
+            )
+            for i in range(1, 8)
+        ]
+        BlogPost.objects.create(title='Draft', slug='draft', author=author, content='<p>Text</p>', status='draft')
+
+    def get_pages(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertLessEqual(len(data['results']), 2)
+            ids.extend(result['id'] for result in data['results'])
+            url = data['next']
+        return ids
+
+    def test_pages_cover_every_published_post_once(self):
+        ids = self.get_pages(reverse('api:blog_post_list') + '?limit=2&fields=id')
+        expected = sorted(self.posts, key=lambda post: (post.published_date, post.pk), reverse=True)
+        self.assertEqual(ids, [post.pk for post in expected])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('api:blog_post_list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sparse_fields(self):
+        response = self.client.get(reverse('api:blog_post_list'), {'fields': 'id,title', 'limit': 1})
+        self.assertEqual(list(response.json()['results'][0]), ['id', 'title'])
+        response = self.client.get(reverse('api:blog_post_list'), {'fields': 'id,unknown'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unchanged_list_gets_a_304(self):
+        url = reverse('api:blog_post_list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        post = self.posts[0]
+        post.title = 'Renamed'
+        post.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,27 @@
+# File: api/urls.py
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+
+def _resource_urls(prefix, resource, name):
+    return [
+        path(f'{prefix}/', views.object_list, {'resource': resource}, name=f'{name}_list'),
+        path(f'{prefix}/<int:pk>/', views.object_detail, {'resource': resource}, name=f'{name}_detail'),
+    ]
+
+
+urlpatterns = [
+    *_resource_urls('blog/posts', 'blog-posts', 'blog_post'),
+    path('blog/posts/<int:parent_id>/comments/', views.object_list, {'resource': 'blog-comments'},
+         name='blog_post_comments'),
+    *_resource_urls('blog/tags', 'blog-tags', 'blog_tag'),
+    *_resource_urls('posts', 'posts', 'post'),
+    path('posts/<int:parent_id>/comments/', views.object_list, {'resource': 'comments'}, name='post_comments'),
+    *_resource_urls('tags', 'tags', 'tag'),
+    *_resource_urls('pages', 'pages', 'page'),
+    *_resource_urls('categories', 'categories', 'category'),
+    *_resource_urls('publications', 'publications', 'publication'),
+]
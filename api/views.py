@@ -0,0 +1,201 @@
+# File: api/views.py
+"""
+Read-only JSON API of the published content (resources in api/resources.py).
+
+    GET /api/<resource>/               list, newest first (or tree order)
+    GET /api/<resource>/<id>/          one object
+    GET /api/posts/<id>/comments/      approved comments of a post
+
+Query parameters:
+
+    fields=id,title,url   only these fields (default: each resource's usual
+                          ones). Relations and full texts are only loaded
+                          when requested.
+    lang=es               language of the translated fields (default: the
+                          request's language).
+    limit=20              page size (at most MAX_LIMIT).
+    cursor=...            the `next` cursor of the previous page.
+
+Pagination uses a cursor (the ordering values of the last object), not an
+offset, so every page costs the same query and concurrent inserts don't
+repeat or skip objects.
+
+Responses are validated and cached like the feeds (core/feeds.py): the ETag
+comes from the page cache versions of the resource's tags, a matching
+If-None-Match gets a 304 without touching the content tables, and the JSON
+is stored per ETag until one of those tags is purged.
+"""
+import base64
+import binascii
+import json
+import logging
+
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+
+from core.conditional import get_tag_validators
+from core.page_cache import add_surrogate_keys
+from .resources import RESOURCES, cursor_filter, get_languages
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+API_CACHE_TIMEOUT = 24 * 3600
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _get_fields(request, resource):
+    value = request.GET.get('fields')
+    if not value:
+        return list(resource.default_fields)
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in resource.fields]
+    if unknown:
+        raise ApiError("Unknown fields: %s. Available: %s." % (', '.join(unknown), ', '.join(resource.fields)))
+    return fields
+
+
+def _get_language(request):
+    lang = request.GET.get('lang')
+    if lang is None:
+        return translation.get_language()
+    if lang not in get_languages():
+        raise ApiError("Unknown language: %s. Available: %s." % (lang, ', '.join(get_languages())))
+    return lang
+
+
+def _get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError("limit must be an integer.")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ApiError("limit must be between 1 and %d." % MAX_LIMIT)
+    return limit
+
+
+def encode_cursor(values):
+    data = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, ordering):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ApiError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ApiError("Invalid cursor.")
+    return values
+
+
+def _ordering_values(obj, ordering):
+    return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+
+def _build_list(request, resource, fields, parent_id):
+    queryset = resource.get_queryset()
+    if parent_id is not None:
+        queryset = queryset.filter(**{resource.parent_field: parent_id})
+    for parameter, apply_filter in resource.filters.items():
+        value = request.GET.get(parameter)
+        if value:
+            queryset = apply_filter(queryset, value)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(cursor_filter(resource.ordering, decode_cursor(cursor, resource.ordering)))
+
+    limit = _get_limit(request)
+    queryset = resource.prepare_queryset(queryset.order_by(*resource.ordering), fields)
+    # One extra row tells whether there is a next page, without a COUNT(*).
+    try:
+        objects = list(queryset[:limit + 1])
+    except (ValidationError, ValueError, TypeError):
+        # A cursor value the ordering columns can't take.
+        raise ApiError("Invalid cursor.")
+    has_next = len(objects) > limit
+    objects = objects[:limit]
+
+    context = resource.get_context(request)
+    next_url = None
+    if has_next:
+        query = request.GET.copy()
+        query['cursor'] = encode_cursor(_ordering_values(objects[-1], resource.ordering))
+        next_url = '%s%s?%s' % (context['base_url'], request.path, query.urlencode())
+    return {
+        'results': [resource.serialize(obj, fields, context) for obj in objects],
+        'next': next_url,
+    }
+
+
+def _build_detail(request, resource, fields, pk):
+    obj = resource.prepare_queryset(resource.get_queryset(), fields).get(pk=pk)
+    return resource.serialize(obj, fields, resource.get_context(request))
+
+
+def _respond(request, resource, build):
+    """
+    Validates the request, answers conditional GETs, and serves the JSON of
+    `build(fields)` from the cache when its tags haven't changed.
+    """
+    try:
+        fields = _get_fields(request, resource)
+        language = _get_language(request)
+    except ApiError as error:
+        return _error(str(error), error.status)
+
+    with translation.override(language):
+        tags = resource.get_cache_tags()
+        add_surrogate_keys(request, *tags)
+        etag, last_modified = get_tag_validators(request, tags, resource.name)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache_key = f'api:{etag.strip(chr(34))}'
+            content = cache.get(cache_key)
+            if content is None:
+                try:
+                    data = build(fields)
+                except ApiError as error:
+                    return _error(str(error), error.status)
+                except ObjectDoesNotExist:
+                    return _error("Not found.", 404)
+                content = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8')
+                logger.debug("API response built for %s (%d bytes)", request.get_full_path(), len(content))
+                cache.set(cache_key, content, API_CACHE_TIMEOUT)
+            response = HttpResponse(content, content_type='application/json')
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+
+    response['ETag'] = etag
+    response['Content-Language'] = language
+    patch_vary_headers(response, ['Accept-Language'])
+    return response
+
+
+@require_GET
+def object_list(request, resource, parent_id=None):
+    resource = RESOURCES[resource]
+    return _respond(request, resource, lambda fields: _build_list(request, resource, fields, parent_id))
+
+
+@require_GET
+def object_detail(request, resource, pk):
+    resource = RESOURCES[resource]
+    return _respond(request, resource, lambda fields: _build_detail(request, resource, fields, pk))
@@ -0,0 +1,120 @@
+# File: blog/feeds.py
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.translation import gettext
+from taggit.models import Tag
+
+from categories.models import Category
+from core.feeds import FEED_SIZE, CachedFeed, language_url_template
+from core.page_cache import list_tag, object_tag
+from .models import Post
+
+
+class LatestPostsFeed(CachedFeed):
+    """
+    RSS feed of the latest published blog posts, in the active language.
+    The items come from one query (authors joined, categories prefetched)
+    and their description is the excerpt stored at save time.
+    """
+
+    def get_cache_tags(self, obj):
+        return [list_tag(Post)]
+
+    def title(self, obj):
+        return gettext("Blog")
+
+    def link(self, obj):
+        return reverse('blog:post_list')
+
+    def description(self, obj):
+        return gettext("Latest blog posts")
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(status='published')
+
+    def items(self, obj):
+        return list(
+            self.get_queryset(obj).for_list().prefetch_related('categories')
+            .order_by('-published_date')[:FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.meta_description or item.excerpt
+
+    def item_link(self, item):
+        date = item.published_date
+        link_template = language_url_template('blog:post_detail', 'year', 'month', 'day', 'slug')
+        return link_template.format(year=date.year, month=date.month, day=date.day, slug=item.slug)
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return [category.name for category in item.categories.all()]
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    """ RSS feed of the latest blog posts of a category. """
+
+    def get_object(self, request, category_slug):
+        return Category.objects.get(slug=category_slug)
+
+    def get_cache_tags(self, obj):
+        return [object_tag(obj), list_tag(Category), list_tag(Post)]
+
+    def title(self, obj):
+        return gettext("Blog: %(name)s") % {'name': obj.name}
+
+    def link(self, obj):
+        return reverse('blog:posts_by_category', kwargs={'category_slug': obj.slug})
+
+    def description(self, obj):
+        return gettext("Latest blog posts in %(name)s") % {'name': obj.name}
+
+    def get_queryset(self, obj):
+        return obj.blog_posts.filter(status='published')
+
+
+class TagPostsFeed(LatestPostsFeed):
+    """ RSS feed of the latest blog posts with a tag. """
+
+    def get_object(self, request, tag_slug):
+        return Tag.objects.get(slug=tag_slug)
+
+    def get_cache_tags(self, obj):
+        return [object_tag(obj), list_tag(Post)]
+
+    def title(self, obj):
+        return gettext("Blog: #%(name)s") % {'name': obj.name}
+
+    def link(self, obj):
+        return reverse('blog:posts_by_tag', kwargs={'tag_slug': obj.slug})
+
+    def description(self, obj):
+        return gettext("Latest blog posts tagged %(name)s") % {'name': obj.name}
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(status='published', tags__slug=obj.slug)
+
+
+# --- Atom versions of the same feeds ---
+
+class AtomLatestPostsFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class AtomCategoryPostsFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryPostsFeed.description
+
+
+class AtomTagPostsFeed(TagPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = TagPostsFeed.description
@@ -60,11 +60,11 @@ class CommentForm(forms.ModelForm):
             self.fields['author_email'].widget = forms.HiddenInput()
             
             # Log that we are customizing the form for a logged-in user.
-            logger.debug(f"Customizing CommentForm for authenticated user: {self.user.username}")
+            logger.debug("Customizing CommentForm for authenticated user: %s", self.user.username)
 
 
     def clean(self):
         # We log form errors to help with debugging validation issues.
         if self.errors:
-            logger.warning(f"CommentForm validation failed. Errors: {self.errors.as_json()}")
+            logger.warning("CommentForm validation failed. Errors: %s", self.errors.as_json())
         return super().clean()
\ No newline at end of file
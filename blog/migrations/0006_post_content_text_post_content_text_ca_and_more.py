@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_content_pipeline_version_post_content_rendered_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Plain Text Content'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_text_ca',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Plain Text Content'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_text_en',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Plain Text Content'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='content_text_es',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Plain Text Content'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_ca',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_en',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_es',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Reading Time (minutes)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time_ca',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, null=True, verbose_name='Reading Time (minutes)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time_en',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, null=True, verbose_name='Reading Time (minutes)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time_es',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, null=True, verbose_name='Reading Time (minutes)'),
+        ),
+    ]
@@ -9,6 +9,18 @@ from mptt.models import MPTTModel, TreeForeignKey
 from categories.models import Category 
 from taggit.managers import TaggableManager
 from django.utils.translation import override 
+from core.html_pipeline import get_rendered_html
+
+
+class PostQuerySet(models.QuerySet):
+    # Full-text columns that cards and lists never show (with modeltranslation,
+    # each name also covers its _es/_en/_ca columns).
+    LIST_DEFERRED_FIELDS = ('content', 'content_rendered', 'content_text')
+
+    def for_list(self):
+        """ Projection for lists and widgets: no full-text columns, author in the same query. """
+        return self.defer(*self.LIST_DEFERRED_FIELDS).select_related('author')
+
 
 class Post(models.Model):
     """ Represents a single blog post. """
@@ -22,6 +34,13 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_posts', verbose_name=_("Author"))
     
     content = models.TextField(verbose_name=_("Content"))
+    # --- Render-on-save HTML (see core/html_pipeline.py) ---
+    content_rendered = models.TextField(blank=True, editable=False, verbose_name=_("Rendered Content"))
+    content_pipeline_version = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Content Pipeline Version"))
+    # --- Plain-text fields derived from the content (see core/derived_fields.py) ---
+    content_text = models.TextField(blank=True, editable=False, verbose_name=_("Plain Text Content"))
+    excerpt = models.CharField(max_length=255, blank=True, editable=False, verbose_name=_("Excerpt"))
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Reading Time (minutes)"))
     featured_image = models.ImageField(
         upload_to='blog/featured/%Y/%m/%d/', 
         blank=True, 
@@ -60,6 +79,8 @@ class Post(models.Model):
         blank=True # Allows posts to have no tags
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ('-published_date',)
         verbose_name = _("blog post")
@@ -68,6 +89,11 @@ class Post(models.Model):
     def __str__(self):
         return self.title
 
+    @property
+    def rendered_content(self):
+        """ The content HTML as transformed at save time (see core/html_pipeline.py). """
+        return get_rendered_html(self.content, self.content_rendered, self.content_pipeline_version)
+
     def get_absolute_url(self):
         return reverse('blog:post_detail', args=[
             self.published_date.year,
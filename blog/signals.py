@@ -1,73 +1,93 @@
 # File: blog/signals.py
 import logging
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.core.cache import cache
-from django.contrib.auth.models import User # For promoting trusted commenters
-from django.conf import settings 
 
 from .models import Post, Comment # Import Post and Comment for sender
-from site_settings.models import SiteConfiguration # For cache timeouts and threshold from SiteConfiguration
+from taggit.models import Tag
+from core.archives import remember_archive_month, update_archive_counts
+from core.html_pipeline import is_source_saved, render_translated_fields
+from core.page_cache import model_object_tag, purge_instance
+from .tasks import promote_trusted_commenter
 
 
 logger = logging.getLogger(__name__)
 
 
-# --- Signal to clear Widget caches on Post changes ---
+# --- Signal to render the content HTML once, at save time ---
+@receiver(pre_save, sender=Post)
+def render_post_content(sender, instance, update_fields=None, **kwargs):
+    """
+    Stores the transformed and sanitized content HTML of every language in
+    'content_rendered_<lang>', so templates don't have to parse it per request.
+    """
+    if is_source_saved(update_fields):
+        render_translated_fields(instance)
+
+
+# The widget caches are cleared on Post changes by widgets/signals.py (a background task).
+
+
+# --- Signals to keep the archive counts current (core/archives.py) ---
+@receiver(pre_save, sender=Post)
+def remember_post_archive_month(sender, instance, update_fields=None, **kwargs):
+    remember_archive_month(instance, update_fields)
+
+
+@receiver(post_save, sender=Post)
+def update_archive_on_post_save(sender, instance, update_fields=None, **kwargs):
+    update_archive_counts(instance, update_fields=update_fields)
+
+
+@receiver(post_delete, sender=Post)
+def update_archive_on_post_delete(sender, instance, **kwargs):
+    update_archive_counts(instance, deleted=True)
+
+
+# --- Signals to invalidate the page cache ---
 @receiver([post_save, post_delete], sender=Post)
-def clear_widget_caches_on_post_change(sender, instance, **kwargs):
+def purge_page_cache_on_post_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidates every cached page that shows this post: its detail page,
+    the blog lists, the gallery, search results and menus with categories.
+    """
+    purge_instance(instance, update_fields=update_fields)
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def purge_page_cache_on_post_categories_change(sender, instance, action, **kwargs):
+    """
+    Category listings change when categories are added to or removed from a post.
+    """
+    if action.startswith('post_') and isinstance(instance, Post):
+        purge_instance(instance)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def purge_page_cache_on_comment_change(sender, instance, **kwargs):
+    """
+    Invalidates the detail page of the commented post and the user profiles
+    listing comments.
+    """
+    purge_instance(instance, model_object_tag(Post, instance.post_id))
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def purge_page_cache_on_tag_change(sender, instance, **kwargs):
     """
-    Clears all widget caches related to posts whenever a Post is saved or deleted.
-    This ensures that 'Recent Posts', 'Most Viewed', 'Editor's Picks' widgets are updated.
+    Invalidates the tag page and the post pages that display tag names.
     """
-    # Import Widget model specifically here to avoid circular dependency issues at startup
-    from widgets.models import Widget 
-    num_widgets_cleared = 0
-    # A simple but effective strategy: clear ALL widget caches.
-    # We iterate over all widgets that deal with posts.
-    relevant_widget_types = ['recent_posts', 'tag_cloud_widget', 'most_viewed_posts', 'most_commented_posts', 'editor_picks_posts'] # Add other post-related widgets
-    
-    for widget in Widget.objects.filter(widget_type__in=relevant_widget_types): # Filter to relevant ones
-        for lang_code, _ in settings.LANGUAGES: # Clear for each language
-            cache_key = f'widget_items_{widget.id}_{lang_code}_v1' # Use 'v1'
-            cache.delete(cache_key)
-            num_widgets_cleared += 1
-    logger.info(f"Cleared {num_widgets_cleared} widget caches due to Post change (ID: {instance.id}).")
+    purge_instance(instance)
 
 
 # --- Signal for User Promotion to Trusted Commenter ---
 @receiver(post_save, sender=Comment)
 def promote_user_on_comment_approval(sender, instance, created, **kwargs):
     """
-    Promotes a user to 'Trusted Commenter' status if they reach the configured
-    threshold of approved comments. This signal runs when a Comment is saved.
+    Queues the check that promotes a user to 'Trusted Commenter' status if they
+    reach the configured threshold of approved comments (blog/tasks.py).
+    This signal runs when a Comment is saved.
     """
     # Only proceed if the comment is approved AND it's made by a registered user.
-    if instance.is_approved and instance.user:
-        try:
-            # We import User's Profile here to avoid circular dependency at startup
-            from accounts.models import Profile 
-            user_profile = Profile.objects.get(user=instance.user)
-            
-            # Only promote if the user is not already trusted.
-            if not user_profile.is_trusted_commenter:
-
-                site_config = SiteConfiguration.get_solo()
-                approval_threshold = getattr(site_config, 'trusted_commenter_threshold', 10) # Fallback to 10
-
-
-                # Count all approved comments by this user.
-                approved_comment_count = Comment.objects.filter(
-                    user=instance.user, 
-                    is_approved=True
-                ).count()
-                
-                if approved_comment_count >= approval_threshold:
-                    user_profile.is_trusted_commenter = True
-                    user_profile.save(update_fields=['is_trusted_commenter'])
-                    logger.info(f"User '{instance.user.username}' auto-promoted to Trusted Commenter (threshold: {approval_threshold} comments).")
-        
-        except Profile.DoesNotExist:
-            logger.warning(f"Comment from user '{instance.user.username}' (ID: {instance.user.id}) has no associated Profile. Cannot check trusted status.")
-        except Exception as e:
-            logger.error(f"Unexpected error in promote_user_on_comment_approval for user '{instance.user.username}': {e}", exc_info=True)
\ No newline at end of file
+    if instance.is_approved and instance.user_id:
+        promote_trusted_commenter.enqueue_with({'user_id': instance.user_id}, unique=True)
@@ -0,0 +1,39 @@
+# File: blog/tasks.py
+import logging
+
+from django.contrib.auth.models import User
+
+from core.tasks import task
+from site_settings.models import SiteConfiguration
+from .models import Comment
+
+logger = logging.getLogger(__name__)
+
+
+@task(priority=5)
+def promote_trusted_commenter(user_id):
+    """
+    Promotes a user to 'Trusted Commenter' status if they reach the configured
+    threshold of approved comments.
+    """
+    from accounts.models import Profile
+
+    try:
+        user_profile = Profile.objects.select_related('user').get(user_id=user_id)
+    except Profile.DoesNotExist:
+        if User.objects.filter(pk=user_id).exists():
+            logger.warning("User ID %s has no associated Profile. Cannot check trusted status.", user_id)
+        return
+
+    # Only promote if the user is not already trusted.
+    if user_profile.is_trusted_commenter:
+        return
+
+    site_config = SiteConfiguration.get_solo()
+    approval_threshold = getattr(site_config, 'trusted_commenter_threshold', 10) # Fallback to 10
+    approved_comment_count = Comment.objects.filter(user_id=user_id, is_approved=True).count()
+
+    if approved_comment_count >= approval_threshold:
+        user_profile.is_trusted_commenter = True
+        user_profile.save(update_fields=['is_trusted_commenter'])
+        logger.info("User '%s' auto-promoted to Trusted Commenter (threshold: %s comments).", user_profile.user.username, approval_threshold)
@@ -1,3 +1,91 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import translation
+
+from core.testing import LocMemCacheTestCase
+from .feeds import LatestPostsFeed
+from .models import Post
+
+
+class PostDetailConditionalGetTests(LocMemCacheTestCase):
+    """ ETag / Last-Modified on the post detail page. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        cls.post = Post.objects.create(
+            # The language switcher links every translation: each one needs a slug.
+            title='Post', slug_es='post', slug_en='post', slug_ca='post', author=author, content='<p>Text</p>', status='published',
+            published_date=datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc),
+        )
+
+    def test_unchanged_post_gets_a_304(self):
+        url = self.post.get_absolute_url()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_edited_post_gets_a_new_body(self):
+        url = self.post.get_absolute_url()
+        etag = self.client.get(url)['ETag']
+        self.post.title = 'Renamed'
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Renamed')
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class PostFeedTests(LocMemCacheTestCase):
+    """ The cached RSS feed of the latest posts. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author')
+        cls.post = cls.create_post('entrada', 'post', datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc))
+
+    @classmethod
+    def create_post(cls, slug_es, slug_en, published_date, status='published'):
+        return Post.objects.create(
+            title='Post', slug_es=slug_es, slug_en=slug_en, slug_ca=slug_es, author=cls.author,
+            content='<p>Text</p>', status=status, published_date=published_date,
+        )
+
+    def feed_url(self, language_code='es'):
+        with translation.override(language_code):
+            return reverse('blog:feed')
+
+    def test_unchanged_feed_gets_a_304(self):
+        etag = self.client.get(self.feed_url())['ETag']
+        response = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_publishing_a_post_changes_the_etag(self):
+        etag = self.client.get(self.feed_url())['ETag']
+        self.create_post('nueva', 'new', datetime(2025, 6, 20, tzinfo=dt_timezone.utc))
+        response = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, '/es/blog/2025/6/20/nueva/')
+
+    def test_item_links_are_in_the_language_of_the_feed(self):
+        self.assertContains(self.client.get(self.feed_url('es')), '/es/blog/2025/6/14/entrada/')
+        self.assertContains(self.client.get(self.feed_url('en')), '/en/blog/2025/6/14/post/')
+
+    def test_item_links_do_not_depend_on_other_requests(self):
+        # One feed instance serves every request: a request in another
+        # language between items() and item_link() must not change the link.
+        feed = LatestPostsFeed()
+        with translation.override('es'):
+            items = feed.items(None)
+        with translation.override('en'):
+            feed.item_link(feed.items(None)[0])
+        with translation.override('es'):
+            self.assertEqual(feed.item_link(items[0]), '/es/blog/2025/6/14/entrada/')
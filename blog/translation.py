@@ -8,7 +8,7 @@ from taggit.models import Tag
 
 @register(Post)
 class PostTranslationOptions(TranslationOptions):
-    fields = ('title', 'slug', 'content', 'meta_title', 'meta_description')
+    fields = ('title', 'slug', 'content', 'content_rendered', 'content_text', 'excerpt', 'reading_time', 'meta_title', 'meta_description')
 
 @register(Comment)
 class CommentTranslationOptions(TranslationOptions):
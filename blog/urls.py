@@ -1,6 +1,6 @@
 # blog/urls.py
 from django.urls import path
-from . import views
+from . import feeds, views
 
 # Esto es importante para evitar colisiones de nombres de URL con otras apps
 app_name = 'blog'
@@ -17,4 +17,17 @@ urlpatterns = [
     # 2. La URL para un post individual, usando año, mes, día y slug
     # Ejemplo: /blog/2025/06/15/mi-primer-post/
     path('<int:year>/<int:month>/<int:day>/<slug:slug>/', views.post_detail_view, name='post_detail'),
+
+    # Archivo por fechas: /blog/2025/, /blog/2025/6/, /blog/2025/6/15/
+    path('<int:year>/', views.post_archive_view, name='archive_year'),
+    path('<int:year>/<int:month>/', views.post_archive_view, name='archive_month'),
+    path('<int:year>/<int:month>/<int:day>/', views.post_archive_view, name='archive_day'),
+
+    # Feeds RSS y Atom (en el idioma del prefijo de la URL)
+    path('feed/', feeds.LatestPostsFeed(), name='feed'),
+    path('feed/atom/', feeds.AtomLatestPostsFeed(), name='feed_atom'),
+    path('category/<slug:category_slug>/feed/', feeds.CategoryPostsFeed(), name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/', feeds.AtomCategoryPostsFeed(), name='category_feed_atom'),
+    path('tag/<slug:tag_slug>/feed/', feeds.TagPostsFeed(), name='tag_feed'),
+    path('tag/<slug:tag_slug>/feed/atom/', feeds.AtomTagPostsFeed(), name='tag_feed_atom'),
 ]
\ No newline at end of file
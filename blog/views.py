@@ -1,9 +1,10 @@
 import logging
 from django.contrib import messages
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import F
-from django.http import HttpResponseRedirect
+from django.db.models import Max
+from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import render, get_object_or_404
+from django.utils.formats import date_format
 from django.utils.translation import gettext
 from django.urls import reverse
 
@@ -12,6 +13,11 @@ from .models import Post, Comment
 from categories.models import Category
 from site_settings.models import SiteConfiguration
 from taggit.models import Tag
+from core.archives import archive_range_or_404, archive_url, get_archive
+from core.conditional import conditional_content
+from core.static_export import is_export_request
+from core.view_counting import count_view
+from core.page_cache import add_surrogate_keys, list_tag, model_object_tag, object_tag, track_view
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +27,12 @@ def posts_by_tag_view(request, tag_slug):
     """
     # 1. Get the Tag object by slug, or return a 404
     tag = get_object_or_404(Tag, slug=tag_slug)
+    add_surrogate_keys(request, object_tag(tag), list_tag(Post))
 
     # 2. Get all published posts associated with this tag
     all_posts_by_tag = Post.objects.filter(
         status='published', tags__slug=tag_slug
-    ).order_by('-published_date')
+    ).for_list().order_by('-published_date')
 
     # 3. Get pagination settings
     try:
@@ -49,7 +56,7 @@ def posts_by_tag_view(request, tag_slug):
         else:
             posts = []
 
-    logger.info(f"Posts by tag view accessed for tag '{tag_slug}'. Showing page {getattr(posts, 'number', 0)} of {getattr(posts, 'paginator.num_pages', 0)} posts.")
+    logger.info("Posts by tag view accessed for tag '%s'. Showing page %s of %s.", tag_slug, getattr(posts, 'number', 0), paginator.num_pages)
 
     context = {
         'tag': tag,
@@ -57,12 +64,39 @@ def posts_by_tag_view(request, tag_slug):
     }
     return render(request, 'blog/post_list_by_tag.html', context)
 
+def _post_list_validators(request):
+    """ Validators for the blog list: any post change or a newer post. """
+    last_updated = Post.objects.filter(status='published').aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Post)], last_updated
+
+def _post_detail_validators(request, year, month, day, slug):
+    """
+    Validators for a post detail page from one lightweight query. Approved
+    comments purge the post tag, so they change the validators too.
+    """
+    row = Post.objects.filter(status='published',
+                              published_date__year=year,
+                              published_date__month=month,
+                              published_date__day=day,
+                              slug=slug).values_list('pk', 'updated_at').first()
+    if row is None:
+        return None
+    pk, updated_at = row
+    return [model_object_tag(Post, pk), list_tag(Category), list_tag(Tag)], updated_at
+
+def _posts_by_category_validators(request, category_slug):
+    last_updated = Post.objects.filter(status='published', categories__slug=category_slug) \
+                               .aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Category), list_tag(Post)], last_updated
+
+@conditional_content(_post_list_validators)
 def post_list_view(request):
     """
     Displays a list of published blog posts, paginated.
     """
     # 1. Retrieve the full, ordered list of all published posts.
-    all_posts = Post.objects.filter(status='published').order_by('-published_date')
+    all_posts = Post.objects.filter(status='published').for_list().order_by('-published_date')
+    add_surrogate_keys(request, list_tag(Post))
 
     # 2. Create a Paginator instance.
     #    We'll show 6 posts per page. This number can be changed easily.
@@ -89,7 +123,7 @@ def post_list_view(request):
             )
         posts = paginator.page(1)
     except EmptyPage:
-        logger.isEnabledFor(
+        logger.info(
                 "If the page number is out of range (e.g., 999), deliver the last page."
             )
         posts = paginator.page(paginator.num_pages)
@@ -108,6 +142,61 @@ def post_list_view(request):
     # 6. Render the template with the provided context.
     return render(request, 'blog/post_list.html', context)
 
+def _post_archive_validators(request, year, month=None, day=None):
+    start, end = archive_range_or_404(year, month, day)
+    last_updated = Post.objects.filter(status='published', published_date__gte=start, published_date__lt=end) \
+                               .aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Post)], last_updated
+
+@conditional_content(_post_archive_validators)
+def post_archive_view(request, year, month=None, day=None):
+    """
+    Displays the published blog posts of a year, a month or a day, paginated.
+    The years and months to navigate come from the stored counts (core/archives.py).
+    """
+    # 1. The [start, end) of the period in the URL (404 for dates like 2025/2/30).
+    start, end = archive_range_or_404(year, month, day)
+    all_posts = Post.objects.filter(
+        status='published', published_date__gte=start, published_date__lt=end
+    ).for_list().order_by('-published_date')
+    add_surrogate_keys(request, list_tag(Post))
+
+    # 2. Pagination, as in the post list.
+    try:
+        posts_per_page = SiteConfiguration.get_solo().blog_items_per_page
+    except SiteConfiguration.DoesNotExist:
+        posts_per_page = 6
+        logger.warning("SiteConfiguration not found. Using default archive pagination.")
+    paginator = Paginator(all_posts, posts_per_page)
+    if paginator.count == 0:
+        # Empty periods aren't pages: no endless crawlable years.
+        raise Http404("No posts published in this period.")
+    posts = paginator.get_page(request.GET.get('page'))
+
+    # 3. Title and breadcrumbs: Home > Blog > 2025 > June 2025 > June 14, 2025.
+    period = start.date()
+    breadcrumbs = [
+        {"url": "/", "label": gettext("Home")},
+        {"url": reverse("blog:post_list"), "label": gettext("Blog")},
+        {"url": archive_url('blog', year), "label": str(year)},
+    ]
+    if month is not None:
+        breadcrumbs.append({"url": archive_url('blog', year, month), "label": date_format(period, 'YEAR_MONTH_FORMAT')})
+    if day is not None:
+        breadcrumbs.append({"url": "", "label": date_format(period, 'DATE_FORMAT')})
+    breadcrumbs[-1]["url"] = ""
+
+    context = {
+        'posts': posts,
+        'breadcrumbs': breadcrumbs,
+        'archive_label': breadcrumbs[-1]["label"],
+        'archive': get_archive('blog'),
+        'archive_year': year,
+        'archive_month': month,
+    }
+    return render(request, 'blog/post_archive.html', context)
+
+@conditional_content(_post_detail_validators)
 def post_detail_view(request, year, month, day, slug):
     """
     Displays a single blog post and handles the entire comment submission process,
@@ -133,9 +222,16 @@ def post_detail_view(request, year, month, day, slug):
 
     # 2. Increment the View Count.
     # ---------------------------------
-    post.views_count = F('views_count') + 1
-    post.save(update_fields=['views_count'])
-    post.refresh_from_db()
+    # A queryset update doesn't fire post_save, so counting a view doesn't
+    # invalidate the widget and page caches. The view also goes to the trending
+    # scores (core/trending.py). Bots, HEAD requests and repeated views of the
+    # same visitor don't count (core/view_counting.py). The page cache replays
+    # the same check on every cache hit (track_view). The static exporter doesn't count.
+    if not is_export_request(request):
+        if count_view(request, post._meta.label, post.pk):
+            post.refresh_from_db()
+        track_view(request, post)
+    add_surrogate_keys(request, object_tag(post), list_tag(Category), list_tag(Tag))
 
     # 3. Handle Comment Submission and Retrieval.
     # -------------------------------------------
@@ -161,7 +257,7 @@ def post_detail_view(request, year, month, day, slug):
                 new_comment.is_approved = True
                 success_message = gettext("Thank you! Your comment has been published.")
                 if is_trusted and not site_config.auto_approve_comments:
-                    logger.info(f"Comment from trusted user '{request.user.username}' was auto-approved.")
+                    logger.info("Comment from trusted user '%s' was auto-approved.", request.user.username)
             else:
                 new_comment.is_approved = False
                 success_message = gettext("Thank you! Your comment has been submitted and is awaiting moderation.")
@@ -174,7 +270,7 @@ def post_detail_view(request, year, month, day, slug):
             redirect_url = f"{post_url}#comments-section"
             return HttpResponseRedirect(redirect_url)
         else:
-            logger.warning(f"Invalid comment submission on post '{post.slug}'. Errors: {comment_form.errors.as_json()}")
+            logger.warning("Invalid comment submission on post '%s'. Errors: %s", post.slug, comment_form.errors.as_json())
     else:
         # For a GET request, create a blank form instance.
         comment_form = CommentForm(user=request.user)
@@ -226,6 +322,7 @@ def build_category_breadcrumbs(category):
         current = current.parent
     return reversed(path)  # children to father
 
+@conditional_content(_posts_by_category_validators)
 def posts_by_category_view(request, category_slug):
     """
     Filters and displays a paginated list of published posts
@@ -233,7 +330,8 @@ def posts_by_category_view(request, category_slug):
     """
     # --- 1. Get Base Data ---
     category = get_object_or_404(Category, slug=category_slug)
-    all_posts_in_category = category.blog_posts.filter(status='published').order_by('-published_date')
+    all_posts_in_category = category.blog_posts.filter(status='published').for_list().order_by('-published_date')
+    add_surrogate_keys(request, list_tag(Category), list_tag(Post))
 
     # --- 2. Get Pagination Settings ---
     try:
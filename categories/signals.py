@@ -3,6 +3,7 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.conf import settings
+from core.page_cache import purge_instance
 from .models import Category
 
 @receiver([post_save, post_delete], sender=Category)
@@ -14,4 +15,7 @@ def clear_category_tree_cache(sender, instance, **kwargs):
     print("--- CATEGORY SIGNAL TRIGGERED: Clearing all category tree caches ---")
     for lang_code, _ in settings.LANGUAGES:
         cache_key = f'full_category_tree_nodes_{lang_code}_v1'
-        cache.delete(cache_key)
\ No newline at end of file
+        cache.delete(cache_key)
+
+    # Categories appear in the tree, menus, widgets and breadcrumbs of many pages.
+    purge_instance(instance)
\ No newline at end of file
@@ -4,6 +4,7 @@ from django import template
 from django.core.cache import cache
 from django.conf import settings
 from ..models import Category
+from core.page_cache import add_surrogate_keys, list_tag
 
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
@@ -25,6 +26,7 @@ def render_category_tree(context):
     # 1. Get the current language from the template context to build a unique cache key.
     language_code = context.get('LANGUAGE_CODE', settings.LANGUAGE_CODE)
     cache_key = f'full_category_tree_nodes_{language_code}_v1'
+    add_surrogate_keys(context.get('request'), list_tag(Category))
     
     # 2. Try to fetch the full list of category nodes from the cache.
     nodes = cache.get(cache_key)
@@ -32,7 +34,7 @@ def render_category_tree(context):
     # 3. If it's a "cache miss" (nodes is None), we query the database.
     if nodes is None:
         # We only log the DB query if caching was actually attempted (will be on a miss).
-        logger.info(f"CACHE MISS for category tree (lang: {language_code}). Querying database.")
+        logger.debug("CACHE MISS for category tree (lang: %s). Querying database.", language_code)
         
         # For `recursetree` to work efficiently, we fetch all nodes at once.
         # MPTT ensures they are correctly ordered for tree construction.
@@ -55,8 +57,8 @@ def render_category_tree(context):
         # 4. Store the result in the cache if caching is enabled (timeout > 0).
         if timeout > 0:
             cache.set(cache_key, nodes, timeout)
-            logger.debug(f"Cached category tree for {timeout} seconds.")
+            logger.debug("Cached category tree for %s seconds.", timeout)
     else:
-        logger.debug(f"CACHE HIT for category tree (lang: {language_code}). Serving from cache.")
+        logger.debug("CACHE HIT for category tree (lang: %s). Serving from cache.", language_code)
             
     return {'nodes': nodes}
\ No newline at end of file
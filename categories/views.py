@@ -5,6 +5,7 @@ from blog.models import Post
 from django.urls import reverse
 from django.utils.translation import gettext
 from django.shortcuts import get_object_or_404
+from core.page_cache import add_surrogate_keys, list_tag
 
 def category_tree_view(request):
     """
@@ -12,6 +13,7 @@ def category_tree_view(request):
     """
     # We fetch ONLY the top-level categories.
     root_nodes = Category.objects.filter(parent__isnull=True)
+    add_surrogate_keys(request, list_tag(Category))
 
     breadcrumbs = [
         {"url": "/", "label": gettext("Home")},
@@ -39,6 +41,7 @@ def posts_by_category_view(request, category_slug):
     category = get_object_or_404(Category, slug=category_slug)
 
     posts = Post.objects.filter(categories=category, is_published=True).order_by('-publish')
+    add_surrogate_keys(request, list_tag(Category), list_tag(Post))
 
     breadcrumbs = [
         {"url": "/", "label": gettext("Home")},
@@ -44,9 +44,9 @@ class CommentForm(forms.ModelForm):
             self.fields['author_email'].required = False
             self.fields['author_name'].widget = forms.HiddenInput()
             self.fields['author_email'].widget = forms.HiddenInput()
-            logger.debug(f"🧑‍💻 Customizing CommentForm for logged-in user: {self.user.username}")
+            logger.debug("🧑‍💻 Customizing CommentForm for logged-in user: %s", self.user.username)
 
     def clean(self):
         if self.errors:
-            logger.warning(f"⚠️ CommentForm validation failed. Errors: {self.errors.as_json()}")
+            logger.warning("⚠️ CommentForm validation failed. Errors: %s", self.errors.as_json())
         return super().clean()
\ No newline at end of file
@@ -0,0 +1,16 @@
+# File: comments/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.page_cache import model_object_tag, purge_instance
+from posts.models import Post
+from .models import Comment
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def purge_page_cache_on_comment_change(sender, instance, **kwargs):
+    """
+    Invalidates the cached detail page of the commented post and the pages
+    with a 'most commented' widget.
+    """
+    purge_instance(instance, model_object_tag(Post, instance.post_id))
@@ -1,3 +1,43 @@
+# File: core/admin.py
 from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Register your models here.
+from .models import ArchiveMonth, Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """
+    Background tasks queued by the signals and views (core/tasks.py).
+    Failed tasks keep their traceback and can be queued again.
+    """
+    list_display = ('name', 'status', 'priority', 'attempts', 'max_attempts', 'run_at', 'finished_at', 'locked_by')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'unique_key', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = ('locked_by', 'locked_at', 'created_at', 'finished_at', 'last_error')
+    actions = ['retry_tasks']
+
+    @admin.action(description=_("Retry selected tasks"))
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status=Task.Status.RUNNING).update(
+            status=Task.Status.PENDING, attempts=0, run_at=timezone.now(), locked_by='', locked_at=None,
+        )
+        self.message_user(request, _("%(count)d task(s) queued again.") % {'count': updated})
+
+
+@admin.register(ArchiveMonth)
+class ArchiveMonthAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the date archive counts (core/archives.py). They are
+    derived from the posts: fix them with `manage.py rebuild_archive_counts`.
+    """
+    list_display = ('section', 'year', 'month', 'count')
+    list_filter = ('section', 'year')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,176 @@
+# File: core/archives.py
+"""
+Date archives of the blog and the posts: /blog/2025/, /blog/2025/6/,
+/blog/2025/6/14/ (and the same under /posts/).
+
+The number of published posts per month is stored in ArchiveMonth, so the
+archive widget and the archive pages list the years and months from one
+query on that small table, instead of a dates() aggregation over the posts.
+
+The counts are kept current by the post signals (blog/signals.py,
+posts/signals.py): when a post is saved or deleted, the months it was in and
+is now in are counted again (a COUNT over one month of the indexed dates).
+Changes that skip the signals (queryset.update(), bulk_create(), raw SQL)
+are caught up with `python manage.py rebuild_archive_counts`.
+"""
+import calendar
+import logging
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.http import Http404
+from django.urls import reverse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# section -> (model, URL namespace)
+SECTIONS = {
+    'blog': ('blog.Post', 'blog'),
+    'posts': ('posts.Post', 'posts'),
+}
+
+ArchiveYear = namedtuple('ArchiveYear', ['year', 'count', 'url', 'months'])
+ArchiveMonthEntry = namedtuple('ArchiveMonthEntry', ['year', 'month', 'count', 'url', 'date'])
+
+
+def get_model(section):
+    return apps.get_model(SECTIONS[section][0])
+
+
+def get_section(model):
+    """ The section of a post model, or None. """
+    label = model._meta.label
+    return next((section for section, (model_label, _) in SECTIONS.items() if model_label == label), None)
+
+
+def archive_url(section, year, month=None, day=None):
+    namespace = SECTIONS[section][1]
+    if day is not None:
+        return reverse(f'{namespace}:archive_day', args=[year, month, day])
+    if month is not None:
+        return reverse(f'{namespace}:archive_month', args=[year, month])
+    return reverse(f'{namespace}:archive_year', args=[year])
+
+
+def date_range(year, month=None, day=None):
+    """ [start, end) datetimes (current time zone) of a year, month or day. """
+    if day is not None:
+        start = date(year, month, day)
+        end = start + timedelta(days=1)
+    elif month is not None:
+        start = date(year, month, 1)
+        end = date(year, month, calendar.monthrange(year, month)[1]) + timedelta(days=1)
+    else:
+        start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    zone = timezone.get_current_timezone()
+    return datetime.combine(start, time.min, tzinfo=zone), datetime.combine(end, time.min, tzinfo=zone)
+
+
+def archive_range_or_404(year, month=None, day=None):
+    """ date_range() of the date in the URL, or a 404 when there is no such date (2025/2/30). """
+    try:
+        return date_range(year, month, day)
+    except (ValueError, OverflowError):
+        raise Http404("Invalid archive date.")
+
+
+def published_posts(section, registry=apps):
+    return registry.get_model(SECTIONS[section][0]).objects.filter(status='published')
+
+
+# --- Keeping the counts current ---
+
+def _month_of(published_date):
+    local = timezone.localtime(published_date)
+    return local.year, local.month
+
+
+def refresh_month(section, year, month):
+    """ Counts the published posts of one month again and stores the result. """
+    from .models import ArchiveMonth
+
+    start, end = date_range(year, month)
+    count = published_posts(section).filter(published_date__gte=start, published_date__lt=end).count()
+    if count:
+        ArchiveMonth.objects.update_or_create(section=section, year=year, month=month, defaults={'count': count})
+    else:
+        ArchiveMonth.objects.filter(section=section, year=year, month=month).delete()
+
+
+def _counts_unchanged(update_fields):
+    # The view counter is saved on every visit; it never moves a post.
+    return bool(update_fields) and set(update_fields) <= {'views_count'}
+
+
+def remember_archive_month(instance, update_fields=None):
+    """
+    pre_save: stores on the instance the month in which it's published
+    before the save (None when new or unpublished), since a save can move
+    the post to another month or take it out of the archive.
+    """
+    instance._archive_month_before = None
+    if instance.pk is None or _counts_unchanged(update_fields):
+        return
+    previous = type(instance)._base_manager.filter(pk=instance.pk).values_list('status', 'published_date').first()
+    if previous and previous[0] == 'published' and previous[1]:
+        instance._archive_month_before = _month_of(previous[1])
+
+
+def update_archive_counts(instance, deleted=False, update_fields=None):
+    """ post_save / post_delete: refreshes the months the post was and is in. """
+    if _counts_unchanged(update_fields):
+        return
+    section = get_section(type(instance))
+    months = set()
+    before = getattr(instance, '_archive_month_before', None)
+    if before:
+        months.add(before)
+    if instance.published_date and (deleted or instance.status == 'published'):
+        months.add(_month_of(instance.published_date))
+    for year, month in months:
+        refresh_month(section, year, month)
+
+
+def rebuild_archive_counts(section, registry=apps):
+    """
+    Recomputes every month of a section, in one GROUP BY. Returns the number
+    of months. Migrations pass their app registry (historical models).
+    """
+    ArchiveMonth = registry.get_model('core', 'ArchiveMonth')
+
+    rows = (
+        published_posts(section, registry).order_by()
+        .annotate(year=ExtractYear('published_date'), month=ExtractMonth('published_date'))
+        .values('year', 'month').annotate(count=Count('pk'))
+    )
+    months = [ArchiveMonth(section=section, year=row['year'], month=row['month'], count=row['count']) for row in rows]
+    with transaction.atomic():
+        ArchiveMonth.objects.filter(section=section).delete()
+        ArchiveMonth.objects.bulk_create(months)
+    logger.info("Archive counts of '%s' rebuilt: %d months.", section, len(months))
+    return len(months)
+
+
+# --- Reading the archive ---
+
+def get_archive(section):
+    """
+    [ArchiveYear(year, count, url, months=[ArchiveMonthEntry...])], newest
+    first, from the stored counts (one query).
+    """
+    from .models import ArchiveMonth
+
+    years = {}
+    for year, month, count in ArchiveMonth.objects.filter(section=section).values_list('year', 'month', 'count'):
+        years.setdefault(year, []).append(
+            ArchiveMonthEntry(year, month, count, archive_url(section, year, month), date(year, month, 1))
+        )
+    return [
+        ArchiveYear(year, sum(entry.count for entry in months), archive_url(section, year), months)
+        for year, months in years.items()
+    ]
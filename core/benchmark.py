@@ -0,0 +1,374 @@
+# File: core/benchmark.py
+"""
+Load benchmark of the public site (see the `run_benchmark` management command).
+
+A run replays a weighted mix of requests (home, blog list, post detail, tag,
+category, search, gallery and profile pages in every language) against the
+current database, normally the data set of `seed_perf_data`. The URLs and
+their order come from a seeded random generator, so two runs against the
+same data send the same requests.
+
+Two targets:
+- in-process (default): Django's test Client calls the WSGI handler directly,
+  the queries are counted with a database execute wrapper and the peak RSS
+  is the one of this process;
+- a running server (`base_url`): real HTTP requests; the queries come from the
+  X-Profile-Queries header of the request profiler (core/profiler.py), so the
+  server must share this SECRET_KEY. Its peak RSS is read from /proc when
+  its pid is given.
+
+The results are a JSON-serialisable dict (compare_results() diffs two of them).
+"""
+import logging
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import override
+
+from .profiler import make_profile_token
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of each kind of page in the mix.
+DEFAULT_MIX = {
+    'home': 15,
+    'blog_list': 12,
+    'post_detail': 30,
+    'tag': 8,
+    'category': 10,
+    'search': 10,
+    'gallery': 8,
+    'profile': 7,
+}
+
+# URLs sampled per scenario and language.
+POOL_SIZE = 40
+PERCENTILES = (('p50', 0.50), ('p95', 0.95), ('p99', 0.99))
+
+
+def percentile(sorted_values, fraction):
+    """ Linear interpolation between the closest ranks. """
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def get_url_pools(languages, rng, pool_size=POOL_SIZE):
+    """ Returns {scenario: {language: [path, ...]}} built from the published content. """
+    from blog.models import Post as BlogPost
+    from categories.models import Category
+    from gallery.models import Image
+    from posts.models import Post
+    from taggit.models import Tag as BlogTag
+    from tags.models import Tag
+
+    def sample(queryset):
+        objects = list(queryset[:pool_size * 5])
+        return rng.sample(objects, min(pool_size, len(objects)))
+
+    blog_posts = sample(BlogPost.objects.for_list().filter(status='published'))
+    posts = sample(Post.objects.filter(status='published').prefetch_related('translations'))
+    blog_tags = sample(BlogTag.objects.filter(taggit_taggeditem_items__isnull=False).distinct())
+    tags = sample(Tag.objects.filter(post_links__isnull=False).distinct())
+    categories = sample(Category.objects.filter(blog_posts__isnull=False).distinct())
+    images = sample(Image.objects.all())
+    usernames = [user.username for user in sample(get_user_model().objects.filter(profile__is_listed_publicly=True))]
+
+    pools = defaultdict(dict)
+    for language in languages:
+        with override(language):
+            pools['home'][language] = [reverse('home')]
+            pools['blog_list'][language] = [reverse('blog:post_list')] + [
+                f"{reverse('blog:post_list')}?page={page}" for page in range(2, 6)
+            ]
+            post_urls = [post.get_absolute_url() for post in blog_posts]
+            post_urls += [
+                post.get_absolute_url_for_language(language) for post in posts
+                if any(translation.language_code == language for translation in post.translations.all())
+            ]
+            pools['post_detail'][language] = post_urls
+            pools['tag'][language] = [reverse('blog:posts_by_tag', args=[tag.slug]) for tag in blog_tags] + [
+                reverse('posts:posts_by_tag', args=[tag.slug]) for tag in tags
+            ]
+            pools['category'][language] = [
+                reverse('blog:posts_by_category', args=[category.slug]) for category in categories
+            ]
+            # Search for words of the titles, in this language.
+            search_terms = [
+                word for post in blog_posts for word in (getattr(post, f'slug_{language}', None) or '').split('-')
+                if len(word) > 3 and not word.isdigit()
+            ] or ['art']
+            pools['search'][language] = [
+                f"{reverse('search:search_results')}?{urlencode({'q': rng.choice(search_terms)})}"
+                for _ in range(pool_size)
+            ]
+            pools['gallery'][language] = [reverse('gallery:gallery_view')] + [
+                reverse('gallery:image_detail', args=[image.pk]) for image in images
+            ]
+            pools['profile'][language] = [
+                reverse('accounts:public_profile', args=[username]) for username in usernames
+            ]
+    return pools
+
+
+def plan_requests(pools, mix, languages, count, rng):
+    """ The list of (scenario, language, path) to send, in order. """
+    scenarios = [name for name, weight in mix.items() if weight > 0 and any(pools[name].values())]
+    if not scenarios:
+        return []
+    weights = [mix[name] for name in scenarios]
+    plan = []
+    while len(plan) < count:
+        scenario = rng.choices(scenarios, weights)[0]
+        language = rng.choice(languages)
+        if pools[scenario].get(language):
+            plan.append((scenario, language, rng.choice(pools[scenario][language])))
+    return plan
+
+
+class ClientTarget:
+    """ In-process requests through Django's test Client. """
+    name = 'in-process'
+
+    def __init__(self, host='localhost'):
+        self.host = host
+        self.local = threading.local()
+
+    def _execute(self, execute, sql, params, many, context):
+        self.local.queries += 1
+        return execute(sql, params, many, context)
+
+    def get(self, path):
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client(HTTP_HOST=self.host, raise_request_exception=False)
+        self.local.queries = 0
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self._execute))
+            response = self.local.client.get(path)
+        return response.status_code, self.local.queries, response.get('X-Page-Cache'), len(response.content)
+
+    def peak_rss(self):
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS.
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def close(self):
+        connections.close_all()
+
+
+class HTTPTarget:
+    """ Real HTTP requests to a running server (runserver, Passenger, gunicorn...). """
+
+    def __init__(self, base_url, server_pid=None, timeout=30):
+        self.name = base_url
+        self.base_url = base_url.rstrip('/')
+        self.server_pid = server_pid
+        self.timeout = timeout
+        self.headers = {'X-Profile': make_profile_token(), 'User-Agent': 'tvt-benchmark'}
+
+    def get(self, path):
+        request = Request(self.base_url + path, headers=self.headers)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                status, headers = response.status, response.headers
+        except HTTPError as error:
+            body, status, headers = error.read(), error.code, error.headers
+        queries = headers.get('X-Profile-Queries')
+        return status, int(queries) if queries is not None else None, headers.get('X-Page-Cache'), len(body)
+
+    def peak_rss(self):
+        """ VmHWM of the server process (Linux only). """
+        if not self.server_pid:
+            return None
+        try:
+            with open(f'/proc/{self.server_pid}/status') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            logger.warning("Can't read the peak RSS of process %s.", self.server_pid)
+        return None
+
+    def close(self):
+        pass
+
+
+def summarize(samples, seconds=None):
+    """ Latency percentiles, queries and page cache statuses of a list of samples. """
+    latencies = sorted(sample['ms'] for sample in samples)
+    queries = sorted(sample['queries'] for sample in samples if sample['queries'] is not None)
+    summary = {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample['status'] >= 500),
+        'statuses': dict(Counter(str(sample['status']) for sample in samples)),
+        'latency_ms': {
+            **{name: round(percentile(latencies, fraction), 2) for name, fraction in PERCENTILES if latencies},
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            'max': round(latencies[-1], 2) if latencies else None,
+        },
+        'queries_per_request': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'p95': percentile(queries, 0.95),
+            'max': queries[-1] if queries else None,
+        },
+        'bytes_per_request': round(sum(sample['bytes'] for sample in samples) / len(samples)) if samples else 0,
+        'page_cache': dict(Counter(sample['cache'] or 'NONE' for sample in samples)),
+    }
+    if seconds:
+        summary['seconds'] = round(seconds, 3)
+        summary['throughput_rps'] = round(len(samples) / seconds, 2)
+    return summary
+
+
+def get_dataset_counts():
+    from blog.models import Comment as BlogComment, Post as BlogPost
+    from comments.models import Comment
+    from gallery.models import Image
+    from pages.models import Page
+    from posts.models import Post
+
+    return {
+        model._meta.label: model.objects.count()
+        for model in (BlogPost, Post, BlogComment, Comment, Page, Image)
+    }
+
+
+def get_git_revision():
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return revision, dirty
+
+
+def run_benchmark(target, requests=500, warmup=50, concurrency=1, mix=None, languages=None, seed=42):
+    """ Runs the warm-up and the measured requests. Returns the results dict. """
+    mix = mix or DEFAULT_MIX
+    languages = languages or [code for code, _ in settings.LANGUAGES]
+    rng = random.Random(seed)
+    pools = get_url_pools(languages, rng)
+    plan = plan_requests(pools, mix, languages, warmup + requests, rng)
+    warmup_plan, measured_plan = plan[:warmup], plan[warmup:]
+
+    def send(item):
+        scenario, language, path = item
+        start = time.perf_counter()
+        status, queries, cache_status, size = target.get(path)
+        return {
+            'scenario': scenario, 'language': language, 'path': path, 'status': status,
+            'ms': (time.perf_counter() - start) * 1000, 'queries': queries, 'cache': cache_status, 'bytes': size,
+        }
+
+    def run(items):
+        if concurrency <= 1:
+            return [send(item) for item in items]
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='benchmark') as executor:
+            return list(executor.map(send, items))
+
+    run(warmup_plan)
+    start = time.perf_counter()
+    samples = run(measured_plan)
+    elapsed = time.perf_counter() - start
+    target.close()
+
+    by_scenario = defaultdict(list)
+    for sample in samples:
+        by_scenario[sample['scenario']].append(sample)
+    revision, dirty = get_git_revision()
+    return {
+        'meta': {
+            'timestamp': timezone.now().isoformat(timespec='seconds'),
+            'git_revision': revision,
+            'git_dirty': dirty,
+            'target': target.name,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'cache_backend': settings.CACHES['default']['BACKEND'],
+            'debug': settings.DEBUG,
+            'seed': seed,
+            'requests': len(measured_plan),
+            'warmup': len(warmup_plan),
+            'concurrency': concurrency,
+            'languages': languages,
+            'mix': mix,
+            'dataset': get_dataset_counts(),
+        },
+        'summary': {**summarize(samples, elapsed), 'peak_rss_bytes': target.peak_rss()},
+        'scenarios': {name: summarize(items) for name, items in sorted(by_scenario.items())},
+        'slowest': [
+            {key: sample[key] for key in ('path', 'ms', 'queries', 'status')}
+            for sample in sorted(samples, key=lambda sample: sample['ms'], reverse=True)[:10]
+        ],
+    }
+
+
+def compare_results(old, new):
+    """
+    Returns the rows of a comparison table: (name, metric, old, new, change %).
+    Lower is better for every metric except the throughput.
+    """
+    def change(before, after):
+        if before in (None, 0) or after is None:
+            return None
+        return (after - before) / before * 100
+
+    rows = []
+    for name, metric, path in (
+        ('all', 'throughput_rps', ('throughput_rps',)),
+        ('all', 'peak_rss_mb', ('peak_rss_bytes',)),
+    ):
+        before = old['summary'].get(path[0])
+        after = new['summary'].get(path[0])
+        if metric == 'peak_rss_mb':
+            before = before / 2 ** 20 if before else None
+            after = after / 2 ** 20 if after else None
+        rows.append((name, metric, before, after, change(before, after)))
+
+    groups = [('all', old['summary'], new['summary'])] + [
+        (name, old['scenarios'][name], new['scenarios'][name])
+        for name in new['scenarios'] if name in old['scenarios']
+    ]
+    for name, before, after in groups:
+        for metric in ('p50', 'p95', 'p99'):
+            rows.append((name, f'{metric}_ms', before['latency_ms'].get(metric), after['latency_ms'].get(metric),
+                         change(before['latency_ms'].get(metric), after['latency_ms'].get(metric))))
+        old_queries, new_queries = before['queries_per_request']['mean'], after['queries_per_request']['mean']
+        rows.append((name, 'queries', old_queries, new_queries, change(old_queries, new_queries)))
+    return rows
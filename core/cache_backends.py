@@ -0,0 +1,276 @@
+# File: core/cache_backends.py
+"""
+Two-tier cache backend: a small in-process LRU in front of a shared cache
+(file-based or database) that every Passenger worker can see.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache_backends.TwoTierCache',
+            'OPTIONS': {'SHARED_ALIAS': 'shared', 'LOCAL_MAX_ENTRIES': 500, 'CHECK_INTERVAL': 1, 'STATS': True},
+        },
+        'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', ...},
+    }
+
+Coherence: every write stores a random version stamp next to the value in
+the shared tier ('<key>:stamp'). The local copies remember the stamp they
+were read with. At most every CHECK_INTERVAL seconds, a worker fetches the
+stamps of all its local keys in one get_many() call and drops the copies
+whose stamp changed or disappeared. So a set() or delete() made by one
+worker is seen by the others at their next check, without any broadcast.
+"""
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .cache_stats import CacheStats
+from .profiler import record_cache_call
+
+logger = logging.getLogger(__name__)
+
+STAMP_SUFFIX = ':stamp'
+
+
+class _ProcessTier:
+    """ The in-process tier and its statistics, shared by all the threads. """
+
+    def __init__(self, with_stats):
+        # key -> (stamp, pickled value, local expiry or None). Most recently used last.
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+        self.last_check = time.monotonic()
+        # Per key family counters, shown in the admin (core/cache_stats.py).
+        self.stats = CacheStats() if with_stats else None
+
+
+# Like LocMemCache: Django creates one backend instance per thread, but the
+# local tier must be one per process.
+_process_tiers = {}
+_process_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED_ALIAS', 'shared')
+        self._local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', 500))
+        self._check_interval = float(options.get('CHECK_INTERVAL', 1))
+        with _process_tiers_lock:
+            tier = _process_tiers.get(location or self._shared_alias)
+            if tier is None:
+                tier = _process_tiers[location or self._shared_alias] = _ProcessTier(options.get('STATS', True))
+        self._tier = tier
+        self._local = tier.entries
+        self._lock = tier.lock
+        self.stats = tier.stats
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # --- Local tier ---
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            stamp, pickled, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _local_set(self, key, stamp, pickled, timeout):
+        expires = None if timeout is None else time.time() + timeout
+        with self._lock:
+            self._local[key] = (stamp, pickled, expires)
+            self._local.move_to_end(key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def validate_local(self, force=False):
+        """
+        Drops the local copies whose stamp changed in the shared tier. Runs at
+        most every CHECK_INTERVAL seconds unless `force` is True.
+        """
+        now = time.monotonic()
+        if not force and now - self._tier.last_check < self._check_interval:
+            return
+        self._tier.last_check = now
+        with self._lock:
+            local_stamps = {key: entry[0] for key, entry in self._local.items()}
+        if not local_stamps:
+            return
+        shared_stamps = self.shared.get_many([key + STAMP_SUFFIX for key in local_stamps])
+        stale = [
+            key for key, stamp in local_stamps.items()
+            if shared_stamps.get(key + STAMP_SUFFIX) != stamp
+        ]
+        if stale:
+            logger.debug("Two-tier cache: %d stale local entr(y/ies) dropped.", len(stale))
+            with self._lock:
+                for key in stale:
+                    # Only drop it if it wasn't replaced meanwhile by this same process.
+                    entry = self._local.get(key)
+                    if entry is not None and entry[0] == local_stamps[key]:
+                        del self._local[key]
+
+    # --- Statistics (see core/cache_stats.py) ---
+
+    def _record(self, key, counter, started=None, nbytes=0, written=False, amount=1):
+        seconds = time.perf_counter() - started if started is not None else 0.0
+        record_cache_call(seconds)
+        if self.stats is None:
+            return
+        self.stats.record(key, counter, amount=amount, nbytes=nbytes, seconds=seconds, written=written)
+        self.stats.maybe_flush(self.shared)
+
+    # --- Cache API ---
+
+    def _timeout(self, timeout):
+        """ Resolves DEFAULT_TIMEOUT, so both tiers use this cache's TIMEOUT. """
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _store(self, key, value, timeout, add=False):
+        stamp = uuid.uuid4().hex
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        timeout = self._timeout(timeout)
+        if add:
+            if not self.shared.add(key, (stamp, pickled), timeout):
+                return None
+            self.shared.set(key + STAMP_SUFFIX, stamp, timeout)
+        else:
+            self.shared.set_many({key: (stamp, pickled), key + STAMP_SUFFIX: stamp}, timeout)
+        self._local_set(key, stamp, pickled, timeout)
+        return len(pickled)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        nbytes = self._store(self.make_and_validate_key(key, version=version), value, timeout, add=True)
+        if nbytes is None:
+            return False
+        self._record(key, 'sets', started, nbytes, written=True)
+        return True
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        nbytes = self._store(self.make_and_validate_key(key, version=version), value, timeout)
+        self._record(key, 'sets', started, nbytes, written=True)
+
+    def get(self, key, default=None, version=None):
+        started = time.perf_counter()
+        full_key = self.make_and_validate_key(key, version=version)
+        self.validate_local()
+        entry = self._local_get(full_key)
+        if entry is not None:
+            value = pickle.loads(entry[1])
+            self._record(key, 'local_hits', started, len(entry[1]))
+            return value
+        stored = self.shared.get(full_key)
+        if stored is None:
+            self._record(key, 'misses', started)
+            return default
+        stamp, pickled = stored
+        # The remaining shared timeout is unknown: keep the copy for the default timeout.
+        self._local_set(full_key, stamp, pickled, self.default_timeout)
+        value = pickle.loads(pickled)
+        self._record(key, 'shared_hits', started, len(pickled))
+        return value
+
+    def get_many(self, keys, version=None):
+        started = time.perf_counter()
+        self.validate_local()
+        found, missing, events = {}, {}, []
+        for key in keys:
+            full_key = self.make_and_validate_key(key, version=version)
+            entry = self._local_get(full_key)
+            if entry is not None:
+                found[key] = pickle.loads(entry[1])
+                events.append((key, 'local_hits', len(entry[1])))
+            else:
+                missing[full_key] = key
+        if missing:
+            for full_key, (stamp, pickled) in self.shared.get_many(list(missing)).items():
+                self._local_set(full_key, stamp, pickled, self.default_timeout)
+                found[missing[full_key]] = pickle.loads(pickled)
+                events.append((missing[full_key], 'shared_hits', len(pickled)))
+            events.extend((key, 'misses', 0) for key in missing.values() if key not in found)
+        record_cache_call(time.perf_counter() - started)
+        if self.stats is not None and events:
+            # The latency of the whole call is shared among its keys.
+            seconds = (time.perf_counter() - started) / len(events)
+            for key, counter, nbytes in events:
+                self.stats.record(key, counter, nbytes=nbytes, seconds=seconds)
+            self.stats.maybe_flush(self.shared)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        started = time.perf_counter()
+        shared_data = {}
+        sizes = {}
+        timeout = self._timeout(timeout)
+        for key, value in data.items():
+            full_key = self.make_and_validate_key(key, version=version)
+            stamp = uuid.uuid4().hex
+            pickled = pickle.dumps(value, self.pickle_protocol)
+            shared_data[full_key] = (stamp, pickled)
+            shared_data[full_key + STAMP_SUFFIX] = stamp
+            sizes[key] = len(pickled)
+            self._local_set(full_key, stamp, pickled, timeout)
+        self.shared.set_many(shared_data, timeout)
+        record_cache_call(time.perf_counter() - started)
+        if self.stats is not None and sizes:
+            seconds = (time.perf_counter() - started) / len(sizes)
+            for key, nbytes in sizes.items():
+                self.stats.record(key, 'sets', nbytes=nbytes, seconds=seconds, written=True)
+            self.stats.maybe_flush(self.shared)
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        timeout = self._timeout(timeout)
+        self.shared.touch(key + STAMP_SUFFIX, timeout)
+        return self.shared.touch(key, timeout)
+
+    def delete(self, key, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        self._local_delete(full_key)
+        existed = self.shared.has_key(full_key)
+        self.shared.delete_many([full_key, full_key + STAMP_SUFFIX])
+        self._record(key, 'deletes')
+        return existed
+
+    def delete_many(self, keys, version=None):
+        full_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        self._local_delete(*full_keys)
+        self.shared.delete_many(full_keys + [key + STAMP_SUFFIX for key in full_keys])
+        for key in keys:
+            self._record(key, 'deletes')
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self.validate_local()
+        return self._local_get(key) is not None or self.shared.has_key(key)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
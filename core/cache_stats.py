@@ -0,0 +1,144 @@
+# File: core/cache_stats.py
+"""
+Hit/miss/latency counters for the cache, grouped by key family
+('widget_items', 'menu_nodes_main_level', 'page_cache'...).
+
+TwoTierCache records every operation in a CacheStats object (in memory, no
+I/O). Every FLUSH_INTERVAL seconds each process writes a snapshot of its
+counters to the shared cache tier, and get_cache_stats() adds the snapshots
+of all the processes up for the admin dashboard
+(site_settings > Site configuration > Cache statistics).
+"""
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+
+STATS_KEY_PREFIX = 'cache_stats'
+PROCESSES_KEY = f'{STATS_KEY_PREFIX}:processes'
+RESET_KEY = f'{STATS_KEY_PREFIX}:reset'
+
+FLUSH_INTERVAL = 10
+# Snapshots of processes that stopped flushing expire after this time.
+SNAPSHOT_TIMEOUT = 24 * 3600
+
+# Known key prefixes, most specific first. The rest are grouped by their
+# text up to the first ':' or digit.
+KEY_FAMILIES = (
+    'widget_items',
+    'menu_nodes_main_level',
+    'simple_menu_items',
+    'social_links_menu',
+    'full_category_tree_nodes',
+    'page_cache_tag',
+    'page_cache',
+)
+
+COUNTERS = (
+    'local_hits', 'shared_hits', 'misses', 'sets', 'deletes',
+    'bytes_read', 'bytes_written', 'get_seconds', 'set_seconds',
+)
+
+
+def key_family(key):
+    for family in KEY_FAMILIES:
+        if key.startswith(family):
+            return family
+    for index, char in enumerate(key):
+        if char == ':' or char.isdigit():
+            return key[:index].rstrip('_') or 'other'
+    return key or 'other'
+
+
+class CacheStats:
+    """ Per-process counters. record() only updates a dict under a lock. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self._last_flush = time.monotonic()
+        # Time of the last reset already applied (resets older than the process don't apply).
+        self._applied_reset = time.time()
+        self._pid = os.getpid()
+
+    def record(self, key, counter, amount=1, nbytes=0, seconds=0.0, written=False):
+        counters = self._counters
+        with self._lock:
+            family = counters[key_family(key)]
+            family[counter] += amount
+            if nbytes:
+                family['bytes_written' if written else 'bytes_read'] += nbytes
+            if seconds:
+                family['set_seconds' if written else 'get_seconds'] += seconds
+
+    def maybe_flush(self, shared_cache):
+        """ Writes this process's snapshot to the shared cache every FLUSH_INTERVAL seconds. """
+        now = time.monotonic()
+        if now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        self.flush(shared_cache)
+
+    @property
+    def process_key(self):
+        return f'{STATS_KEY_PREFIX}:{socket.gethostname()}:{self._pid}'
+
+    def flush(self, shared_cache):
+        # After a reset from the dashboard, start counting again from zero.
+        reset_at = shared_cache.get(RESET_KEY)
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Forked worker: the counters copied from the parent aren't ours.
+                self._counters.clear()
+                self._pid = os.getpid()
+            if reset_at is not None and reset_at > self._applied_reset:
+                self._counters.clear()
+                self._applied_reset = reset_at
+            snapshot = {family: dict(values) for family, values in self._counters.items()}
+        shared_cache.set(self.process_key, snapshot, SNAPSHOT_TIMEOUT)
+        # The registry isn't updated atomically: a lost update is fixed by the next flush.
+        processes = shared_cache.get(PROCESSES_KEY) or []
+        if self.process_key not in processes:
+            shared_cache.set(PROCESSES_KEY, processes + [self.process_key], None)
+
+
+def get_cache_stats(shared_cache):
+    """
+    Adds up the snapshots of every process. Returns (families, process_count),
+    where `families` is a list of dicts sorted by number of reads.
+    """
+    process_keys = shared_cache.get(PROCESSES_KEY) or []
+    snapshots = shared_cache.get_many(process_keys)
+    if len(snapshots) != len(process_keys):
+        # Forget the processes whose snapshot expired.
+        shared_cache.set(PROCESSES_KEY, [key for key in process_keys if key in snapshots], None)
+
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for snapshot in snapshots.values():
+        for family, values in snapshot.items():
+            for counter, value in values.items():
+                totals[family][counter] += value
+
+    families = []
+    for family, values in totals.items():
+        hits = values['local_hits'] + values['shared_hits']
+        reads = hits + values['misses']
+        families.append({
+            'family': family,
+            **values,
+            'hits': hits,
+            'reads': reads,
+            'hit_ratio': hits / reads * 100 if reads else None,
+            'avg_get_ms': values['get_seconds'] / reads * 1000 if reads else None,
+            'avg_set_ms': values['set_seconds'] / values['sets'] * 1000 if values['sets'] else None,
+        })
+    families.sort(key=lambda row: row['reads'], reverse=True)
+    return families, len(snapshots)
+
+
+def reset_cache_stats(shared_cache):
+    """ Makes every process start counting from zero at its next flush. """
+    process_keys = shared_cache.get(PROCESSES_KEY) or []
+    shared_cache.delete_many(process_keys)
+    shared_cache.set(RESET_KEY, time.time(), None)
@@ -0,0 +1,92 @@
+# File: core/cache_warmup.py
+"""
+Pre-builds the fragment caches used by every page (menus, category tree and
+widget zones) for all languages, so the first visitors after a restart don't
+pay for them.
+
+The `warm_caches` management command fills the shared cache tier, e.g. after
+a deploy. The in-process tier (or a LocMemCache) only lives inside each web
+process: to warm it too, enable WARM_CACHES_ON_STARTUP and passenger_wsgi.py
+runs warm_caches() when the application is loaded (reading from the shared
+tier when it's already warm).
+"""
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.utils.translation import override
+
+logger = logging.getLogger(__name__)
+
+# Menus rendered by the base templates (core/templates/core/partials/).
+MAIN_MENU_SLUGS = ('main-menu',)
+SIMPLE_MENU_SLUGS = ('footer-menu',)
+
+DEFAULT_WORKERS = 4
+
+WarmupResult = namedtuple('WarmupResult', ['name', 'language', 'seconds', 'error'])
+
+
+def get_warmup_jobs(languages=None):
+    """
+    Returns a list of (name, language_code, function, args). Each function is
+    the template tag itself, so the cache keys are always the ones it uses.
+    """
+    from categories.templatetags.category_tags import render_category_tree
+    from menus.templatetags.menu_tags import show_menu, show_simple_menu, show_social_links_menu
+    from widgets.models import WidgetZone
+    from widgets.templatetags.widget_tags import show_widget_zone
+
+    language_codes = languages or [code for code, _ in settings.LANGUAGES]
+    zone_slugs = list(WidgetZone.objects.values_list('slug', flat=True))
+
+    jobs = []
+    for language_code in language_codes:
+        for slug in MAIN_MENU_SLUGS:
+            jobs.append((f'show_menu {slug}', language_code, show_menu, (slug,)))
+        for slug in SIMPLE_MENU_SLUGS:
+            jobs.append((f'show_simple_menu {slug}', language_code, show_simple_menu, (slug,)))
+        jobs.append(('show_social_links_menu', language_code, show_social_links_menu, ()))
+        jobs.append(('render_category_tree', language_code, render_category_tree, ()))
+        for slug in zone_slugs:
+            jobs.append((f'show_widget_zone {slug}', language_code, show_widget_zone, (slug,)))
+    return jobs
+
+
+def _run_job(job):
+    name, language_code, function, args = job
+    context = {'LANGUAGE_CODE': language_code, 'request': None}
+    start = time.perf_counter()
+    error = None
+    try:
+        with override(language_code):
+            function(context, *args)
+    except Exception as exc:
+        logger.error("Cache warm-up of '%s' (%s) failed.", name, language_code, exc_info=True)
+        error = str(exc)
+    finally:
+        # Each thread has its own database connections: don't leave them open.
+        connections.close_all()
+    return WarmupResult(name, language_code, time.perf_counter() - start, error)
+
+
+def warm_caches(languages=None, workers=DEFAULT_WORKERS):
+    """
+    Runs every warm-up job, in parallel threads, and returns the list of
+    WarmupResult in the order of the jobs.
+    """
+    start = time.perf_counter()
+    jobs = get_warmup_jobs(languages)
+    if workers <= 1:
+        results = [_run_job(job) for job in jobs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cache-warmup') as executor:
+            results = list(executor.map(_run_job, jobs))
+    logger.info(
+        "Cache warm-up: %d fragment(s) built in %.2fs (%d failed).",
+        len(results), time.perf_counter() - start, sum(1 for result in results if result.error),
+    )
+    return results
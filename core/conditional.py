@@ -0,0 +1,113 @@
+# File: core/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) for content views.
+
+A view decorated with @conditional_content(lookup) answers 304 Not Modified,
+without rendering its body, when the browser/crawler/CDN copy is still valid.
+
+`lookup(request, *args, **kwargs)` receives the view arguments and returns
+`(tags, last_modified)` from ONE lightweight query (e.g. `values_list('pk',
+'updated_at')`), or None to skip the conditional handling (the view will then
+render normally, and raise its own 404 if needed).
+
+The validators combine the content tags with the page cache tag versions of
+everything rendered around it (site configuration, menus, widgets and the
+content they list), so they change whenever the page would change.
+"""
+import hashlib
+import logging
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+
+from django.contrib.messages import get_messages
+from django.utils.translation import get_language
+from django.views.decorators.http import condition
+
+from .page_cache import SITE_TAG, get_tag_versions, list_tag, version_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def layout_tags():
+    """
+    Tags of the content shared by every page layout: the site configuration,
+    menus (and their dynamic children) and widgets (and what they list).
+    """
+    from blog.models import Post
+    from categories.models import Category
+    from menus.models import MenuItem
+    from pages.models import Page
+    from widgets.models import Widget
+    from widgets.templatetags.widget_tags import WIDGET_SOURCE_MODELS
+
+    tags = {SITE_TAG, list_tag(MenuItem), list_tag(Widget), list_tag(Category), list_tag(Post), list_tag(Page)}
+    for source_models in WIDGET_SOURCE_MODELS.values():
+        tags.update(list_tag(model) for model in source_models)
+    return frozenset(tags)
+
+
+def get_content_validators(request, lookup, *args, **kwargs):
+    """
+    Returns `(etag, last_modified)` for the request, or None when the response
+    can't be validated (unsafe method, pending messages, unknown object...).
+    The result is memoized on the request, so `lookup` runs only once.
+    """
+    if hasattr(request, '_content_validators'):
+        return request._content_validators
+
+    validators = None
+    # A page showing flash messages must never be answered with a 304.
+    if request.method in ('GET', 'HEAD') and not len(get_messages(request)):
+        found = lookup(request, *args, **kwargs)
+        if found is not None:
+            tags, last_modified = found
+            versions = get_tag_versions(layout_tags().union(tags))
+
+            # The page also depends on the URL, the language and who is
+            # looking at it (header, comment form...).
+            parts = [request.get_full_path(), get_language() or '', str(request.user.pk or 'anonymous')]
+            parts += [f'{tag}={version}' for tag, version in sorted(versions.items())]
+            if last_modified:
+                parts.append(last_modified.isoformat())
+            etag = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+            timestamps = [ts for ts in map(version_timestamp, versions.values()) if ts]
+            if last_modified:
+                timestamps.append(int(last_modified.timestamp()))
+            modified = datetime.fromtimestamp(max(timestamps), tz=dt_timezone.utc) if timestamps else None
+
+            validators = (etag, modified)
+
+    request._content_validators = validators
+    return validators
+
+
+def conditional_content(lookup):
+    """
+    View decorator adding ETag/Last-Modified validators computed by `lookup`
+    (see the module docstring) and answering 304 when they match.
+    """
+    def etag_func(request, *args, **kwargs):
+        validators = get_content_validators(request, lookup, *args, **kwargs)
+        return validators[0] if validators else None
+
+    def last_modified_func(request, *args, **kwargs):
+        validators = get_content_validators(request, lookup, *args, **kwargs)
+        return validators[1] if validators else None
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def get_tag_validators(request, tags, *extra):
+    """
+    Returns `(etag, last_modified)` for a response that depends only on the
+    URL, the active language, `tags` and `extra` strings: no page layout and
+    no user (feeds, JSON API). `last_modified` is a timestamp, or None.
+    """
+    versions = get_tag_versions(tags)
+    parts = [request.get_full_path(), get_language() or '', *extra]
+    parts += [f'{tag}={version}' for tag, version in sorted(versions.items())]
+    etag = '"%s"' % hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    timestamps = [ts for ts in map(version_timestamp, versions.values()) if ts]
+    return etag, max(timestamps) if timestamps else None
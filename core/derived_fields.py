@@ -0,0 +1,62 @@
+# File: core/derived_fields.py
+"""
+Plain-text fields derived from the rich-text `content` of pages, posts and
+publications, stored next to it (one column per language) when the object
+is saved:
+
+- content_text: the content without markup, with collapsed whitespace.
+- excerpt: the start of content_text, cut at a word boundary.
+- reading_time: estimated reading time in minutes.
+
+Lists, widgets and search results read these columns instead of stripping
+the full HTML on every request. They are filled by the render functions of
+core/html_pipeline.py, so PIPELINE_VERSION also covers them: rows saved
+before they existed get them from `python manage.py rerender_content`
+(migrations don't import the live pipeline, which keeps changing).
+"""
+import html
+import math
+import re
+
+from django.utils.html import strip_tags
+
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
+_whitespace_re = re.compile(r'\s+')
+# Block-level tags (and <br>) separate words even without whitespace around them.
+_block_tag_re = re.compile(r'<(?=/?(?:p|div|br|h[1-6]|li|ul|ol|tr|td|th|table|blockquote|pre|section|article|figure|figcaption)\b)', re.I)
+
+
+def html_to_text(value):
+    """ Returns the text of an HTML fragment, with entities decoded and whitespace collapsed. """
+    if not value:
+        return ''
+    text = strip_tags(_block_tag_re.sub(' <', str(value)))
+    return _whitespace_re.sub(' ', html.unescape(text)).strip()
+
+
+def make_excerpt(text, max_length=EXCERPT_LENGTH):
+    """ Cuts the text at the last word boundary before `max_length` characters. """
+    if len(text) <= max_length:
+        return text
+    excerpt = text[:max_length - 1]
+    if ' ' in excerpt:
+        excerpt = excerpt.rsplit(' ', 1)[0]
+    return excerpt.rstrip(' .,;:-') + '…'
+
+
+def estimate_reading_time(text, words_per_minute=WORDS_PER_MINUTE):
+    """ Reading time in whole minutes (at least 1 when there is any text). """
+    words = len(text.split())
+    return math.ceil(words / words_per_minute) if words else 0
+
+
+def derive_text_fields(content_html):
+    """ Returns a dict with the values of the derived fields for the given HTML. """
+    text = html_to_text(content_html)
+    return {
+        'content_text': text,
+        'excerpt': make_excerpt(text),
+        'reading_time': estimate_reading_time(text),
+    }
@@ -0,0 +1,105 @@
+# File: core/feeds.py
+"""
+Base class for the RSS/Atom feeds (blog/feeds.py, posts/feeds.py).
+
+Feed readers poll the feeds constantly. A CachedFeed:
+
+- stores the generated XML per URL and language, keyed by the page cache
+  versions of its tags (see get_cache_tags()): it's served from the cache
+  until one of those tags is purged, i.e. until a post is published, edited
+  or deleted. Saves that only count a view don't purge anything;
+- answers conditional GETs (ETag / Last-Modified) with a 304, from the tag
+  versions alone, without querying the items;
+- emits its tags as surrogate keys, so the anonymous page cache invalidates
+  its copy at the same time.
+
+Items are expected to come from ONE bounded query (FEED_SIZE rows, with
+joined authors and prefetched translations) and to build their links with
+language_url_template() instead of calling reverse() for every item.
+"""
+from functools import lru_cache
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+from .conditional import get_tag_validators
+from .page_cache import add_surrogate_keys
+
+FEED_SIZE = 20
+FEED_CACHE_TIMEOUT = 7 * 24 * 3600
+
+_PLACEHOLDER = 987654321
+
+
+def url_template(viewname, *names):
+    """
+    Reverses `viewname` once, with a placeholder for each of the `names`
+    arguments, and returns a format string: url_template('blog:post_detail',
+    'year', 'month', 'day', 'slug').format(year=2025, ...). The argument
+    converters must accept the placeholder digits (int, str, slug...).
+    """
+    placeholders = [str(_PLACEHOLDER + index) for index in range(len(names))]
+    url = reverse(viewname, args=placeholders).replace('{', '{{').replace('}', '}}')
+    for name, placeholder in zip(names, placeholders):
+        url = url.replace(placeholder, f'{{{name}}}')
+    return url
+
+
+@lru_cache(maxsize=128)
+def _memoized_url_template(viewname, names, language_code, script_prefix, urlconf):
+    return url_template(viewname, *names)
+
+
+def language_url_template(viewname, *names):
+    """
+    url_template() of the active language, built once per language. The
+    feeds are single instances shared by every thread: a template kept on
+    the feed would leak one request's language prefix into another's links.
+    """
+    return _memoized_url_template(viewname, names, get_language(), get_script_prefix(), get_urlconf())
+
+
+class CachedFeed(Feed):
+
+    def get_cache_tags(self, obj):
+        """ Page cache tags whose purge changes this feed. """
+        raise NotImplementedError
+
+    def __call__(self, request, *args, **kwargs):
+        try:
+            obj = self.get_object(request, *args, **kwargs)
+        except ObjectDoesNotExist:
+            raise Http404("Feed object does not exist.")
+
+        tags = self.get_cache_tags(obj)
+        add_surrogate_keys(request, *tags)
+        etag, last_modified = get_tag_validators(request, tags, type(self).__name__)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        cache_key = f'feed:{etag.strip(chr(34))}'
+        entry = cache.get(cache_key)
+        if entry is None:
+            feedgen = self.get_feed(obj, request)
+            response = HttpResponse(content_type=feedgen.content_type)
+            feedgen.write(response, 'utf-8')
+            entry = {'content': response.content, 'content_type': feedgen.content_type}
+            cache.set(cache_key, entry, FEED_CACHE_TIMEOUT)
+
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def item_updateddate(self, item):
+        return getattr(item, 'updated_at', None)
@@ -0,0 +1,217 @@
+# File: core/html_pipeline.py
+"""
+Render-on-save HTML pipeline for rich-text content.
+
+The HTML written in the editors is transformed ONCE, when the object is
+saved, and stored in a `content_rendered` column (one per language):
+
+1. <script>, <style> and similar elements are removed with their contents.
+2. Images get the 'zoomable' and 'img-fluid' classes, decoding="async" and,
+   except for the first one (often above the fold), loading="lazy".
+3. The result is sanitized with bleach (tags, attributes, URL protocols,
+   inline CSS and iframe hosts). data: URIs are only kept for pasted
+   images (data:image/* in img[src]).
+
+Templates read the stored HTML through the models' `rendered_content`
+property. The same functions also store the plain-text fields derived from
+the content (see core/derived_fields.py). Whenever the output of this
+pipeline or of the derived fields changes, bump
+PIPELINE_VERSION and run `python manage.py rerender_content`; until then,
+stale objects are rendered on the fly (and not saved).
+"""
+import logging
+import re
+from urllib.parse import urlsplit
+
+import bleach
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.utils.safestring import mark_safe
+
+from .derived_fields import derive_text_fields
+
+try:
+    from bleach.css_sanitizer import ALLOWED_CSS_PROPERTIES, CSSSanitizer
+except ImportError:  # 'tinycss2' is not installed: inline styles are dropped.
+    ALLOWED_CSS_PROPERTIES, CSSSanitizer = frozenset(), None
+
+logger = logging.getLogger(__name__)
+
+# Bump this number whenever the output of render_html() or of the derived
+# text fields changes.
+PIPELINE_VERSION = 3
+
+# Elements removed together with their contents before sanitizing.
+REMOVED_ELEMENTS = ('script', 'style', 'noscript', 'template', 'object', 'embed')
+
+ALLOWED_TAGS = frozenset(bleach.sanitizer.ALLOWED_TAGS) | {
+    'p', 'br', 'hr', 'div', 'span', 'small', 'mark', 'del', 'ins', 'u', 's', 'sub', 'sup',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'pre', 'figure', 'figcaption', 'img',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'th', 'td', 'caption', 'colgroup', 'col',
+    'dl', 'dt', 'dd', 'section', 'article', 'aside', 'iframe', 'video', 'audio', 'source',
+}
+
+# 'data' is only accepted where _reject_data_uris() lets it through.
+ALLOWED_PROTOCOLS = frozenset({'http', 'https', 'mailto', 'tel', 'data'})
+
+DEFAULT_IFRAME_HOSTS = (
+    'www.youtube.com',
+    'www.youtube-nocookie.com',
+    'player.vimeo.com',
+    'www.google.com',
+)
+
+IFRAME_ATTRIBUTES = ('width', 'height', 'title', 'allow', 'allowfullscreen', 'frameborder', 'loading')
+
+
+def _allow_iframe_attribute(tag, name, value):
+    """ Embeds are only allowed from trusted hosts, over https. """
+    if name == 'src':
+        hosts = getattr(settings, 'HTML_PIPELINE_IFRAME_HOSTS', DEFAULT_IFRAME_HOSTS)
+        url = urlsplit(value)
+        return url.scheme == 'https' and url.hostname in hosts
+    return name in IFRAME_ATTRIBUTES
+
+
+_URL_IGNORED_CHARACTERS = re.compile(r'[\s\x00-\x1f\x7f]')
+
+
+def _is_data_uri(value):
+    # Browsers ignore whitespace and control characters in the scheme.
+    return _URL_IGNORED_CHARACTERS.sub('', value).lower().startswith('data:')
+
+
+def _reject_data_uris(names):
+    """ Attribute filter allowing `names`, with no data: URIs. """
+    def allow(tag, name, value):
+        return name in names and not _is_data_uri(value)
+    return allow
+
+
+_global_attributes = ['class', 'id', 'title', 'dir', 'lang']
+if CSSSanitizer is not None:
+    _global_attributes.append('style')
+
+_allow_img_url_attribute = _reject_data_uris(
+    _global_attributes + ['src', 'alt', 'width', 'height', 'loading', 'decoding', 'srcset', 'sizes']
+)
+
+
+def _allow_img_attribute(tag, name, value):
+    """ Images pasted in the editors are data:image/* URIs: keep them, but only there. """
+    if name == 'src' and _is_data_uri(value):
+        return _URL_IGNORED_CHARACTERS.sub('', value).lower().startswith('data:image/')
+    return _allow_img_url_attribute(tag, name, value)
+
+
+ALLOWED_ATTRIBUTES = {
+    '*': _global_attributes,
+    'a': _reject_data_uris(_global_attributes + ['href', 'target', 'rel']),
+    'img': _allow_img_attribute,
+    'td': _global_attributes + ['colspan', 'rowspan'],
+    'th': _global_attributes + ['colspan', 'rowspan', 'scope'],
+    'col': _global_attributes + ['span'],
+    'iframe': _allow_iframe_attribute,
+    'video': _reject_data_uris(_global_attributes + ['src', 'controls', 'poster', 'width', 'height', 'preload', 'muted', 'loop']),
+    'audio': _reject_data_uris(_global_attributes + ['src', 'controls', 'preload']),
+    'source': _reject_data_uris(['src', 'type', 'srcset', 'media']),
+}
+
+_cleaner = bleach.Cleaner(
+    tags=ALLOWED_TAGS,
+    attributes=ALLOWED_ATTRIBUTES,
+    protocols=ALLOWED_PROTOCOLS,
+    css_sanitizer=CSSSanitizer(allowed_css_properties=ALLOWED_CSS_PROPERTIES) if CSSSanitizer else None,
+    strip=True,
+)
+
+
+# --- Transforms ---
+
+def _enhance_images(soup):
+    for index, img in enumerate(soup.find_all('img')):
+        classes = img.get('class', [])
+        for css_class in ('zoomable', 'img-fluid'):
+            if css_class not in classes:
+                classes.append(css_class)
+        img['class'] = classes
+        if not img.has_attr('decoding'):
+            img['decoding'] = 'async'
+        if index > 0 and not img.has_attr('loading'):
+            img['loading'] = 'lazy'
+
+
+def add_image_attributes(html):
+    """ Only the image transforms, without sanitizing (kept for the template filter). """
+    if not html:
+        return ''
+    soup = BeautifulSoup(html, 'html.parser')
+    _enhance_images(soup)
+    return str(soup)
+
+
+def render_html(html):
+    """ Runs the whole pipeline on an HTML fragment and returns the result. """
+    if not html:
+        return ''
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup.find_all(REMOVED_ELEMENTS):
+        element.decompose()
+    _enhance_images(soup)
+    return _cleaner.clean(str(soup))
+
+
+# --- Model integration ---
+
+def is_source_saved(update_fields, source='content'):
+    """
+    False when a save limited with `update_fields` doesn't touch the source
+    field (or any of its modeltranslation columns), so there's nothing to render.
+    """
+    if update_fields is None:
+        return True
+    source_fields = {source} | {f'{source}_{code}' for code, _ in settings.LANGUAGES}
+    return bool(source_fields & set(update_fields))
+
+
+def render_translated_fields(instance, source='content', target='content_rendered'):
+    """
+    For django-modeltranslation models: renders every language column of
+    `source` into the matching column of `target` and stores the derived
+    text fields of that language. Returns the updated fields.
+    """
+    updated_fields = []
+    for code, _ in settings.LANGUAGES:
+        rendered = render_html(getattr(instance, f'{source}_{code}', None))
+        setattr(instance, f'{target}_{code}', rendered)
+        updated_fields.append(f'{target}_{code}')
+        for name, value in derive_text_fields(rendered).items():
+            setattr(instance, f'{name}_{code}', value)
+            updated_fields.append(f'{name}_{code}')
+    instance.content_pipeline_version = PIPELINE_VERSION
+    return updated_fields + ['content_pipeline_version']
+
+
+def render_translation(translation, source='content', target='content_rendered'):
+    """
+    For django-parler translation rows (one row per language). Returns the
+    updated fields.
+    """
+    rendered = render_html(getattr(translation, source, None))
+    setattr(translation, target, rendered)
+    derived = derive_text_fields(rendered)
+    for name, value in derived.items():
+        setattr(translation, name, value)
+    translation.content_pipeline_version = PIPELINE_VERSION
+    return [target, *derived, 'content_pipeline_version']
+
+
+def get_rendered_html(source_html, rendered_html, version):
+    """
+    Returns the stored HTML when it's up to date. Otherwise (object saved
+    before the pipeline existed or with an older version) renders it now.
+    """
+    if version == PIPELINE_VERSION and (rendered_html or not source_html):
+        return mark_safe(rendered_html or '')
+    logger.debug("Rendered HTML missing or stale (version %s). Rendering on the fly.", version)
+    return mark_safe(render_html(source_html))
@@ -0,0 +1,185 @@
+# File: core/log_handlers.py
+"""
+Logging handlers for settings.LOGGING.
+
+Passenger runs several processes, each with several threads, all logging to
+the same files. A RotatingFileHandler there blocks the request threads on
+disk writes, and each process rotates the file on its own: the others keep
+writing to the renamed file, and backups get overwritten.
+
+- QueuedFileHandler: the request threads format the record and put it in a
+  queue. One listener thread per process does the file I/O.
+- MultiProcessRotatingFileHandler (used by the listener): a
+  RotatingFileHandler that holds an exclusive lock on '<file>.lock' (fcntl)
+  to write and rotate, and reopens the file when another process has
+  rotated it.
+- SamplingFilter: lets through only a fraction of the INFO/DEBUG records of
+  the high-volume loggers. Warnings and errors always pass.
+
+Log with %-style arguments (logger.info("... %s", value)), not f-strings:
+the message is only built if the record passes the level and the filters.
+"""
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+try:
+    import fcntl
+except ImportError:  # Windows (development only): no lock between processes.
+    fcntl = None
+
+
+class MultiProcessRotatingFileHandler(RotatingFileHandler):
+    """ RotatingFileHandler that several processes can share. """
+
+    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding='utf-8'):
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay=True)
+        self.lock_filename = f'{self.baseFilename}.lock'
+        self._lock_file = None
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _process_lock(self):
+        if self._pid != os.getpid():
+            # A forked child shares the parent's open files, and their flock():
+            # it needs its own to be locked out by the parent and its siblings.
+            for file in (self._lock_file, self.stream):
+                if file is not None:
+                    file.close()
+            self._lock_file = self.stream = None
+            self._pid = os.getpid()
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_filename, 'a')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _reopen_if_rotated(self):
+        """ Closes the stream if it no longer points to baseFilename. """
+        if self.stream is None:
+            return
+        try:
+            rotated = os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self.stream.close()
+            self.stream = None
+
+    def emit(self, record):
+        try:
+            message = self.format(record) + self.terminator
+            with self._process_lock():
+                self._reopen_if_rotated()
+                if self.maxBytes > 0:
+                    try:
+                        size = os.path.getsize(self.baseFilename)
+                    except FileNotFoundError:
+                        size = 0
+                    if size and size + len(message.encode(self.encoding or 'utf-8')) >= self.maxBytes:
+                        self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(message)
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        super().close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    Writes to a MultiProcessRotatingFileHandler from a listener thread.
+
+    The formatter, level and filters set on this handler by dictConfig apply
+    in the logging thread, like with any QueueHandler: the record is formatted
+    before it's queued, while its arguments still hold the values of the
+    moment (QueueHandler.prepare() stores the formatted line in `msg` and
+    clears `args`, `exc_info` and `exc_text`). The target has no formatter,
+    so the listener thread only does the file I/O. When the queue is full
+    (the disk can't keep up) records are dropped and counted, instead of
+    blocking the request.
+
+    The listener thread is started on the first record of each process:
+    Passenger forks the workers after loading the project, and threads don't
+    survive a fork.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding='utf-8', queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.target = MultiProcessRotatingFileHandler(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.listener = None
+        self.dropped = 0
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop_listener)
+
+    def _start_listener(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # In a forked child the queue may hold the parent's records and a lock taken by a dead thread.
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = QueueListener(self.queue, self.target)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def stop_listener(self):
+        """ Writes the queued records and stops the thread (at exit). """
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self._pid = None
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def close(self):
+        self.stop_listener()
+        self.target.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only `rate` (0 to 1) of the records below WARNING of the given
+    loggers (and their children). With no loggers it samples every logger.
+    """
+
+    def __init__(self, rate=1.0, loggers=()):
+        super().__init__()
+        self.rate = float(rate)
+        self.loggers = tuple(loggers)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        if self.loggers and not any(
+            record.name == name or record.name.startswith(f'{name}.') for name in self.loggers
+        ):
+            return True
+        return random.random() < self.rate
@@ -0,0 +1,157 @@
+# File: core/management/commands/export_static_site.py
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.static_export import collect_all_urls, init_worker, render_url
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.export_manifest.json'
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-renders the public site in all languages into static HTML files "
+        "that the web server can serve directly. By default only the objects "
+        "changed since the last build are re-rendered (lists are always rebuilt)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help="Directory to write the site to (default: settings.STATIC_EXPORT_ROOT).",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Number of worker processes (default: number of CPUs). Use 1 to render in-process.",
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Re-render every URL. Needed after changing menus, widgets, templates or the site configuration, or deleting comments.",
+        )
+        parser.add_argument(
+            '--language', action='append', dest='languages',
+            help="Only export this language (can be repeated). Default: all settings.LANGUAGES.",
+        )
+        parser.add_argument(
+            '--host',
+            help="Host name used for the requests. Must be in ALLOWED_HOSTS (default: the first one).",
+        )
+
+    def handle(self, *args, **options):
+        # 1. Resolve options.
+        output_root = Path(options['output'] or getattr(settings, 'STATIC_EXPORT_ROOT', settings.BASE_DIR / 'static_export'))
+        output_root.mkdir(parents=True, exist_ok=True)
+        host = options['host'] or self.get_default_host()
+        languages = options['languages']
+        valid_languages = {code for code, _ in settings.LANGUAGES}
+        if languages and not set(languages) <= valid_languages:
+            raise CommandError(f"Unknown language(s): {', '.join(set(languages) - valid_languages)}")
+
+        # 2. Load the previous build manifest (for incremental builds).
+        manifest_path = output_root / MANIFEST_NAME
+        previous_files, previous_build = {}, None
+        if manifest_path.exists():
+            with open(manifest_path, encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+            # Even a full build needs the previous file list to clean up stale pages.
+            previous_files = manifest.get('files', {})
+            if not options['full']:
+                previous_build = parse_datetime(manifest.get('built_at', ''))
+
+        build_started = timezone.now()
+
+        # 3. Decide which URLs must be rendered.
+        export_urls = collect_all_urls(languages)
+        to_render = [
+            export_url.url for export_url in export_urls
+            if previous_build is None
+            or export_url.updated_at is None
+            or export_url.url not in previous_files
+            or export_url.updated_at >= previous_build
+        ]
+        self.stdout.write(
+            f"Exporting {len(to_render)} of {len(export_urls)} URLs to '{output_root}' "
+            f"with {options['workers']} worker(s)..."
+        )
+
+        # 4. Render (in parallel worker processes when possible).
+        jobs = [(url, str(output_root)) for url in to_render]
+        results = self.render(jobs, options['workers'], host)
+
+        # 5. Update the file list: keep the unchanged files, drop the failed ones.
+        files = {url: path for url, path in previous_files.items()}
+        errors = 0
+        for url, status_code, relative_path in results:
+            if relative_path:
+                files[url] = relative_path
+            else:
+                errors += 1
+                self.stderr.write(f"  {status_code} {url}")
+                files.pop(url, None)
+                self.remove_file(output_root, url, previous_files)
+
+        # 6. Remove the files of objects that are no longer public.
+        current_urls = {export_url.url for export_url in export_urls}
+        exported_languages = languages or valid_languages
+        for url in list(files):
+            if url not in current_urls and self.url_language(url) in exported_languages:
+                self.remove_file(output_root, url, files)
+                files.pop(url)
+
+        # 7. Save the manifest.
+        tmp_manifest = manifest_path.with_suffix('.tmp')
+        with open(tmp_manifest, 'w', encoding='utf-8') as manifest_file:
+            json.dump({'built_at': build_started.isoformat(), 'files': files}, manifest_file, indent=1, sort_keys=True)
+        os.replace(tmp_manifest, manifest_path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Static export finished: {len(results) - errors} page(s) rendered, {errors} skipped."
+        ))
+
+    def render(self, jobs, workers, host):
+        if not jobs:
+            return []
+        if workers <= 1:
+            init_worker(host)
+            return [render_url(job) for job in jobs]
+
+        # Database connections must not be shared with the forked processes.
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=(host,)) as pool:
+            return list(pool.imap_unordered(render_url, jobs, chunksize=8))
+
+    @staticmethod
+    def get_default_host():
+        for host in settings.ALLOWED_HOSTS:
+            if host not in ('*', '') and not host.startswith('.'):
+                return host
+        return 'localhost'
+
+    @staticmethod
+    def url_language(url):
+        return url.strip('/').split('/', 1)[0]
+
+    @staticmethod
+    def remove_file(output_root, url, files):
+        relative_path = files.get(url)
+        if not relative_path:
+            return
+        try:
+            os.remove(output_root / relative_path)
+        except FileNotFoundError:
+            pass
+        # Also remove the directories left empty, so the URL really 404s.
+        directory = (output_root / relative_path).parent
+        while directory != output_root and directory.is_dir() and not any(directory.iterdir()):
+            directory.rmdir()
+            directory = directory.parent
@@ -0,0 +1,97 @@
+# File: core/management/commands/measure_list_payload.py
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import override
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares one page of each list (blog posts, posts, pages) loaded with "
+        "the full querysets and with the for_list() projections: number of "
+        "queries, bytes returned by the database and Python memory used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--per-page', type=int,
+            help="Rows per page (default: SiteConfiguration.blog_items_per_page).",
+        )
+        parser.add_argument('--language', default=None, help="Language to render the cards in.")
+
+    def handle(self, *args, **options):
+        from blog.models import Post as BlogPost
+        from pages.models import Page
+        from posts.models import Post
+        from site_settings.models import SiteConfiguration
+
+        per_page = options['per_page'] or SiteConfiguration.get_solo().blog_items_per_page
+        language = options['language'] or settings.LANGUAGE_CODE
+
+        surfaces = (
+            ('blog.Post', BlogPost.objects.filter(status='published').order_by('-published_date'), True),
+            ('posts.Post', Post.objects.filter(status='published').order_by('-published_date'), True),
+            ('pages.Page', Page.objects.filter(status='published').order_by('title'), False),
+        )
+
+        with override(language):
+            self.stdout.write(f"One page = {per_page} row(s).\n")
+            self.stdout.write(f"{'List':<12} {'Queryset':<9} {'Queries':>7} {'DB bytes':>10} {'Memory':>10}")
+            for label, queryset, has_author in surfaces:
+                full = self.measure(queryset, per_page, has_author)
+                projected = self.measure(queryset.for_list(), per_page, has_author)
+                for name, result in (('full', full), ('for_list', projected)):
+                    self.stdout.write(
+                        f"{label:<12} {name:<9} {result['queries']:>7} "
+                        f"{result['bytes']:>10,} {result['memory']:>10,}"
+                    )
+                self.stdout.write(self.style.SUCCESS(
+                    f"{label:<12} {'saved':<9} {full['queries'] - projected['queries']:>7} "
+                    f"{full['bytes'] - projected['bytes']:>10,} {full['memory'] - projected['memory']:>10,}"
+                ))
+
+    def measure(self, queryset, per_page, has_author):
+        """
+        Loads one page and reads what a card shows (title, excerpt, author).
+        Returns the query count, the bytes of the rows returned by the database
+        and the memory still held by the loaded objects.
+        """
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as context:
+                objects = list(queryset.all()[:per_page])
+                for obj in objects:
+                    str(obj)
+                    getattr(obj, 'excerpt', None)
+                    if has_author:
+                        obj.author.get_username()
+            memory = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del objects
+        return {
+            'queries': len(context.captured_queries),
+            'bytes': sum(self.result_bytes(query['sql']) for query in context.captured_queries),
+            'memory': memory,
+        }
+
+    @staticmethod
+    def result_bytes(sql):
+        """ Runs a captured query again and adds up the size of the values returned. """
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            for row in cursor.fetchall():
+                for value in row:
+                    if value is None:
+                        continue
+                    if isinstance(value, str):
+                        total += len(value.encode('utf-8'))
+                    elif isinstance(value, (bytes, bytearray, memoryview)):
+                        total += len(value)
+                    else:
+                        total += len(str(value))
+        return total
@@ -0,0 +1,86 @@
+# File: core/management/commands/profile_report.py
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import percentile
+from core.profiler import get_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds up the request profiler records (settings.REQUEST_PROFILER['LOG_FILE'] "
+        "and its rotated files): latency and queries per URL name and, when they "
+        "were recorded with TEMPLATE_DETAILS, the slowest templates and template tags."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="JSONL files (default: the LOG_FILE and its backups).")
+        parser.add_argument('--url-name', default=None, help="Only the requests of this URL name.")
+        parser.add_argument('--top', type=int, default=15, help="Templates and tags listed (default: 15).")
+
+    def get_files(self, options):
+        if options['files']:
+            return [Path(name) for name in options['files']]
+        log_file = get_config()['LOG_FILE']
+        if not log_file:
+            raise CommandError("REQUEST_PROFILER has no LOG_FILE: pass the files to read.")
+        log_file = Path(log_file)
+        return sorted(log_file.parent.glob(f'{log_file.name}*'))
+
+    def read_records(self, files, url_name):
+        for path in files:
+            try:
+                lines = path.read_text(encoding='utf-8').splitlines()
+            except OSError as exc:
+                raise CommandError(f"Can't read {path}: {exc}")
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if url_name is None or record.get('url_name') == url_name:
+                    yield record
+
+    def handle(self, *args, **options):
+        views = defaultdict(list)
+        timings = {'templates': defaultdict(lambda: [0, 0.0, 0]), 'tags': defaultdict(lambda: [0, 0.0, 0])}
+        for record in self.read_records(self.get_files(options), options['url_name']):
+            views[record.get('url_name') or '(page cache)'].append(record)
+            for kind, totals in timings.items():
+                for timing in record.get(kind, ()):
+                    total = totals[timing['name']]
+                    total[0] += timing['calls']
+                    total[1] += timing['ms']
+                    total[2] += 1  # requests where it's among the slowest
+
+        if not views:
+            self.stdout.write("No profiled requests.")
+            return
+
+        self.stdout.write(
+            f"{'url name':<28} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} "
+            f"{'db ms':>7} {'tpl ms':>7} {'cache':>6}"
+        )
+        rows = sorted(views.items(), key=lambda item: -sum(r['total_ms'] for r in item[1]))
+        for name, records in rows:
+            count = len(records)
+            latencies = sorted(r['total_ms'] for r in records)
+            self.stdout.write(
+                f"{name[:28]:<28} {count:>8} {percentile(latencies, 0.5):>8.1f} {percentile(latencies, 0.95):>8.1f} "
+                f"{sum(r['queries'] for r in records) / count:>8.1f} "
+                f"{sum(r['db_ms'] for r in records) / count:>7.1f} "
+                f"{sum(r['template_ms'] for r in records) / count:>7.1f} "
+                f"{sum(r['cache_calls'] for r in records) / count:>6.1f}"
+            )
+
+        for kind, totals in timings.items():
+            if not totals:
+                continue
+            self.stdout.write(f"\nSlowest {kind} (inclusive time):")
+            self.stdout.write(f"  {'total ms':>9} {'calls':>7} {'ms/call':>8} {'requests':>8}  name")
+            slowest = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:options['top']]
+            for name, (calls, ms, requests) in slowest:
+                self.stdout.write(f"  {ms:>9.1f} {calls:>7} {ms / calls:>8.2f} {requests:>8}  {name}")
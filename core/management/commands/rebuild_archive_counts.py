@@ -0,0 +1,25 @@
+# File: core/management/commands/rebuild_archive_counts.py
+from django.core.management.base import BaseCommand
+
+from core.archives import SECTIONS, rebuild_archive_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the number of published posts per month of the date archives "
+        "(core.ArchiveMonth) from the posts. The post signals keep these counts "
+        "current; run it after the first migration and after changes that skip "
+        "the signals (queryset.update(), bulk_create(), imports)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--section', action='append', dest='sections', choices=sorted(SECTIONS),
+            help="Only rebuild this section (can be repeated). Default: all.",
+        )
+
+    def handle(self, *args, **options):
+        for section in options['sections'] or SECTIONS:
+            months = rebuild_archive_counts(section)
+            self.stdout.write(f"{section}: {months} month(s) with published posts.")
+        self.stdout.write(self.style.SUCCESS("Archive counts rebuilt."))
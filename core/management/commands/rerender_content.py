@@ -0,0 +1,51 @@
+# File: core/management/commands/rerender_content.py
+from django.core.management.base import BaseCommand
+
+from core.html_pipeline import PIPELINE_VERSION, render_translated_fields, render_translation
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-renders the stored content HTML (content_rendered) and the derived text "
+        "fields (content_text, excerpt, reading_time) of pages, posts and "
+        "publications whose pipeline version is older than the current one. "
+        "Run it after changing core/html_pipeline.py and bumping PIPELINE_VERSION."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Re-render every object, even the ones already at the current version.",
+        )
+
+    def handle(self, *args, **options):
+        from blog.models import Post as BlogPost
+        from pages.models import Page
+        from posts.models import Post
+        from publications.models import Publication
+
+        # 1. django-modeltranslation models: all languages live in the same row.
+        for model in (BlogPost, Page):
+            queryset = model.objects.all()
+            if not options['all']:
+                queryset = queryset.exclude(content_pipeline_version=PIPELINE_VERSION)
+            count = 0
+            for instance in queryset.iterator():
+                # save() still fires post_save, which invalidates the page cache.
+                instance.save(update_fields=render_translated_fields(instance))
+                count += 1
+            self.stdout.write(f"{model._meta.label}: {count} object(s) re-rendered.")
+
+        # 2. django-parler models: one translation row per language.
+        for model in (Post, Publication):
+            translation_model = model._parler_meta.root_model
+            queryset = translation_model.objects.all()
+            if not options['all']:
+                queryset = queryset.exclude(content_pipeline_version=PIPELINE_VERSION)
+            count = 0
+            for translation in queryset.iterator():
+                translation.save(update_fields=render_translation(translation))
+                count += 1
+            self.stdout.write(f"{model._meta.label}: {count} translation(s) re-rendered.")
+
+        self.stdout.write(self.style.SUCCESS(f"Content rendered with pipeline version {PIPELINE_VERSION}."))
@@ -0,0 +1,131 @@
+# File: core/management/commands/run_benchmark.py
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.benchmark import DEFAULT_MIX, ClientTarget, HTTPTarget, compare_results, run_benchmark
+
+BENCHMARK_DIR = Path(settings.BASE_DIR) / 'benchmarks'
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays a weighted mix of public pages in every language (see "
+        "core/benchmark.py) and reports latency percentiles, throughput, queries "
+        "per request and peak RSS. The results are saved as JSON; --compare "
+        "prints the difference with an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help="Measured requests (default: 500).")
+        parser.add_argument('--warmup', type=int, default=50, help="Requests sent before measuring (default: 50).")
+        parser.add_argument('--concurrency', type=int, default=1, help="Parallel clients (default: 1).")
+        parser.add_argument('--seed', type=int, default=42, help="Seed of the URL choice (default: 42).")
+        parser.add_argument(
+            '--mix', default=None,
+            help="Weights, e.g. 'home=10,post_detail=50,search=0'. Unlisted scenarios keep their "
+                 f"default weight ({', '.join(f'{name}={weight}' for name, weight in DEFAULT_MIX.items())}).",
+        )
+        parser.add_argument(
+            '--language', action='append', dest='languages',
+            help="Only this language (can be repeated). Default: all settings.LANGUAGES.",
+        )
+        parser.add_argument(
+            '--base-url', default=None,
+            help="Benchmark a running server (e.g. http://127.0.0.1:8000) instead of in-process requests.",
+        )
+        parser.add_argument('--server-pid', type=int, default=None, help="Pid of that server, for its peak RSS.")
+        parser.add_argument('--host', default='localhost', help="Host header of in-process requests.")
+        parser.add_argument(
+            '--clear-cache', action='store_true',
+            help="Clear the default cache first (the warm-up then rebuilds it).",
+        )
+        parser.add_argument('--output', default=None, help=f"JSON file (default: {BENCHMARK_DIR}/<date>-<revision>.json).")
+        parser.add_argument('--compare', default=None, help="JSON file of an earlier run to compare with.")
+
+    def parse_mix(self, value):
+        mix = dict(DEFAULT_MIX)
+        if not value:
+            return mix
+        for item in value.split(','):
+            name, _, weight = item.partition('=')
+            name = name.strip()
+            if name not in DEFAULT_MIX or not weight.strip().isdigit():
+                raise CommandError(f"Invalid mix entry '{item}'. Scenarios: {', '.join(DEFAULT_MIX)}.")
+            mix[name] = int(weight)
+        return mix
+
+    def handle(self, *args, **options):
+        languages = options['languages']
+        valid_languages = {code for code, _ in settings.LANGUAGES}
+        if languages and not set(languages) <= valid_languages:
+            raise CommandError(f"Unknown language(s): {', '.join(set(languages) - valid_languages)}")
+        mix = self.parse_mix(options['mix'])
+
+        if options['clear_cache']:
+            caches['default'].clear()
+        if options['base_url']:
+            target = HTTPTarget(options['base_url'], server_pid=options['server_pid'])
+        else:
+            target = ClientTarget(host=options['host'])
+
+        self.stdout.write(
+            f"Benchmarking {target.name}: {options['warmup']} warm-up + {options['requests']} requests, "
+            f"concurrency {options['concurrency']}..."
+        )
+        results = run_benchmark(
+            target, requests=options['requests'], warmup=options['warmup'], concurrency=options['concurrency'],
+            mix=mix, languages=languages, seed=options['seed'],
+        )
+        self.print_results(results)
+
+        output = Path(options['output']) if options['output'] else BENCHMARK_DIR / (
+            f"{timezone.now():%Y%m%d-%H%M%S}-{results['meta']['git_revision'] or 'norev'}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {output}"))
+
+        if options['compare']:
+            try:
+                previous = json.loads(Path(options['compare']).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Can't read {options['compare']}: {exc}")
+            self.print_comparison(previous, results)
+
+    def print_results(self, results):
+        summary = results['summary']
+        self.stdout.write(f"\n{'scenario':<12} {'requests':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'errors':>6}")
+        for name, row in [*results['scenarios'].items(), ('ALL', summary)]:
+            latency = row['latency_ms']
+            queries = row['queries_per_request']['mean']
+            self.stdout.write(
+                f"{name:<12} {row['requests']:>8} {latency.get('p50', 0):>9.1f} {latency.get('p95', 0):>9.1f} "
+                f"{latency.get('p99', 0):>9.1f} {queries if queries is not None else '-':>8} {row['errors']:>6}"
+            )
+        peak_rss = summary['peak_rss_bytes']
+        self.stdout.write(
+            f"\nThroughput: {summary.get('throughput_rps', 0):.1f} req/s in {summary.get('seconds', 0):.1f}s. "
+            f"Peak RSS: {f'{peak_rss / 2 ** 20:.0f} MB' if peak_rss else 'unknown'}. "
+            f"Page cache: {summary['page_cache']}."
+        )
+        if summary['errors']:
+            self.stderr.write(f"{summary['errors']} request(s) failed with a 5xx status.")
+
+    def print_comparison(self, previous, results):
+        self.stdout.write(
+            f"\nCompared with {previous['meta'].get('git_revision')} ({previous['meta'].get('timestamp')}):"
+        )
+        if previous['meta'].get('dataset') != results['meta']['dataset']:
+            self.stdout.write(self.style.WARNING("  The data sets differ: the numbers aren't comparable."))
+        for name, metric, before, after, change in compare_results(previous, results):
+            if before is None or after is None:
+                continue
+            text = f"  {name:<12} {metric:<15} {before:>10.1f} -> {after:>10.1f}"
+            if change is not None:
+                text += f"  ({change:+.1f}%)"
+            self.stdout.write(text)
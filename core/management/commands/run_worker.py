@@ -0,0 +1,34 @@
+# File: core/management/commands/run_worker.py
+import signal
+
+from django.core.management.base import BaseCommand
+
+from core.tasks import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the background tasks queued in the database (core/tasks.py). "
+        "Without a process manager, run it from cron, e.g. every minute with "
+        "--max-seconds 55, or with --until-empty."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-tasks', type=int, default=None, help="Stop after this many tasks.")
+        parser.add_argument('--max-seconds', type=int, default=None, help="Stop after this many seconds.")
+        parser.add_argument('--until-empty', action='store_true', help="Stop when no task is due.")
+
+    def handle(self, *args, **options):
+        worker = Worker(log=self.stdout.write if options['verbosity'] > 1 else None)
+
+        def stop(signum, frame):
+            # The current task is finished first.
+            worker.stopping = True
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Worker {worker.id} started.")
+        processed = worker.run(
+            max_tasks=options['max_tasks'], max_seconds=options['max_seconds'], until_empty=options['until_empty'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{processed} task(s) run, {worker.failed} failure(s)."))
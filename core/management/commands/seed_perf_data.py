@@ -0,0 +1,77 @@
+# File: core/management/commands/seed_perf_data.py
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.perf_seed import DEFAULT_COUNTS, PerfDataGenerator, flush_seeded_content
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a reproducible, production-sized data set for performance "
+        "tests: users, category trees, blog posts and posts in every language, "
+        "tags, comment threads, gallery images, pages, publications, menus and "
+        "widget zones. The same --seed and counts on an empty database "
+        "(--flush) always produce the same rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help="Multiplies every count (e.g. 0.1 for a quick run, 10 for a big one).",
+        )
+        for name, default in DEFAULT_COUNTS.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name, help=f"Default: {default}.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows per INSERT (default: 500).")
+        parser.add_argument(
+            '--flush', action='store_true',
+            help="Delete ALL the posts, pages, publications, images, categories, tags, menus and "
+                 "widgets (and the generated users) first.",
+        )
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive')
+
+    def handle(self, *args, **options):
+        if settings.ENVIRONMENT == 'production':
+            raise CommandError("seed_perf_data can't run with ENVIRONMENT=production.")
+
+        # Depth and fan-out values aren't scaled.
+        unscaled = ('category_depth', 'category_children', 'comments_per_post', 'comment_depth')
+        counts = {}
+        for name, default in DEFAULT_COUNTS.items():
+            if options[name] is not None:
+                counts[name] = options[name]
+            elif name not in unscaled:
+                counts[name] = max(1, round(default * options['scale']))
+
+        if options['flush']:
+            if options['interactive']:
+                answer = input(
+                    "This deletes all the content of the database (users other than the generated "
+                    "ones are kept). Type 'yes' to continue: "
+                )
+                if answer != 'yes':
+                    raise CommandError("Cancelled.")
+            start = time.perf_counter()
+            with transaction.atomic():
+                deleted = flush_seeded_content()
+            self.stdout.write(f"Deleted {deleted} rows in {time.perf_counter() - start:.1f}s.")
+
+        generator = PerfDataGenerator(
+            seed=options['seed'], batch_size=options['batch_size'], log=self.stdout.write, **counts,
+        )
+        start = time.perf_counter()
+        with transaction.atomic():
+            created = generator.run()
+        elapsed = time.perf_counter() - start
+
+        # bulk_create() sends no signals: nothing purged the cached pages and fragments.
+        caches['default'].clear()
+        for label, count in created.items():
+            self.stdout.write(f"  {count:8d}  {label}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(created.values())} rows created in {elapsed:.1f}s (seed {options['seed']}). Caches cleared."
+        ))
@@ -0,0 +1,16 @@
+# File: core/management/commands/update_trending_scores.py
+from django.core.management.base import BaseCommand
+
+from core.trending import fold_view_buckets
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds the hourly view buckets to the trending scores now (core/trending.py). "
+        "The views queue this as a background task once per hour; the command is "
+        "for cron setups without a worker and for checking the scores by hand."
+    )
+
+    def handle(self, *args, **options):
+        folded = fold_view_buckets()
+        self.stdout.write(self.style.SUCCESS(f"{folded} view bucket(s) folded into the trending scores."))
@@ -0,0 +1,56 @@
+# File: core/management/commands/warm_caches.py
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache_warmup import DEFAULT_WORKERS, warm_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-builds the cached menus, category tree and widget zones for all "
+        "languages and reports how long each one took."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--language', action='append', dest='languages',
+            help="Only warm this language (can be repeated). Default: all settings.LANGUAGES.",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=DEFAULT_WORKERS,
+            help=f"Number of parallel threads (default: {DEFAULT_WORKERS}).",
+        )
+
+    def handle(self, *args, **options):
+        languages = options['languages']
+        valid_languages = {code for code, _ in settings.LANGUAGES}
+        if languages and not set(languages) <= valid_languages:
+            raise CommandError(f"Unknown language(s): {', '.join(set(languages) - valid_languages)}")
+
+        if isinstance(caches['default'], LocMemCache):
+            self.stdout.write(self.style.WARNING(
+                "The default cache is LocMemCache: it only lives in this process, so the web "
+                "workers won't see these entries. Use WARM_CACHES_ON_STARTUP to warm them instead."
+            ))
+
+        start = time.perf_counter()
+        results = warm_caches(languages, workers=options['workers'])
+        elapsed = time.perf_counter() - start
+
+        for result in sorted(results, key=lambda result: result.seconds, reverse=True):
+            line = f"  {result.seconds * 1000:8.1f} ms  [{result.language}] {result.name}"
+            if result.error:
+                self.stderr.write(f"{line}  FAILED: {result.error}")
+            else:
+                self.stdout.write(line)
+
+        errors = sum(1 for result in results if result.error)
+        busy = sum(result.seconds for result in results)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(results) - errors} fragment(s) warmed in {elapsed:.2f}s "
+            f"({busy:.2f}s of work, {options['workers']} worker(s)), {errors} failed."
+        ))
@@ -0,0 +1,68 @@
+# File: core/middleware.py
+import logging
+
+from . import page_cache, profiler
+
+logger = logging.getLogger(__name__)
+
+
+class AnonymousPageCacheMiddleware:
+    """
+    Serves full pages from cache to anonymous visitors.
+
+    It must be placed AFTER LocaleMiddleware (the key includes the active
+    language) and after CsrfViewMiddleware/MessageMiddleware, so that the CSRF
+    cookie is still set on responses served from cache.
+    See core/page_cache.py for the keying and invalidation rules.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not page_cache.is_cacheable_request(request):
+            return self.get_response(request)
+
+        cache_key = page_cache.get_page_key(request)
+        if cache_key is None:
+            return self.get_response(request)
+
+        response = page_cache.get_cached_response(request, cache_key)
+        if response is not None:
+            return response
+
+        page_cache.start_collecting(request)
+        response = self.get_response(request)
+        page_cache.store_response(request, response, cache_key)
+        return response
+
+
+class RequestProfilerMiddleware:
+    """
+    Records SQL, cache and template timings of a sample of the requests (or
+    of the requests with a valid X-Profile header) and checks the per-URL
+    query budgets. See core/profiler.py.
+
+    It must be the FIRST middleware, so that it also measures the others
+    (including pages served by AnonymousPageCacheMiddleware).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        profiler.install_template_timer()
+        if profiler.get_config()['TEMPLATE_DETAILS']:
+            profiler.install_tag_timers()
+
+    def __call__(self, request):
+        config = profiler.get_config()
+        if not profiler.should_profile(request, config):
+            return self.get_response(request)
+
+        response, record = profiler.profile_request(request, self.get_response, config)
+        response['X-Profile-Queries'] = str(record['queries'])
+        try:
+            profiler.write_record(record, config)
+        except OSError:
+            logger.error("Could not write the request profile.", exc_info=True)
+        profiler.check_budget(record, config)
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20, verbose_name='Section')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Year')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Month')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Published Posts')),
+            ],
+            options={
+                'verbose_name': 'Archive Month',
+                'verbose_name_plural': 'Archive Months',
+                'ordering': ['section', '-year', '-month'],
+                'constraints': [models.UniqueConstraint(fields=('section', 'year', 'month'), name='core_archivemonth_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_archivemonth'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20, verbose_name='Section')),
+                ('post_id', models.PositiveIntegerField(verbose_name='Post ID')),
+                ('hour', models.DateTimeField(verbose_name='Hour')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+            ],
+            options={
+                'verbose_name': 'Post View Bucket',
+                'verbose_name_plural': 'Post View Buckets',
+                'constraints': [models.UniqueConstraint(fields=('section', 'post_id', 'hour'), name='core_postviewbucket_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20, verbose_name='Section')),
+                ('post_id', models.PositiveIntegerField(verbose_name='Post ID')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Trending Score',
+                'verbose_name_plural': 'Trending Scores',
+                'indexes': [models.Index(fields=['section', '-score'], name='core_trending_top_idx')],
+                'constraints': [models.UniqueConstraint(fields=('section', 'post_id'), name='core_trendingscore_unique')],
+            },
+        ),
+    ]
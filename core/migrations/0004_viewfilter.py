@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_postviewbucket_trendingscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewFilter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=20, verbose_name='Section')),
+                ('post_id', models.PositiveIntegerField(verbose_name='Post ID')),
+                ('window', models.PositiveIntegerField(verbose_name='Window')),
+                ('bits', models.BinaryField(verbose_name='Bits')),
+                ('items', models.PositiveIntegerField(default=0, verbose_name='Items')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Version')),
+            ],
+            options={
+                'verbose_name': 'View Filter',
+                'verbose_name_plural': 'View Filters',
+                'constraints': [models.UniqueConstraint(fields=('section', 'post_id'), name='core_viewfilter_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:28
+
+from django.db import migrations
+
+from core.archives import SECTIONS, rebuild_archive_counts
+
+
+def fill_archive_months(apps, schema_editor):
+    """ The counts of the posts published before ArchiveMonth existed. """
+    for section in SECTIONS:
+        rebuild_archive_counts(section, apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_viewfilter'),
+        ('blog', '0001_initial'),
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_archive_months, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:46
+
+from django.db import migrations, models
+
+
+def delete_duplicate_pending_tasks(apps, schema_editor):
+    """ The race the constraint closes may have queued a unique task twice: keep the oldest. """
+    Task = apps.get_model('core', 'Task')
+    pending = Task.objects.filter(status='pending').exclude(unique_key='')
+    duplicate_keys = (
+        pending.values('unique_key').annotate(count=models.Count('pk')).filter(count__gt=1).values_list('unique_key', flat=True)
+    )
+    for unique_key in list(duplicate_keys):
+        keep = pending.filter(unique_key=unique_key).order_by('pk').values_list('pk', flat=True).first()
+        pending.filter(unique_key=unique_key).exclude(pk=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_fill_archive_months'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_pending_tasks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending'), models.Q(('unique_key', ''), _negated=True)), fields=('unique_key',), name='core_task_unique_pending'),
+        ),
+    ]
@@ -1,3 +1,150 @@
+# core/models.py
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class Task(models.Model):
+    """
+    A unit of background work, stored in the database and run by
+    `python manage.py run_worker` (see core/tasks.py).
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+
+    name = models.CharField(max_length=200, verbose_name=_("Task"), help_text=_("Dotted path of the task function."))
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name=_("Arguments"))
+    priority = models.SmallIntegerField(
+        default=0, verbose_name=_("Priority"),
+        help_text=_("Tasks with a higher priority run first."),
+    )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, verbose_name=_("Status"))
+    # Pending tasks with the same key are only queued once.
+    unique_key = models.CharField(max_length=255, blank=True, db_index=True, verbose_name=_("Unique Key"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name=_("Max Attempts"))
+    run_at = models.DateTimeField(default=timezone.now, verbose_name=_("Run After"))
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name=_("Worker"))
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Started At"))
+    last_error = models.TextField(blank=True, verbose_name=_("Last Error"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created At"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Finished At"))
+
+    class Meta:
+        verbose_name = _("Background Task")
+        verbose_name_plural = _("Background Tasks")
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's query: pending tasks due now, by priority.
+            models.Index(fields=['status', 'run_at', 'priority'], name='core_task_queue_idx'),
+        ]
+        constraints = [
+            # Two requests enqueuing the same unique task at once can't both
+            # insert it. MySQL doesn't create partial constraints (models.W036):
+            # there, only the check in enqueue_with() prevents duplicates.
+            models.UniqueConstraint(
+                fields=['unique_key'], condition=Q(status='pending') & ~Q(unique_key=''),
+                name='core_task_unique_pending',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class ArchiveMonth(models.Model):
+    """
+    Published posts per month of a section (blog, posts): the materialized
+    counts behind the date archives, kept current by the post signals
+    (see core/archives.py).
+    """
+    section = models.CharField(max_length=20, verbose_name=_("Section"))
+    year = models.PositiveSmallIntegerField(verbose_name=_("Year"))
+    month = models.PositiveSmallIntegerField(verbose_name=_("Month"))
+    count = models.PositiveIntegerField(default=0, verbose_name=_("Published Posts"))
+
+    class Meta:
+        verbose_name = _("Archive Month")
+        verbose_name_plural = _("Archive Months")
+        ordering = ['section', '-year', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'year', 'month'], name='core_archivemonth_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.section} {self.year}-{self.month:02d}: {self.count}"
+
+
+class PostViewBucket(models.Model):
+    """
+    Views of a post during one hour, not yet added to its TrendingScore
+    (see core/trending.py). Folded buckets are deleted.
+    """
+    section = models.CharField(max_length=20, verbose_name=_("Section"))
+    post_id = models.PositiveIntegerField(verbose_name=_("Post ID"))
+    hour = models.DateTimeField(verbose_name=_("Hour"))
+    views = models.PositiveIntegerField(default=0, verbose_name=_("Views"))
+
+    class Meta:
+        verbose_name = _("Post View Bucket")
+        verbose_name_plural = _("Post View Buckets")
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'post_id', 'hour'], name='core_postviewbucket_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.section} #{self.post_id} {self.hour:%Y-%m-%d %H}h: {self.views}"
+
+
+class TrendingScore(models.Model):
+    """
+    Time-decayed views of a post, as log2 of the views weighted by their
+    age relative to a fixed epoch: ordering by it is ordering by the decayed
+    views at any moment (see core/trending.py).
+    """
+    section = models.CharField(max_length=20, verbose_name=_("Section"))
+    post_id = models.PositiveIntegerField(verbose_name=_("Post ID"))
+    score = models.FloatField(verbose_name=_("Score"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated At"))
+
+    class Meta:
+        verbose_name = _("Trending Score")
+        verbose_name_plural = _("Trending Scores")
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'post_id'], name='core_trendingscore_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['section', '-score'], name='core_trending_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.section} #{self.post_id}: {self.score:.2f}"
+
+
+class ViewFilter(models.Model):
+    """
+    The visitors who already saw a post during the current counting window,
+    as a scalable Bloom filter (see core/view_counting.py). One row per post,
+    emptied when a new window starts.
+    """
+    section = models.CharField(max_length=20, verbose_name=_("Section"))
+    post_id = models.PositiveIntegerField(verbose_name=_("Post ID"))
+    window = models.PositiveIntegerField(verbose_name=_("Window"))
+    bits = models.BinaryField(verbose_name=_("Bits"))
+    items = models.PositiveIntegerField(default=0, verbose_name=_("Items"))
+    # Bumped by every update: a worker only writes the filter it read.
+    version = models.PositiveIntegerField(default=0, verbose_name=_("Version"))
+
+    class Meta:
+        verbose_name = _("View Filter")
+        verbose_name_plural = _("View Filters")
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'post_id'], name='core_viewfilter_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.section} #{self.post_id} (window {self.window}): {self.items}"
@@ -0,0 +1,357 @@
+# File: core/page_cache.py
+"""
+Full-page cache for anonymous visitors, invalidated by surrogate tags.
+
+While a page is rendered, views and template tags "emit" surrogate tags that
+describe the content the page depends on (a post, a category, a widget zone,
+a menu...). The page is stored together with the version each of those tags
+had when it was emitted. Model signals later "purge" a tag by giving it a new
+version, so every stored page that depended on it becomes stale at once, and
+only those pages; a page whose tags were purged while it was being rendered
+is not stored at all.
+"""
+import hashlib
+import logging
+import re
+import time
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from django.utils.translation import get_language
+
+from .static_export import EXPORT_ENVIRON_KEY
+from .view_counting import count_view
+
+logger = logging.getLogger(__name__)
+
+# --- Tag naming ---
+# Every cached page depends on this tag, so purging it empties the whole page cache.
+SITE_TAG = 'site'
+
+# Prefix for the cache keys holding the current version of each tag.
+TAG_VERSION_PREFIX = 'page_cache_tag'
+
+# The {% csrf_token %} value is never stored. It is swapped for this marker and
+# replaced by the visitor's own token when the page is served from cache.
+CSRF_PLACEHOLDER = b'__PAGE_CACHE_CSRF_TOKEN__'
+CSRF_INPUT_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+# Query parameters that change the rendered page (pagination and search).
+DEFAULT_QUERY_PARAMS = (
+    'page', 'q', 'p_page', 'p_post', 'p_entry', 'p_pub', 'posts_page', 'comments_page',
+    'type', 'category', 'tag', 'year',
+)
+# Query parameters that never change the page (campaign tracking).
+IGNORED_QUERY_PARAMS = ('fbclid', 'gclid')
+IGNORED_QUERY_PREFIXES = ('utm_',)
+
+# Validators set by views (see core/conditional.py) that are stored with the page.
+STORED_HEADERS = ('ETag', 'Last-Modified')
+
+DEFAULT_EXCLUDED_PATHS = (
+    r'^/([a-z]{2}/)?admin/',
+    r'^/([a-z]{2}/)?accounts/(signup|profile/edit)/',
+    r'^/accounts/',
+    r'^/i18n/',
+    r'^/summernote/',
+    r'^/tinymce/',
+    # Each shard has its own cache, keyed by its content (core/sitemaps.py).
+    r'^/sitemap',
+    # Answered from an in-memory index (search/suggest.py), one URL per keystroke.
+    r'^/([a-z]{2}/)?search/suggest/',
+)
+
+
+def object_tag(obj):
+    """ Tag for a single model instance, e.g. 'blog.post:12'. """
+    return model_object_tag(type(obj), obj.pk)
+
+
+def model_object_tag(model, pk):
+    """ Same as object_tag(), when only the model and the primary key are known. """
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def list_tag(model):
+    """ Tag for any page listing instances of a model, e.g. 'blog.post:list'. """
+    return f'{model._meta.label_lower}:list'
+
+
+def zone_tag(zone_slug):
+    """ Tag for every page rendering the given widget zone. """
+    return f'widgets.zone:{zone_slug}'
+
+
+def menu_tag(menu_slug):
+    """ Tag for every page rendering the given menu. """
+    return f'menus.menu:{menu_slug}'
+
+
+# --- Emitting tags during render ---
+
+def add_surrogate_keys(request, *tags):
+    """
+    Records that the page being rendered for `request` depends on `tags`,
+    with the version each tag has now: if one is purged before the page is
+    stored, the page isn't stored (see store_response()).
+    Safe to call with a None request (e.g. when a template is rendered
+    outside a request cycle): it then does nothing.
+    """
+    if request is None:
+        return
+    keys = getattr(request, '_surrogate_keys', None)
+    if keys is not None:
+        new_tags = [tag for tag in tags if tag not in keys]
+        if new_tags:
+            keys.update(get_tag_versions(new_tags))
+
+
+def track_view(request, obj):
+    """
+    Records that this page shows `obj`, so every time the page is served
+    from cache the request is counted as a view of it too (if it is one,
+    see core/view_counting.py).
+    """
+    if request is None:
+        return
+    views = getattr(request, '_page_cache_views', None)
+    if views is not None:
+        views.append((obj._meta.label, obj.pk))
+
+
+# --- Purging tags ---
+
+def _version_key(tag):
+    return f'{TAG_VERSION_PREFIX}:{tag}'
+
+
+def _new_version():
+    # The creation time is kept in the version so it can be used as a
+    # Last-Modified date (see version_timestamp()).
+    return f'{int(time.time())}.{uuid.uuid4().hex}'
+
+
+def version_timestamp(version):
+    """ Returns the Unix time at which a tag version was created. """
+    try:
+        return int(version.split('.', 1)[0])
+    except (AttributeError, ValueError):
+        return None
+
+
+def purge(*tags):
+    """
+    Invalidates every cached page that depends on any of `tags`.
+    """
+    if not tags:
+        return
+    cache.set_many({_version_key(tag): _new_version() for tag in tags}, None)
+    logger.debug("Page cache purged for tags: %s", ', '.join(tags))
+
+
+def purge_instance(instance, *extra_tags, update_fields=None):
+    """
+    Purges the tags of a saved or deleted model instance: its own tag and the
+    list tag of its model, plus any `extra_tags`. Saves that only touch the
+    view counter are ignored, since they don't change any rendered content.
+    """
+    if update_fields and set(update_fields) <= {'views_count'}:
+        return
+    purge(object_tag(instance), list_tag(type(instance)), *extra_tags)
+
+
+def purge_translation_master(translation, *extra_tags):
+    """
+    Purges the tags of the object a parler translation belongs to. Parler
+    saves translations after the object itself, so the pages are purged
+    again once the translated fields are stored. Nothing is done when the
+    object is gone: it was deleted together with its translations, and its
+    own post_delete purges the pages.
+    """
+    if not translation.master_id:
+        return
+    try:
+        master = translation.master
+    except ObjectDoesNotExist:
+        return
+    purge_instance(master, *extra_tags)
+
+
+def get_tag_versions(tags):
+    """
+    Returns the current version of each tag, creating the missing ones.
+    A tag whose version was evicted from the cache gets a brand new version,
+    so pages stored against the old one can never be served again.
+    """
+    version_keys = {_version_key(tag): tag for tag in tags}
+    versions = cache.get_many(version_keys.keys())
+    missing = [key for key in version_keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), None)
+        versions.update(cache.get_many(missing))
+    return {version_keys[key]: value for key, value in versions.items()}
+
+
+# --- Request/response handling (used by AnonymousPageCacheMiddleware) ---
+
+@lru_cache(maxsize=1)
+def _excluded_path_patterns():
+    patterns = getattr(settings, 'PAGE_CACHE_EXCLUDED_PATHS', DEFAULT_EXCLUDED_PATHS)
+    return [re.compile(pattern) for pattern in patterns]
+
+
+def is_cacheable_request(request):
+    """
+    Only anonymous GET/HEAD requests without session or messages state are
+    eligible. Without a session cookie the visitor cannot be logged in, so we
+    never need to touch `request.user` (and the session) to decide.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.META.get(EXPORT_ENVIRON_KEY):
+        # The static exporter always renders fresh pages.
+        return False
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return False
+    if getattr(settings, 'MESSAGE_COOKIE_NAME', 'messages') in request.COOKIES:
+        return False
+    return not any(pattern.match(request.path) for pattern in _excluded_path_patterns())
+
+
+def get_page_key(request):
+    """
+    Builds the cache key from host, path, active language and the query
+    parameters that affect rendering. Returns None when the request carries
+    an unknown query parameter, since we cannot know if it changes the page.
+    """
+    relevant_params = getattr(settings, 'PAGE_CACHE_QUERY_PARAMS', DEFAULT_QUERY_PARAMS)
+    query = []
+    for name in sorted(request.GET):
+        if name in relevant_params:
+            query.extend((name, value) for value in request.GET.getlist(name))
+        elif name in IGNORED_QUERY_PARAMS or name.startswith(IGNORED_QUERY_PREFIXES):
+            continue
+        else:
+            return None
+
+    language_code = getattr(request, 'LANGUAGE_CODE', None) or get_language()
+    raw_key = f'{request.get_host()}|{request.path}|{query}'
+    digest = hashlib.md5(raw_key.encode('utf-8')).hexdigest()
+    return f'page_cache:{language_code}:{digest}'
+
+
+def start_collecting(request):
+    """ Prepares the request to collect surrogate tags (and their versions) and tracked views. """
+    request._surrogate_keys = get_tag_versions([SITE_TAG])
+    request._page_cache_views = []
+
+
+def get_cached_response(request, cache_key):
+    """
+    Returns a fresh HttpResponse for `cache_key`, or None on a miss or when
+    any tag the page depends on has been purged since it was stored.
+    """
+    entry = cache.get(cache_key)
+    if entry is None:
+        return None
+
+    stored_versions = entry['tags']
+    current_versions = cache.get_many([_version_key(tag) for tag in stored_versions])
+    for tag, version in stored_versions.items():
+        if current_versions.get(_version_key(tag)) != version:
+            logger.debug("Page cache STALE for %s (tag '%s' purged).", request.path, tag)
+            return None
+
+    content = entry['content']
+    if CSRF_PLACEHOLDER in content:
+        # get_token() also flags the CSRF cookie to be (re)sent by CsrfViewMiddleware.
+        content = content.replace(CSRF_PLACEHOLDER, get_token(request).encode('ascii'))
+
+    response = HttpResponse(content, content_type=entry['content_type'])
+    for header, value in entry.get('headers', {}).items():
+        response[header] = value
+    response['X-Page-Cache'] = 'HIT'
+
+    for label, pk in entry['views']:
+        count_view(request, label, pk)
+
+    # The stored validators are still valid (no tag was purged), so we can
+    # answer a conditional request with a 304 without sending the body.
+    etag = response.get('ETag')
+    last_modified = parse_http_date_safe(response['Last-Modified']) if response.has_header('Last-Modified') else None
+    if etag or last_modified:
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+        response['X-Page-Cache'] = 'HIT'
+    return response
+
+
+def _is_cacheable_response(request, response):
+    if request.method != 'GET' or response.status_code != 200:
+        return False
+    if response.streaming or getattr(response, 'is_rendered', True) is False:
+        return False
+    cache_control = response.get('Cache-Control', '')
+    if 'private' in cache_control or 'no-store' in cache_control or 'no-cache' in cache_control:
+        return False
+    if any(name != settings.CSRF_COOKIE_NAME for name in response.cookies):
+        return False
+    session = getattr(request, 'session', None)
+    if session is not None and session.modified:
+        return False
+    storage = getattr(request, '_messages', None)
+    if storage is not None and (storage.used or getattr(storage, '_queued_messages', None)):
+        return False
+    return True
+
+
+def get_page_cache_timeout():
+    """ Reads the page cache timeout from the site configuration. """
+    try:
+        from site_settings.models import SiteConfiguration
+        return SiteConfiguration.get_solo().page_cache_timeout
+    except Exception:
+        logger.warning("SiteConfiguration not available. Page cache disabled for this response.")
+        return 0
+
+
+def store_response(request, response, cache_key):
+    """
+    Stores a rendered response together with the versions its tags had when
+    they were emitted. Responses that depend on the visitor are never stored,
+    and neither are the ones whose content was purged while they were being
+    rendered: they may have been built from the old data, and stored with
+    the new versions they would look valid until they expire.
+    """
+    if not _is_cacheable_response(request, response):
+        response['X-Page-Cache'] = 'BYPASS'
+        return
+
+    timeout = get_page_cache_timeout()
+    if timeout <= 0:
+        return
+
+    versions = request._surrogate_keys
+    purged = [tag for tag, version in get_tag_versions(versions).items() if versions[tag] != version]
+    if purged:
+        logger.debug("Page cache SKIP for %s (tags purged while rendering: %s).", request.path, ', '.join(purged))
+        response['X-Page-Cache'] = 'BYPASS'
+        return
+
+    content = CSRF_INPUT_RE.sub(rb'\1' + CSRF_PLACEHOLDER + rb'\2', response.content)
+    entry = {
+        'content': content,
+        'content_type': response['Content-Type'],
+        'headers': {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+        'tags': versions,
+        'views': request._page_cache_views,
+    }
+    cache.set(cache_key, entry, timeout)
+    response['X-Page-Cache'] = 'MISS'
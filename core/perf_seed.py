@@ -0,0 +1,687 @@
+# File: core/perf_seed.py
+"""
+Generates a production-sized data set for local performance tests (see the
+`seed_perf_data` management command).
+
+Everything comes from one random.Random(seed): with the same seed, the same
+counts and an empty database (`--flush`), two runs create exactly the same
+rows with the same primary keys, so benchmarks can be compared.
+
+Rows are inserted with bulk_create(), which doesn't call save() nor send
+signals, so this module does by hand what save() would do:
+- primary keys are assigned here (MySQL doesn't return them from bulk inserts);
+- the MPTT fields (lft, rght, tree_id, level) of categories, comments and
+  menu items are computed with number_tree();
+- the rendered HTML and derived text fields are filled with the html_pipeline
+  helpers;
+- profiles are created for the new users;
+- the archive counts (ArchiveMonth) are rebuilt for every section once the
+  posts exist, with rebuild_archive_counts().
+Caches aren't purged by signals either: the command clears them at the end.
+"""
+import logging
+import random
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+from django.utils.translation import override
+
+from .archives import SECTIONS, rebuild_archive_counts
+from .html_pipeline import render_translated_fields, render_translation
+
+logger = logging.getLogger(__name__)
+
+USERNAME_PREFIX = 'perf-user-'
+USER_PASSWORD = 'perf-password'
+IMAGE_DIR = 'perf'
+IMAGE_FILES = 12
+
+DEFAULT_COUNTS = {
+    'users': 200,
+    'root_categories': 6,
+    'category_depth': 3,
+    'category_children': 3,
+    'blog_posts': 1000,
+    'posts': 1000,
+    'comments_per_post': 6,
+    'comment_depth': 4,
+    'tags': 150,
+    'images': 200,
+    'pages': 80,
+    'publications': 80,
+}
+
+WORDS = {
+    'en': (
+        'art', 'light', 'colour', 'studio', 'painting', 'canvas', 'gallery', 'shadow', 'form', 'space',
+        'music', 'voice', 'silence', 'rhythm', 'memory', 'city', 'river', 'garden', 'window', 'stone',
+        'morning', 'evening', 'journey', 'story', 'image', 'paper', 'ink', 'line', 'surface', 'texture',
+        'the', 'a', 'of', 'and', 'in', 'with', 'between', 'through', 'about', 'under',
+        'new', 'old', 'quiet', 'bright', 'open', 'hidden', 'slow', 'warm', 'deep', 'simple',
+        'we', 'they', 'it', 'is', 'was', 'becomes', 'returns', 'shows', 'builds', 'finds',
+        'work', 'project', 'process', 'exhibition', 'workshop', 'archive', 'research', 'practice', 'method', 'theory',
+    ),
+    'es': (
+        'arte', 'luz', 'color', 'taller', 'pintura', 'lienzo', 'galería', 'sombra', 'forma', 'espacio',
+        'música', 'voz', 'silencio', 'ritmo', 'memoria', 'ciudad', 'río', 'jardín', 'ventana', 'piedra',
+        'mañana', 'tarde', 'viaje', 'historia', 'imagen', 'papel', 'tinta', 'línea', 'superficie', 'textura',
+        'el', 'la', 'de', 'y', 'en', 'con', 'entre', 'desde', 'sobre', 'bajo',
+        'nuevo', 'antiguo', 'tranquilo', 'brillante', 'abierto', 'oculto', 'lento', 'cálido', 'profundo', 'sencillo',
+        'nosotros', 'ellos', 'esto', 'es', 'era', 'vuelve', 'regresa', 'muestra', 'construye', 'encuentra',
+        'obra', 'proyecto', 'proceso', 'exposición', 'archivo', 'investigación', 'práctica', 'método', 'teoría', 'mirada',
+    ),
+    'ca': (
+        'art', 'llum', 'color', 'taller', 'pintura', 'llenç', 'galeria', 'ombra', 'forma', 'espai',
+        'música', 'veu', 'silenci', 'ritme', 'memòria', 'ciutat', 'riu', 'jardí', 'finestra', 'pedra',
+        'matí', 'vespre', 'viatge', 'història', 'imatge', 'paper', 'tinta', 'línia', 'superfície', 'textura',
+        'el', 'la', 'de', 'i', 'a', 'amb', 'entre', 'des de', 'sobre', 'sota',
+        'nou', 'antic', 'tranquil', 'brillant', 'obert', 'amagat', 'lent', 'càlid', 'profund', 'senzill',
+        'nosaltres', 'ells', 'això', 'és', 'era', 'torna', 'mostra', 'construeix', 'troba', 'mirada',
+        'obra', 'projecte', 'procés', 'exposició', 'arxiu', 'recerca', 'pràctica', 'mètode', 'teoria', 'mirall',
+    ),
+}
+
+FIRST_NAMES = ('Ana', 'Marc', 'Laia', 'Jordi', 'Lucía', 'Pau', 'Marta', 'David', 'Núria', 'Sergio', 'Elena', 'Oriol')
+LAST_NAMES = ('García', 'Puig', 'Martínez', 'Vidal', 'López', 'Soler', 'Sánchez', 'Ferrer', 'Romero', 'Serra')
+
+# Widgets of each zone used by the templates (see widgets/models.py for the types).
+WIDGET_ZONES = {
+    'homepage-main-content': ('post_carousel', 'post_grid_recent'),
+    'homepage-content-grid': ('post_grid_popular', 'post_grid_commented', 'post_grid_editor'),
+    'homepage-sidebar-left': ('blog_categories', 'user_directory'),
+    'homepage-sidebar-right': ('recent_posts', 'testimonials'),
+    'blog-sidebar-left': ('blog_categories', 'recent_posts'),
+    'blog-sidebar-right': ('most_viewed_posts', 'most_commented_posts', 'editor_picks_posts'),
+    'posts-sidebar-left': ('blog_categories',),
+    'posts-sidebar-right': ('recent_posts', 'most_viewed_posts'),
+}
+
+SOCIAL_LINKS = (
+    ('Instagram', 'https://www.instagram.com/', 'fab fa-instagram'),
+    ('Facebook', 'https://www.facebook.com/', 'fab fa-facebook'),
+    ('YouTube', 'https://www.youtube.com/', 'fab fa-youtube'),
+    ('LinkedIn', 'https://www.linkedin.com/', 'fab fa-linkedin'),
+)
+
+
+def next_pk(model):
+    return (model.objects.aggregate(max_pk=Max('pk'))['max_pk'] or 0) + 1
+
+
+def number_tree(node, children, tree_id, level=0, left=1):
+    """
+    Sets the MPTT fields of `node` and its descendants (`children` maps a pk
+    to the list of child objects, in sibling order). Returns node.rght.
+    """
+    node.tree_id, node.level, node.lft = tree_id, level, left
+    right = left + 1
+    for child in children.get(node.pk, ()):
+        right = number_tree(child, children, tree_id, level + 1, right) + 1
+    node.rght = right
+    return right
+
+
+def number_forest(roots, children, model):
+    """ Numbers every tree, one tree_id per root (as django-mptt does). """
+    tree_id = (model.objects.aggregate(max_tree=Max('tree_id'))['max_tree'] or 0) + 1
+    for offset, root in enumerate(roots):
+        number_tree(root, children, tree_id + offset)
+
+
+def flush_seeded_content():
+    """
+    Deletes the content of every model the generator fills, and the generated
+    users. Other users (administrators) are kept. Returns the number of rows.
+    """
+    from blog.models import Post as BlogPost
+    from categories.models import Category
+    from gallery.models import Image
+    from menus.models import Menu
+    from pages.models import Page
+    from posts.models import Post
+    from publications.models import Publication
+    from taggit.models import Tag as TaggitTag
+    from tags.models import Tag
+    from widgets.models import WidgetZone
+
+    deleted = 0
+    # Pages first: Page.author is PROTECT.
+    for queryset in (
+        Menu.objects.all(), WidgetZone.objects.all(), Page.objects.all(), BlogPost.objects.all(),
+        Post.objects.all(), Publication.objects.all(), Image.objects.all(), TaggitTag.objects.all(),
+        Tag.objects.all(), Category.objects.all(), User.objects.filter(username__startswith=USERNAME_PREFIX),
+    ):
+        deleted += queryset.delete()[0]
+    return deleted
+
+
+class PerfDataGenerator:
+    """ Creates the whole data set. Call run(); each step reports through `log`. """
+
+    def __init__(self, seed=42, batch_size=500, log=None, **counts):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.counts = {**DEFAULT_COUNTS, **counts}
+        self.log = log or logger.info
+        self.languages = [code for code, _ in settings.LANGUAGES]
+        # Dates are relative to today (midnight), not to the time of the run.
+        self.now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        # Rows created per model label, and the models (for reset_sequences()).
+        self.created = {}
+        self.models = []
+
+    # --- Random content ---
+
+    def words(self, language, count):
+        vocabulary = WORDS.get(language, WORDS['en'])
+        return ' '.join(self.rng.choice(vocabulary) for _ in range(count))
+
+    def title(self, language, low=3, high=8):
+        return self.words(language, self.rng.randint(low, high)).capitalize()
+
+    def sentence(self, language):
+        return self.words(language, self.rng.randint(8, 20)).capitalize() + '.'
+
+    def paragraph(self, language):
+        return ' '.join(self.sentence(language) for _ in range(self.rng.randint(2, 6)))
+
+    def html_body(self, language):
+        """ Mostly paragraphs; some headings, links, lists and images. 1 in 10 bodies is long. """
+        blocks = []
+        paragraphs = self.rng.randint(25, 45) if self.rng.random() < 0.1 else self.rng.randint(3, 12)
+        for index in range(paragraphs):
+            roll = self.rng.random()
+            if index and roll < 0.12:
+                blocks.append(f'<h2>{self.title(language)}</h2>')
+            elif roll < 0.18:
+                items = ''.join(f'<li>{self.title(language)}</li>' for _ in range(self.rng.randint(2, 5)))
+                blocks.append(f'<ul>{items}</ul>')
+            elif roll < 0.24:
+                blocks.append(f'<p><img src="{settings.MEDIA_URL}{self.image_name()}" alt="{self.title(language)}"></p>')
+            text = self.paragraph(language)
+            if self.rng.random() < 0.2:
+                text += f' <a href="https://example.com/{slugify(self.title(language))}">{self.title(language, 1, 3)}</a>'
+            blocks.append(f'<p>{text}</p>')
+        return '\n'.join(blocks)
+
+    def past_date(self, max_days=3 * 365):
+        return self.now - timedelta(days=self.rng.randint(0, max_days), seconds=self.rng.randint(0, 86399))
+
+    def popularity(self):
+        """ A few very popular items and a long tail, like real traffic. """
+        return int(self.rng.paretovariate(1.2) * 10)
+
+    def image_name(self):
+        return f'{IMAGE_DIR}/perf-{self.rng.randrange(IMAGE_FILES):02d}.jpg'
+
+    def sample(self, population, low, high):
+        return self.rng.sample(population, min(len(population), self.rng.randint(low, high)))
+
+    # --- Steps ---
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.created[model._meta.label] = self.created.get(model._meta.label, 0) + len(objects)
+        if model not in self.models:
+            self.models.append(model)
+        return objects
+
+    def run(self):
+        with override(settings.LANGUAGE_CODE):
+            steps = (
+                self.create_image_files, self.create_users, self.create_categories, self.create_tags,
+                self.create_images, self.create_blog_posts, self.create_posts, self.create_pages,
+                self.create_publications, self.create_menus, self.create_widgets,
+                self.create_archive_counts,
+            )
+            for step in steps:
+                step()
+            self.reset_sequences()
+        return self.created
+
+    def reset_sequences(self):
+        """ Explicit pks don't move PostgreSQL sequences (SQLite and MySQL follow the max id). """
+        statements = connection.ops.sequence_reset_sql(no_style(), self.models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def create_image_files(self):
+        """ A few placeholder JPEGs, shared by the gallery and the featured images. """
+        from PIL import Image as PILImage, ImageDraw
+
+        directory = Path(settings.MEDIA_ROOT) / IMAGE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        colours = random.Random(0)
+        for index in range(IMAGE_FILES):
+            path = directory / f'perf-{index:02d}.jpg'
+            if path.exists():
+                continue
+            picture = PILImage.new('RGB', (1200, 800), tuple(colours.randrange(256) for _ in range(3)))
+            draw = ImageDraw.Draw(picture)
+            for _ in range(6):
+                x, y = colours.randrange(1000), colours.randrange(600)
+                draw.rectangle((x, y, x + 200, y + 200), fill=tuple(colours.randrange(256) for _ in range(3)))
+            picture.save(path, quality=80)
+        self.log(f"Placeholder images in {directory}")
+
+    def create_users(self):
+        from accounts.models import Profile
+
+        password = make_password(USER_PASSWORD)
+        first_pk, first_profile_pk = next_pk(User), next_pk(Profile)
+        users, profiles = [], []
+        for index in range(self.counts['users']):
+            first_name, last_name = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            username = f'{USERNAME_PREFIX}{first_pk + index:05d}'
+            users.append(User(
+                pk=first_pk + index, username=username, password=password, first_name=first_name,
+                last_name=last_name, email=f'{username}@example.com', date_joined=self.past_date(),
+            ))
+            profiles.append(Profile(
+                pk=first_profile_pk + index, user_id=first_pk + index,
+                display_name=f'{first_name} {last_name}' if self.rng.random() < 0.7 else '',
+                location=self.rng.choice(('Barcelona', 'Madrid', 'València', 'Girona', '')),
+                bio=self.paragraph(self.rng.choice(self.languages)),
+                default_avatar_choice=self.rng.choice(Profile.AvatarChoice.values),
+                is_trusted_commenter=self.rng.random() < 0.2,
+                is_listed_publicly=self.rng.random() < 0.6,
+            ))
+        self.bulk_create(User, users)
+        self.bulk_create(Profile, profiles)
+        self.user_ids = [user.pk for user in users] or list(User.objects.values_list('pk', flat=True))
+        self.log(f"{len(users)} users with profiles (password: {USER_PASSWORD!r})")
+
+    def create_categories(self):
+        from categories.models import Category
+
+        pk = next_pk(Category)
+        roots, children, categories = [], defaultdict(list), []
+
+        def add(parent, level):
+            nonlocal pk
+            category = Category(pk=pk, parent_id=parent.pk if parent else None)
+            for language in self.languages:
+                name = self.title(language, 1, 3)
+                setattr(category, f'name_{language}', name)
+                setattr(category, f'slug_{language}', f'{slugify(name)}-{pk}')
+                setattr(category, f'description_{language}', self.sentence(language))
+            pk += 1
+            categories.append(category)
+            if parent:
+                children[parent.pk].append(category)
+            else:
+                roots.append(category)
+            if level < self.counts['category_depth']:
+                for _ in range(self.rng.randint(1, self.counts['category_children'])):
+                    add(category, level + 1)
+
+        for _ in range(self.counts['root_categories']):
+            add(None, 0)
+        number_forest(roots, children, Category)
+        self.bulk_create(Category, categories)
+        self.category_ids = [category.pk for category in categories]
+        self.log(f"{len(categories)} categories in {len(roots)} trees")
+
+    def create_tags(self):
+        """ django-taggit tags (blog.Post) and the parler tags of the posts app. """
+        from taggit.models import Tag as TaggitTag
+        from tags.models import Tag
+
+        taggit_pk, tag_pk = next_pk(TaggitTag), next_pk(Tag)
+        taggit_tags, tags, tag_translations = [], [], []
+        # taggit's Tag.name is unique, and so is each of its name_<language> columns.
+        seen = {
+            language: set(TaggitTag.objects.values_list(f'name_{language}', flat=True))
+            for language in self.languages
+        }
+        for index in range(self.counts['tags']):
+            labels = {}
+            for language in self.languages:
+                label = self.title(language, 1, 2)
+                while label in seen[language]:
+                    label = self.title(language, 1, 3)
+                seen[language].add(label)
+                labels[language] = label
+            taggit_tag = TaggitTag(pk=taggit_pk + index, slug=f"{slugify(labels[settings.LANGUAGE_CODE])}-{taggit_pk + index}")
+            for language, label in labels.items():
+                setattr(taggit_tag, f'name_{language}', label)
+            taggit_tags.append(taggit_tag)
+
+            tag = Tag(pk=tag_pk + index, slug=f"{slugify(labels[settings.LANGUAGE_CODE])}-{tag_pk + index}")
+            tags.append(tag)
+            tag_translations.extend(
+                Tag._parler_meta.root_model(master_id=tag.pk, language_code=language, label=label)
+                for language, label in labels.items()
+            )
+        self.bulk_create(TaggitTag, taggit_tags)
+        self.bulk_create(Tag, tags)
+        self.bulk_create(Tag._parler_meta.root_model, tag_translations)
+        self.taggit_tag_ids = [tag.pk for tag in taggit_tags]
+        self.tag_ids = [tag.pk for tag in tags]
+        self.log(f"{len(taggit_tags)} blog tags and {len(tags)} post tags")
+
+    def create_images(self):
+        from gallery.models import Image
+
+        first_pk = next_pk(Image)
+        images = []
+        for index in range(self.counts['images']):
+            image = Image(pk=first_pk + index, image=self.image_name())
+            for language in self.languages:
+                setattr(image, f'title_{language}', self.title(language, 2, 5))
+                setattr(image, f'description_{language}', self.paragraph(language) if self.rng.random() < 0.6 else '')
+            images.append(image)
+        self.bulk_create(Image, images)
+        self.log(f"{len(images)} gallery images")
+
+    def comment_forest(self, count):
+        """
+        Shapes `count` comments into threads: returns a list of parent indexes
+        (None for a top-level comment), each reply after its parent.
+        """
+        parents, depths = [], []
+        for index in range(count):
+            if index and self.rng.random() < 0.5:
+                parent = self.rng.randrange(index)
+                if depths[parent] < self.counts['comment_depth']:
+                    parents.append(parent)
+                    depths.append(depths[parent] + 1)
+                    continue
+            parents.append(None)
+            depths.append(0)
+        return parents
+
+    def build_comments(self, model, post_id, published, first_pk, make_fields):
+        """ One thread forest for a post. Returns (comments, roots, children). """
+        count = self.rng.randint(0, 2 * self.counts['comments_per_post'])
+        comments, roots, children = [], [], defaultdict(list)
+        created_at = published
+        for index, parent in enumerate(self.comment_forest(count)):
+            created_at += timedelta(minutes=self.rng.randint(1, 3000))
+            user_id = self.rng.choice(self.user_ids) if self.user_ids and self.rng.random() < 0.6 else None
+            comment = model(
+                pk=first_pk + index, post_id=post_id, user_id=user_id,
+                parent_id=comments[parent].pk if parent is not None else None,
+                author_name='' if user_id else f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                author_email='' if user_id else 'visitor@example.com',
+                is_approved=self.rng.random() < 0.9,
+                **make_fields(created_at),
+            )
+            comments.append(comment)
+            if parent is None:
+                roots.append(comment)
+            else:
+                children[comment.parent_id].append(comment)
+        return comments, roots, children
+
+    def create_blog_posts(self):
+        from blog.models import Comment, Post
+
+        first_pk, comment_pk = next_pk(Post), next_pk(Comment)
+        content_type = ContentType.objects.get_for_model(Post)
+        TaggedItem = Post.tags.through
+        posts, post_categories, tagged_items = [], [], []
+        comments, comment_roots, comment_children = [], [], {}
+        for index in range(self.counts['blog_posts']):
+            pk = first_pk + index
+            post = Post(
+                pk=pk, author_id=self.rng.choice(self.user_ids), published_date=self.past_date(),
+                status='published' if self.rng.random() < 0.9 else 'draft',
+                featured_image=self.image_name() if self.rng.random() < 0.7 else None,
+                views_count=self.popularity(),
+                editor_rating=self.rng.randint(50, 100) if self.rng.random() < 0.1 else 0,
+            )
+            for language in self.languages:
+                title = self.title(language)
+                setattr(post, f'title_{language}', title)
+                setattr(post, f'slug_{language}', f'{slugify(title)[:200]}-{pk}')
+                setattr(post, f'content_{language}', self.html_body(language))
+                setattr(post, f'meta_description_{language}', self.sentence(language)[:160])
+            render_translated_fields(post)
+            posts.append(post)
+
+            post_categories.extend(
+                Post.categories.through(post_id=pk, category_id=category_id)
+                for category_id in self.sample(self.category_ids, 1, 3)
+            )
+            tagged_items.extend(
+                TaggedItem(content_type=content_type, object_id=pk, tag_id=tag_id)
+                for tag_id in self.sample(self.taggit_tag_ids, 0, 5)
+            )
+
+            def comment_fields(created_at):
+                return {f'content_{language}': self.paragraph(language) for language in self.languages}
+
+            thread, roots, children = self.build_comments(Comment, pk, post.published_date, comment_pk, comment_fields)
+            comment_pk += len(thread)
+            comments.extend(thread)
+            comment_roots.extend(roots)
+            comment_children.update(children)
+
+        self.bulk_create(Post, posts)
+        self.bulk_create(Post.categories.through, post_categories)
+        self.bulk_create(TaggedItem, tagged_items)
+        number_forest(comment_roots, comment_children, Comment)
+        self.bulk_create(Comment, comments)
+        self.log(f"{len(posts)} blog posts, {len(comments)} comments, {len(tagged_items)} tag links")
+
+    def create_posts(self):
+        from comments.models import Comment
+        from posts.models import Post
+        from tags.models import TaggedPost
+
+        Translation = Post._parler_meta.root_model
+        first_pk, comment_pk = next_pk(Post), next_pk(Comment)
+        posts, translations, post_categories, tagged_posts = [], [], [], []
+        comments, comment_roots, comment_children = [], [], {}
+        for index in range(self.counts['posts']):
+            pk = first_pk + index
+            post = Post(
+                pk=pk, author_id=self.rng.choice(self.user_ids), published_date=self.past_date(),
+                status='published' if self.rng.random() < 0.9 else 'draft',
+                featured_image=self.image_name() if self.rng.random() < 0.7 else None,
+                views_count=self.popularity(),
+                editor_rating=self.rng.randint(50, 100) if self.rng.random() < 0.1 else 0,
+            )
+            posts.append(post)
+            # Not every post is translated to every language.
+            languages = [settings.LANGUAGE_CODE] + [
+                language for language in self.languages
+                if language != settings.LANGUAGE_CODE and self.rng.random() < 0.8
+            ]
+            for language in languages:
+                title = self.title(language)
+                translation = Translation(
+                    master_id=pk, language_code=language, title=title,
+                    slug=f'{slugify(title)[:200]}-{pk}', content=self.html_body(language),
+                    meta_description=self.sentence(language)[:160],
+                )
+                render_translation(translation)
+                translations.append(translation)
+
+            post_categories.extend(
+                Post.categories.through(post_id=pk, category_id=category_id)
+                for category_id in self.sample(self.category_ids, 1, 3)
+            )
+            tagged_posts.extend(
+                TaggedPost(post_id=pk, tag_id=tag_id, relevance_score=self.rng.randint(10, 100))
+                for tag_id in self.sample(self.tag_ids, 0, 5)
+            )
+
+            def comment_fields(created_at):
+                language = self.rng.choice(languages)
+                return {'content': self.paragraph(language), 'language': language, 'created_at': created_at}
+
+            thread, roots, children = self.build_comments(Comment, pk, post.published_date, comment_pk, comment_fields)
+            comment_pk += len(thread)
+            comments.extend(thread)
+            comment_roots.extend(roots)
+            comment_children.update(children)
+
+        self.bulk_create(Post, posts)
+        self.bulk_create(Translation, translations)
+        self.bulk_create(Post.categories.through, post_categories)
+        self.bulk_create(TaggedPost, tagged_posts)
+        number_forest(comment_roots, comment_children, Comment)
+        self.bulk_create(Comment, comments)
+        self.log(f"{len(posts)} posts ({len(translations)} translations), {len(comments)} comments")
+
+    def create_pages(self):
+        from pages.models import Page
+
+        first_pk = next_pk(Page)
+        has_homepage = Page.objects.filter(is_homepage=True, status='published').exists()
+        pages, page_categories = [], []
+        for index in range(self.counts['pages']):
+            pk = first_pk + index
+            page = Page(
+                pk=pk, author_id=self.rng.choice(self.user_ids),
+                status='published' if self.rng.random() < 0.9 else 'draft',
+                is_homepage=not has_homepage and index == 0,
+                importance_order=self.rng.randint(1, 20) if self.rng.random() < 0.2 else 99,
+                featured_image=self.image_name() if self.rng.random() < 0.4 else None,
+            )
+            if page.is_homepage:
+                page.status = 'published'
+            for language in self.languages:
+                title = self.title(language, 1, 4)
+                setattr(page, f'title_{language}', title)
+                setattr(page, f'slug_{language}', f'{slugify(title)[:200]}-{pk}')
+                setattr(page, f'content_{language}', self.html_body(language))
+                setattr(page, f'meta_description_{language}', self.sentence(language)[:160])
+            render_translated_fields(page)
+            pages.append(page)
+            page_categories.extend(
+                Page.categories.through(page_id=pk, category_id=category_id)
+                for category_id in self.sample(self.category_ids, 0, 2)
+            )
+        self.bulk_create(Page, pages)
+        self.bulk_create(Page.categories.through, page_categories)
+        self.page_ids = [page.pk for page in pages if page.status == 'published']
+        self.log(f"{len(pages)} pages")
+
+    def create_publications(self):
+        from publications.models import Publication
+
+        Translation = Publication._parler_meta.root_model
+        first_pk = next_pk(Publication)
+        publications, translations, authors, categories = [], [], [], []
+        for index in range(self.counts['publications']):
+            pk = first_pk + index
+            publications.append(Publication(
+                pk=pk, publication_date=self.past_date(10 * 365).date(),
+                is_published=self.rng.random() < 0.9,
+                doi=f'10.5555/perf.{pk}' if self.rng.random() < 0.5 else None,
+                featured_image=self.image_name() if self.rng.random() < 0.5 else None,
+            ))
+            for language in self.languages:
+                title = self.title(language, 4, 10)
+                translation = Translation(
+                    master_id=pk, language_code=language, title=title, slug=f'{slugify(title)[:200]}-{pk}',
+                    abstract=self.paragraph(language), content=self.html_body(language),
+                )
+                render_translation(translation)
+                translations.append(translation)
+            authors.extend(
+                Publication.authors.through(publication_id=pk, user_id=user_id)
+                for user_id in self.sample(self.user_ids, 1, 4)
+            )
+            categories.extend(
+                Publication.categories.through(publication_id=pk, category_id=category_id)
+                for category_id in self.sample(self.category_ids, 0, 2)
+            )
+        self.bulk_create(Publication, publications)
+        self.bulk_create(Translation, translations)
+        self.bulk_create(Publication.authors.through, authors)
+        self.bulk_create(Publication.categories.through, categories)
+        self.log(f"{len(publications)} publications")
+
+    def create_menus(self):
+        """ The menus of the base templates. Menus that already have items are left alone. """
+        from menus.models import Menu, MenuItem
+
+        LinkType = MenuItem.LinkType
+        pk = next_pk(MenuItem)
+        items, roots, children = [], [], defaultdict(list)
+
+        def add(menu, parent, order, link_type, titles, **link):
+            nonlocal pk
+            item = MenuItem(pk=pk, menu=menu, parent_id=parent.pk if parent else None, order=order, link_type=link_type, **link)
+            for language in self.languages:
+                setattr(item, f'title_{language}', titles.get(language) if isinstance(titles, dict) else titles)
+            pk += 1
+            items.append(item)
+            (children[parent.pk] if parent else roots).append(item)
+            return item
+
+        def get_empty_menu(slug, title):
+            defaults = {'pk': next_pk(Menu), **{f'title_{code}': title for code in self.languages}}
+            menu, _ = Menu.objects.get_or_create(slug=slug, defaults=defaults)
+            return None if menu.items.exists() else menu
+
+        menu = get_empty_menu('main-menu', 'Main menu')
+        if menu:
+            add(menu, None, 1, LinkType.URL, {'es': 'Inicio', 'en': 'Home', 'ca': 'Inici'}, link_url='/')
+            blog = add(menu, None, 2, LinkType.URL, 'Blog', link_url='/blog/')
+            add(menu, blog, 1, LinkType.ALL_BLOG_CATEGORIES, {'es': 'Categorías', 'en': 'Categories', 'ca': 'Categories'})
+            add(menu, None, 3, LinkType.IMPORTANT_PAGES, {'es': 'Páginas', 'en': 'Pages', 'ca': 'Pàgines'})
+            about = add(menu, None, 4, LinkType.URL, {'es': 'Sobre', 'en': 'About', 'ca': 'Sobre'}, link_url='#')
+            for order, page_id in enumerate(self.page_ids[:6], start=1):
+                parent = add(menu, about, order, LinkType.PAGE, self.title(settings.LANGUAGE_CODE, 1, 2), link_page_id=page_id)
+                if order <= 2:
+                    for sub_order, sub_page_id in enumerate(self.page_ids[6 + order * 3:9 + order * 3], start=1):
+                        add(menu, parent, sub_order, LinkType.PAGE, self.title(settings.LANGUAGE_CODE, 1, 2), link_page_id=sub_page_id)
+        menu = get_empty_menu('footer-menu', 'Footer menu')
+        if menu:
+            for order, page_id in enumerate(self.page_ids[:5], start=1):
+                add(menu, None, order, LinkType.PAGE, self.title(settings.LANGUAGE_CODE, 1, 2), link_page_id=page_id)
+        menu = get_empty_menu('social-links', 'Social links')
+        if menu:
+            for order, (name, url, icon_class) in enumerate(SOCIAL_LINKS, start=1):
+                add(menu, None, order, LinkType.URL, name, link_url=url, icon_class=icon_class)
+
+        number_forest(roots, children, MenuItem)
+        self.bulk_create(MenuItem, items)
+        self.log(f"{len(items)} menu items")
+
+    def create_widgets(self):
+        """ The widget zones of the templates. Zones that already have widgets are left alone. """
+        from widgets.models import Widget, WidgetZone
+
+        labels = dict(Widget.WidgetType.choices)
+        pk = next_pk(Widget)
+        widgets = []
+        for slug, widget_types in WIDGET_ZONES.items():
+            zone, _ = WidgetZone.objects.get_or_create(
+                slug=slug, defaults={'pk': next_pk(WidgetZone), 'name': slug.replace('-', ' ').capitalize()},
+            )
+            if zone.widgets.exists():
+                continue
+            for order, widget_type in enumerate(widget_types, start=1):
+                widget = Widget(
+                    pk=pk, zone=zone, widget_type=widget_type, order=order, item_count=self.rng.choice((4, 5, 6, 8)),
+                )
+                pk += 1
+                for language in self.languages:
+                    with override(language):
+                        setattr(widget, f'title_{language}', str(labels[widget_type]))
+                widgets.append(widget)
+        self.bulk_create(Widget, widgets)
+        self.log(f"{len(widgets)} widgets")
+
+    def create_archive_counts(self):
+        """ The posts were bulk-created, without the signals that keep the archive counts. """
+        for section in SECTIONS:
+            months = rebuild_archive_counts(section)
+            self.log(f"{months} archive months ({section})")
@@ -0,0 +1,329 @@
+# File: core/profiler.py
+"""
+Per-request profiler: SQL count, repeated SQL, DB time, cache calls and
+template render time of each view, written as one JSON line per request.
+
+It's off by default. It's configured with settings.REQUEST_PROFILER:
+
+    REQUEST_PROFILER = {
+        'ENABLED': True,         # profile a sample of all requests
+        'SAMPLE_RATE': 0.05,     # fraction of requests profiled when ENABLED
+        'LOG_FILE': BASE_DIR / 'logs/request_profile.jsonl',
+        'MAX_BYTES': 5 * 1024 * 1024,
+        'BACKUP_COUNT': 3,
+        'BUDGETS': {'blog:post_list': 12, ...},  # max queries per URL name
+        'RAISE_ON_BUDGET': False,  # True: a view over budget fails (for tests)
+        'TEMPLATE_DETAILS': False,  # time of each template and template tag
+    }
+
+A single request can also be profiled (even with ENABLED off) by sending the
+header `X-Profile: <token>`, where the token comes from make_profile_token():
+
+    python manage.py shell -c "from core.profiler import make_profile_token; print(make_profile_token())"
+
+Profiled requests get an `X-Profile-Queries` response header.
+
+With TEMPLATE_DETAILS, each record also lists the templates (including the
+{% include %}d ones and those of inclusion tags) and the template tags
+(inclusion and simple tags, {% recursetree %}) that took most time. Times
+are inclusive: a template includes the time of the templates it includes.
+The hooks are only installed with TEMPLATE_DETAILS on. Outside a profiled
+request they cost one ContextVar lookup per call.
+`python manage.py profile_report` adds the records up.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+from .log_handlers import QueuedFileHandler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+TOKEN_SALT = 'core.profiler'
+TOKEN_MAX_AGE = 24 * 3600
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 0.05,
+    'LOG_FILE': None,
+    'MAX_BYTES': 5 * 1024 * 1024,
+    'BACKUP_COUNT': 3,
+    'BUDGETS': {},
+    'RAISE_ON_BUDGET': False,
+    'TEMPLATE_DETAILS': False,
+}
+
+# Number of repeated statements, and of templates and tags, listed in each record.
+TOP_REPEATED = 5
+TOP_TIMINGS = 15
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'REQUEST_PROFILER', {})}
+
+
+def make_profile_token():
+    """ Signed token for the X-Profile header, valid for TOKEN_MAX_AGE seconds. """
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def has_valid_token(request):
+    token = request.META.get(PROFILE_HEADER)
+    if not token:
+        return False
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=TOKEN_MAX_AGE) == 'profile'
+    except signing.BadSignature:
+        logger.warning("Invalid or expired X-Profile token from %s.", request.META.get('REMOTE_ADDR'))
+        return False
+
+
+class RequestProfile:
+    """ What one request did. Filled by the hooks below while it's the current profile. """
+
+    def __init__(self, template_details=False):
+        self.queries = []  # (sql, params, seconds)
+        self.cache_calls = 0
+        self.cache_seconds = 0.0
+        self.template_seconds = 0.0
+        self._template_depth = 0
+        # {'templates'|'tags': {name: [calls, seconds]}}, only with TEMPLATE_DETAILS.
+        self.timings = {'templates': {}, 'tags': {}} if template_details else None
+
+    def add_timing(self, kind, name, seconds):
+        timing = self.timings[kind].setdefault(name, [0, 0.0])
+        timing[0] += 1
+        timing[1] += seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        """ Database execute wrapper (connection.execute_wrapper). """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - start))
+
+    def as_dict(self):
+        statements = Counter(sql for sql, params, seconds in self.queries)
+        exact = Counter((sql, repr(params)) for sql, params, seconds in self.queries)
+        record = {
+            'queries': len(self.queries),
+            # Same SQL with the same parameters: the result could have been reused.
+            'duplicate_queries': sum(count - 1 for count in exact.values()),
+            # Same SQL with other parameters: usually an N+1.
+            'similar_queries': sum(count - 1 for count in statements.values()),
+            'db_ms': round(sum(seconds for sql, params, seconds in self.queries) * 1000, 2),
+            'cache_calls': self.cache_calls,
+            'cache_ms': round(self.cache_seconds * 1000, 2),
+            'template_ms': round(self.template_seconds * 1000, 2),
+            'repeated_sql': [
+                {'count': count, 'sql': sql[:300]}
+                for sql, count in statements.most_common(TOP_REPEATED) if count > 1
+            ],
+        }
+        if self.timings is not None:
+            for kind, timings in self.timings.items():
+                slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:TOP_TIMINGS]
+                record[kind] = [
+                    {'name': name, 'calls': calls, 'ms': round(seconds * 1000, 2)}
+                    for name, (calls, seconds) in slowest
+                ]
+        return record
+
+
+def record_cache_call(seconds):
+    """ Called by the cache backend (core/cache_backends.py) for every operation. """
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.cache_calls += 1
+        profile.cache_seconds += seconds
+
+
+# --- Template render time ---
+
+_template_timer_installed = False
+
+
+def install_template_timer():
+    """
+    Wraps django.template.base.Template.render once, to add up the render time
+    of the templates. Only the outermost render counts for template_ms
+    ({% include %} and inclusion tags render nested templates); with
+    TEMPLATE_DETAILS every template is also timed by name. Without a current
+    profile it only costs a ContextVar lookup.
+    """
+    global _template_timer_installed
+    if _template_timer_installed:
+        return
+    from django.template.base import Template
+
+    original_render = Template.render
+
+    def render(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return original_render(self, context)
+        profile._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            seconds = time.perf_counter() - start
+            profile._template_depth -= 1
+            if profile._template_depth == 0:
+                profile.template_seconds += seconds
+            if profile.timings is not None:
+                profile.add_timing('templates', self.name or '<string>', seconds)
+
+    Template.render = render
+    _template_timer_installed = True
+
+
+_tag_timers_installed = False
+
+
+def _timed_render(original_render, get_name):
+    def render(self, context):
+        profile = _current_profile.get()
+        if profile is None or profile.timings is None:
+            return original_render(self, context)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            profile.add_timing('tags', get_name(self), time.perf_counter() - start)
+    return render
+
+
+def _node_origin(node):
+    origin = getattr(node, 'origin', None)
+    return getattr(origin, 'template_name', None) or '?'
+
+
+def install_tag_timers():
+    """
+    Wraps the render() of the inclusion tags (show_widget_zone, show_menu,
+    render_category_tree...), the simple tags and {% recursetree %}, whose
+    name includes the template it's in.
+    """
+    global _tag_timers_installed
+    if _tag_timers_installed:
+        return
+    from django.template.library import InclusionNode, SimpleNode
+    from mptt.templatetags.mptt_tags import RecurseTreeNode
+
+    for node_class, get_name in (
+        (InclusionNode, lambda node: node.func.__name__),
+        (SimpleNode, lambda node: node.func.__name__),
+        (RecurseTreeNode, lambda node: f'recursetree ({_node_origin(node)})'),
+    ):
+        node_class.render = _timed_render(node_class.render, get_name)
+    _tag_timers_installed = True
+
+
+# --- JSONL output ---
+
+# The records go through this logger (not to the other log files): logging
+# takes care of the locking, and the QueuedFileHandler of the writes and
+# rotations shared by the Passenger processes (core/log_handlers.py).
+records_logger = logging.getLogger('core.profiler.records')
+records_logger.propagate = False
+
+_handler = None
+_handler_lock = threading.Lock()
+
+
+def _get_records_logger(config):
+    """ records_logger, writing to LOG_FILE (None when there's no LOG_FILE). """
+    global _handler
+    if not config['LOG_FILE']:
+        return None
+    filename = os.path.abspath(config['LOG_FILE'])
+    if _handler is None or _handler.target.baseFilename != filename:
+        with _handler_lock:
+            if _handler is None or _handler.target.baseFilename != filename:
+                handler = QueuedFileHandler(
+                    filename, maxBytes=config['MAX_BYTES'], backupCount=config['BACKUP_COUNT'],
+                )
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                if _handler is not None:
+                    records_logger.removeHandler(_handler)
+                    _handler.close()
+                records_logger.addHandler(handler)
+                records_logger.setLevel(logging.INFO)
+                _handler = handler
+    return records_logger
+
+
+def write_record(record, config):
+    records = _get_records_logger(config)
+    if records is not None:
+        records.info('%s', json.dumps(record, default=str))
+
+
+# --- Middleware helpers ---
+
+def should_profile(request, config):
+    if has_valid_token(request):
+        return True
+    if not config['ENABLED']:
+        return False
+    # With budgets enforced (tests) every request is checked.
+    return config['RAISE_ON_BUDGET'] or random.random() < config['SAMPLE_RATE']
+
+
+def profile_request(request, get_response, config):
+    """ Runs get_response(request) with the hooks active and returns (response, record). """
+    profile = RequestProfile(template_details=config['TEMPLATE_DETAILS'])
+    token = _current_profile.set(profile)
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(profile))
+            response = get_response(request)
+    finally:
+        _current_profile.reset(token)
+
+    match = getattr(request, 'resolver_match', None)
+    record = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'method': request.method,
+        'path': request.path,
+        # No URL name when the page cache answered before URL resolution.
+        'url_name': match.view_name if match else None,
+        'status': response.status_code,
+        'total_ms': round((time.perf_counter() - start) * 1000, 2),
+        **profile.as_dict(),
+    }
+    return response, record
+
+
+def check_budget(record, config):
+    budget = config['BUDGETS'].get(record['url_name'])
+    if budget is None or record['queries'] <= budget:
+        return
+    message = (
+        f"{record['url_name']} ({record['path']}) ran {record['queries']} queries, "
+        f"budget {budget} ({record['similar_queries']} repeated)."
+    )
+    if config['RAISE_ON_BUDGET']:
+        raise QueryBudgetExceeded(message)
+    logger.warning("Query budget exceeded: %s", message)
@@ -0,0 +1,157 @@
+# File: core/sitemaps.py
+"""
+XML sitemaps of the public content, in every language, with hreflang
+alternates:
+
+    /sitemap.xml                        index: one entry per shard
+    /sitemap-<section>-<number>.xml     the URLs of up to SHARD_SIZE objects
+
+django.contrib.sitemaps builds each file as a list of every object in every
+language. Here the files are streamed: the objects are read with iterator()
+in chunks, and each <url> is written as soon as it's built.
+
+A shard holds the objects whose pk is in a fixed window
+(number * SHARD_SIZE, (number + 1) * SHARD_SIZE], so new content only changes
+the last shards. Each shard is cached under a key that includes the count
+and the latest update of its objects: an edit, a new object or a deletion
+changes the key, and only that shard is generated again.
+"""
+import hashlib
+from collections import namedtuple
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, IntegerField, Max
+from django.db.models.functions import Floor
+from django.urls import reverse
+
+# Objects per shard. Each one is a <url> per language: 3,000 URLs with three
+# languages, far below the limit of 50,000 URLs (and 50 MB) per file.
+SHARD_SIZE = 1000
+CHUNK_SIZE = 200  # objects read per query
+CACHE_TIMEOUT = 7 * 24 * 3600
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# `languages(obj)`: the languages the object has a URL in.
+Section = namedtuple('Section', ['name', 'get_queryset', 'lastmod_field', 'languages'])
+
+
+def _all_languages(obj):
+    return [code for code, _ in settings.LANGUAGES]
+
+
+def _slug_languages(obj):
+    """ modeltranslation models: the languages with a slug. """
+    return [code for code, _ in settings.LANGUAGES if getattr(obj, f'slug_{code}', None)]
+
+
+def _parler_languages(obj):
+    """ parler models: the languages with a translation (prefetched). """
+    translated = {translation.language_code for translation in obj.translations.all()}
+    return [code for code, _ in settings.LANGUAGES if code in translated]
+
+
+def get_sections():
+    from blog.models import Post as BlogPost
+    from gallery.models import Image
+    from pages.models import Page
+    from posts.models import Post
+    from publications.models import Publication
+
+    sections = [
+        Section('pages', lambda: Page.objects.filter(status='published'), 'updated_at', _slug_languages),
+        Section('blog', lambda: BlogPost.objects.filter(status='published'), 'updated_at', _slug_languages),
+        Section(
+            'posts', lambda: Post.objects.filter(status='published').prefetch_related('translations'),
+            'updated_at', _parler_languages,
+        ),
+        Section(
+            'publications', lambda: Publication.objects.filter(is_published=True).prefetch_related('translations'),
+            'updated_at', _parler_languages,
+        ),
+        Section('images', lambda: Image.objects.all(), 'uploaded_at', _all_languages),
+    ]
+    return {section.name: section for section in sections}
+
+
+def _shard_range(number):
+    return number * SHARD_SIZE, (number + 1) * SHARD_SIZE
+
+
+def get_shards(section):
+    """ [(number, count, lastmod)] of the shards with objects, in one GROUP BY query. """
+    rows = (
+        section.get_queryset().order_by()
+        .annotate(shard=Floor((F('pk') - 1) / SHARD_SIZE, output_field=IntegerField()))
+        .values('shard')
+        .annotate(count=Count('pk'), lastmod=Max(section.lastmod_field))
+        .order_by('shard')
+    )
+    return [(int(row['shard']), row['count'], row['lastmod']) for row in rows]
+
+
+def get_shard_state(section, number):
+    """ (count, lastmod) of one shard. """
+    low, high = _shard_range(number)
+    state = section.get_queryset().order_by().filter(pk__gt=low, pk__lte=high).aggregate(
+        count=Count('pk'), lastmod=Max(section.lastmod_field),
+    )
+    return state['count'], state['lastmod']
+
+
+def get_shard_cache_key(section, number, count, lastmod, base_url):
+    languages = ','.join(code for code, _ in settings.LANGUAGES)
+    state = f'{count}:{lastmod.timestamp() if lastmod else 0}:{base_url}:{languages}'
+    return f'sitemap:{section.name}:{number}:{hashlib.md5(state.encode()).hexdigest()}'
+
+
+def _url_entries(obj, languages, base_url, lastmod):
+    urls = {code: base_url + obj.get_absolute_url_for_language(code) for code in languages}
+    alternates = ''.join(
+        f'<xhtml:link rel="alternate" hreflang="{code}" href={quoteattr(url)}/>' for code, url in urls.items()
+    )
+    if settings.LANGUAGE_CODE in urls:
+        alternates += f'<xhtml:link rel="alternate" hreflang="x-default" href={quoteattr(urls[settings.LANGUAGE_CODE])}/>'
+    lastmod = f'<lastmod>{lastmod.date().isoformat()}</lastmod>' if lastmod else ''
+    return ''.join(f'<url><loc>{escape(url)}</loc>{lastmod}{alternates}</url>\n' for url in urls.values())
+
+
+def iter_shard(section, number, base_url):
+    """ Yields the XML of a shard, a chunk of objects at a time. """
+    yield (
+        XML_HEADER + '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+    )
+    low, high = _shard_range(number)
+    objects = section.get_queryset().filter(pk__gt=low, pk__lte=high).order_by('pk')
+    chunk = []
+    for index, obj in enumerate(objects.iterator(chunk_size=CHUNK_SIZE), start=1):
+        languages = section.languages(obj)
+        if languages:
+            chunk.append(_url_entries(obj, languages, base_url, getattr(obj, section.lastmod_field)))
+        if index % CHUNK_SIZE == 0:
+            yield ''.join(chunk)
+            chunk = []
+    yield ''.join(chunk) + '</urlset>\n'
+
+
+def stream_shard(section, number, base_url, cache_key):
+    """ Yields the encoded shard and caches it once complete. """
+    parts = []
+    for text in iter_shard(section, number, base_url):
+        data = text.encode('utf-8')
+        parts.append(data)
+        yield data
+    cache.set(cache_key, b''.join(parts), CACHE_TIMEOUT)
+
+
+def iter_index(base_url):
+    yield XML_HEADER + '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for section in get_sections().values():
+        for number, count, lastmod in get_shards(section):
+            url = base_url + reverse('sitemap_shard', kwargs={'section': section.name, 'number': number})
+            lastmod = f'<lastmod>{lastmod.isoformat()}</lastmod>' if lastmod else ''
+            yield f'<sitemap><loc>{escape(url)}</loc>{lastmod}</sitemap>\n'
+    yield '</sitemapindex>\n'
@@ -0,0 +1,172 @@
+# File: core/static_export.py
+"""
+Helpers for the `export_static_site` management command, which pre-renders
+the public site into plain HTML files that the web server can serve directly.
+
+Only the first page of each list is exported: paginated (?page=N) and search
+URLs carry a query string, and a static file tree can't serve those.
+"""
+import logging
+import os
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db.models import Exists, Max, OuterRef, Q
+from django.urls import NoReverseMatch, reverse
+from django.utils.translation import override
+
+logger = logging.getLogger(__name__)
+
+# WSGI environ key set on the requests made by the exporter. Views use it to
+# skip side effects such as counting a view (see is_export_request()).
+EXPORT_ENVIRON_KEY = 'tvt.static_export'
+
+# One exported URL. `updated_at` is None for lists and indexes, which depend on
+# many objects and are therefore rebuilt on every run.
+ExportURL = namedtuple('ExportURL', ['url', 'updated_at'])
+
+
+def is_export_request(request):
+    """ True when the request is made by the static exporter. """
+    return bool(request.META.get(EXPORT_ENVIRON_KEY))
+
+
+def url_to_path(url):
+    """
+    Maps a URL path to a file path relative to the export root, so that the
+    web server finds it with its usual index file lookup:
+    '/en/blog/' -> 'en/blog/index.html'.
+    """
+    path = urlsplit(url).path.strip('/')
+    return os.path.join(path, 'index.html') if path else 'index.html'
+
+
+def _reverse(viewname, **kwargs):
+    try:
+        return reverse(viewname, kwargs=kwargs or None)
+    except NoReverseMatch:
+        logger.warning("Static export: cannot reverse '%s' with %s. Skipping.", viewname, kwargs)
+        return None
+
+
+def _with_comment_dates(queryset, comment_model):
+    """
+    Adding a comment doesn't change post.updated_at: annotates the date of the
+    newest approved comment, and whether comments await moderation (approving
+    one records no date, so those posts are rebuilt on every run).
+    """
+    return queryset.annotate(
+        last_comment_at=Max('comments__created_at', filter=Q(comments__is_approved=True)),
+        has_pending_comments=Exists(comment_model.objects.filter(post=OuterRef('pk'), is_approved=False)),
+    )
+
+
+def _commented_updated_at(post):
+    if post.has_pending_comments:
+        return None
+    return max(filter(None, (post.updated_at, post.last_comment_at)))
+
+
+def collect_urls(language_code):
+    """
+    Returns every public URL of the site in the given language.
+    """
+    from blog.models import Comment as BlogComment, Post as BlogPost
+    from categories.models import Category
+    from comments.models import Comment
+    from gallery.models import Image
+    from pages.models import Page
+    from posts.models import Post
+    from publications.models import Publication
+    from taggit.models import Tag as BlogTag
+    from tags.models import Tag
+
+    urls = []
+    with override(language_code):
+        # 1. Home and list/index pages (always rebuilt).
+        for viewname in ('home', 'blog:post_list', 'posts:post_list', 'pages:directory',
+                         'categories:category_list', 'gallery:gallery_view', 'testimonials:testimonial_list'):
+            urls.append(ExportURL(_reverse(viewname), None))
+
+        # 2. Category and tag lists.
+        for category in Category.objects.all():
+            for viewname in ('blog:posts_by_category', 'posts:posts_by_category', 'pages:pages_by_category'):
+                urls.append(ExportURL(_reverse(viewname, category_slug=category.slug), None))
+        for tag_slug in BlogTag.objects.values_list('slug', flat=True):
+            urls.append(ExportURL(_reverse('blog:posts_by_tag', tag_slug=tag_slug), None))
+        for tag_slug in Tag.objects.values_list('slug', flat=True):
+            urls.append(ExportURL(_reverse('posts:posts_by_tag', tag_slug=tag_slug), None))
+
+        # 3. Detail pages, with their modification date for incremental builds.
+        for page in Page.objects.filter(status='published'):
+            urls.append(ExportURL(page.get_absolute_url_for_language(language_code), page.updated_at))
+        for post in _with_comment_dates(BlogPost.objects.filter(status='published'), BlogComment):
+            urls.append(ExportURL(post.get_absolute_url_for_language(language_code), _commented_updated_at(post)))
+        posts = _with_comment_dates(Post.objects.filter(status='published'), Comment).prefetch_related('translations')
+        for post in posts:
+            urls.append(ExportURL(post.get_absolute_url_for_language(language_code), _commented_updated_at(post)))
+        for publication in Publication.objects.filter(is_published=True).prefetch_related('translations'):
+            urls.append(ExportURL(publication.get_absolute_url_for_language(language_code), publication.updated_at))
+        for image in Image.objects.all():
+            urls.append(ExportURL(image.get_absolute_url_for_language(language_code), image.uploaded_at))
+
+    # Objects without a slug in this language can't be reversed.
+    return [export_url for export_url in urls if export_url.url]
+
+
+def collect_all_urls(languages=None):
+    """ Returns the public URLs for every language, without duplicates. """
+    language_codes = languages or [code for code, _ in settings.LANGUAGES]
+    seen = set()
+    urls = []
+    for language_code in language_codes:
+        for export_url in collect_urls(language_code):
+            if export_url.url not in seen:
+                seen.add(export_url.url)
+                urls.append(export_url)
+    return urls
+
+
+# --- Worker process helpers (used through multiprocessing) ---
+
+_client = None
+
+
+def init_worker(host):
+    """
+    Prepares a worker process: each process needs its own database
+    connections and its own test client.
+    """
+    global _client
+    from django import db
+    from django.test import Client
+
+    db.connections.close_all()
+    _client = Client(HTTP_HOST=host, **{EXPORT_ENVIRON_KEY: True})
+
+
+def render_url(job):
+    """
+    Renders one URL and writes it under `output_root`. The file is replaced
+    atomically, so the web server never serves a half-written page.
+    Returns (url, status_code, relative_path or None).
+    """
+    url, output_root = job
+    try:
+        response = _client.get(url)
+    except Exception:
+        logger.error("Static export: error rendering '%s'.", url, exc_info=True)
+        return url, 500, None
+
+    if response.status_code != 200:
+        return url, response.status_code, None
+
+    relative_path = url_to_path(url)
+    full_path = os.path.join(output_root, relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    tmp_path = f'{full_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as output_file:
+        output_file.write(response.content)
+    os.replace(tmp_path, full_path)
+    return url, 200, relative_path
@@ -0,0 +1,281 @@
+# File: core/tasks.py
+"""
+Background tasks stored in the database (core.models.Task), for the work that
+doesn't have to happen inside the request: deleting files, promoting
+commenters, clearing caches... No Redis or Celery needed.
+
+A task is a function decorated with @task, in the `tasks.py` module of its app:
+
+    from core.tasks import task
+
+    @task(priority=5)
+    def delete_avatar_file(name):
+        ...
+
+It's queued with JSON-serializable keyword arguments:
+
+    delete_avatar_file.enqueue(name=profile.avatar.name)
+    clear_all_widget_caches.enqueue_with(unique=True, delay=5)
+
+The row is saved in the current transaction: if it's rolled back, the task
+is too. `python manage.py run_worker` runs the due tasks, highest priority
+first. A failed task is retried `max_attempts` times, with an exponential
+delay, and then stays 'failed' (with its traceback) in the admin. Tasks
+must be idempotent: a task can run again if its worker dies.
+
+With settings.TASK_QUEUE['EAGER'] (the default in development, where no
+worker runs) tasks aren't stored: they run in the process once the
+current transaction commits.
+"""
+import json
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'EAGER': False,
+    'RETRY_DELAY': 30,  # seconds before the 1st retry, doubled for each next one
+    'LOCK_TIMEOUT': 600,  # a task running for longer is considered lost (worker killed)
+    'POLL_INTERVAL': 2,  # seconds the worker sleeps when the queue is empty
+    'KEEP_FINISHED_DAYS': 7,  # finished tasks are deleted after that
+}
+
+_registry = {}
+
+
+class TaskNotFound(Exception):
+    pass
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'TASK_QUEUE', {})}
+
+
+class TaskFunction:
+    """ What @task returns: the function, callable as before, plus enqueue(). """
+
+    def __init__(self, func, priority=0, max_attempts=3):
+        self.func = func
+        self.name = f'{func.__module__}.{func.__name__}'
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def __repr__(self):
+        return f'<task {self.name}>'
+
+    def enqueue(self, **kwargs):
+        return self.enqueue_with(kwargs)
+
+    def enqueue_with(self, kwargs=None, priority=None, delay=0, unique=False):
+        """
+        Queues the task. `delay` (seconds) postpones it. With `unique`, it's not
+        queued again while the same task with the same arguments is pending
+        (the core_task_unique_pending constraint settles concurrent requests).
+        Returns the Task, or None when it runs eagerly.
+        """
+        from .models import Task
+
+        kwargs = kwargs or {}
+        if get_config()['EAGER']:
+            transaction.on_commit(lambda: run_eagerly(self, kwargs))
+            return None
+
+        unique_key = ''
+        if unique:
+            unique_key = f'{self.name}:{json.dumps(kwargs, sort_keys=True, default=str)}'[:255]
+            pending = Task.objects.filter(unique_key=unique_key, status=Task.Status.PENDING).first()
+            if pending is not None:
+                return pending
+        task_row = Task(
+            name=self.name,
+            kwargs=kwargs,
+            priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts,
+            unique_key=unique_key,
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+        if not unique_key:
+            task_row.save()
+            return task_row
+        try:
+            # A savepoint: the caller's transaction goes on after the error.
+            with transaction.atomic():
+                task_row.save()
+        except IntegrityError:
+            # Queued by another request since the check above.
+            return Task.objects.get(unique_key=unique_key, status=Task.Status.PENDING)
+        return task_row
+
+
+def task(func=None, *, priority=0, max_attempts=3):
+    """ Registers a task function. Usable as @task or @task(priority=..., max_attempts=...). """
+    def register(func):
+        task_function = TaskFunction(func, priority=priority, max_attempts=max_attempts)
+        _registry[task_function.name] = task_function
+        return task_function
+    return register(func) if func is not None else register
+
+
+def get_task(name):
+    """ Only registered functions run: a row can't make the worker call anything else. """
+    if name not in _registry:
+        module_name = name.rpartition('.')[0]
+        try:
+            import_module(module_name)
+        except ImportError:
+            pass
+    try:
+        return _registry[name]
+    except KeyError:
+        raise TaskNotFound(f"No task registered as '{name}'.")
+
+
+def run_eagerly(task_function, kwargs):
+    try:
+        task_function(**kwargs)
+    except Exception:
+        logger.exception("Task %s failed (eager mode).", task_function.name)
+
+
+class Worker:
+    """ Claims and runs due tasks. Several workers (and processes) can run at once. """
+
+    def __init__(self, log=None):
+        self.id = f'{socket.gethostname()}:{os.getpid()}'[:100]
+        self.config = get_config()
+        self.log = log or (lambda message: None)
+        self.stopping = False
+        self.processed = 0
+        self.failed = 0
+
+    def requeue_lost(self):
+        """ Tasks still 'running' after LOCK_TIMEOUT: their worker died. """
+        from .models import Task
+
+        limit = timezone.now() - timedelta(seconds=self.config['LOCK_TIMEOUT'])
+        lost = Task.objects.filter(status=Task.Status.RUNNING, locked_at__lt=limit)
+        failed = lost.filter(attempts__gte=F('max_attempts')).update(
+            status=Task.Status.FAILED, finished_at=timezone.now(), last_error="The worker running it was lost.",
+        )
+        requeued = 0
+        for pk in lost.values_list('pk', flat=True):
+            row = Task.objects.filter(pk=pk, status=Task.Status.RUNNING)
+            try:
+                with transaction.atomic():
+                    requeued += row.update(status=Task.Status.PENDING, locked_by='', locked_at=None)
+            except IntegrityError:
+                # The same unique task was queued again meanwhile.
+                failed += row.update(
+                    status=Task.Status.FAILED, finished_at=timezone.now(), last_error="The worker running it was lost.",
+                )
+        if failed or requeued:
+            logger.warning("%d lost task(s) requeued, %d failed.", requeued, failed)
+
+    def claim(self):
+        """
+        Takes the next due task. The conditional UPDATE makes sure only one
+        worker gets it, without SELECT ... FOR UPDATE (not in SQLite).
+        """
+        from .models import Task
+
+        now = timezone.now()
+        candidates = (
+            Task.objects.filter(status=Task.Status.PENDING, run_at__lte=now)
+            .order_by('-priority', 'run_at', 'pk')
+            .values_list('pk', flat=True)[:10]
+        )
+        for pk in candidates:
+            claimed = Task.objects.filter(pk=pk, status=Task.Status.PENDING).update(
+                status=Task.Status.RUNNING, locked_by=self.id, locked_at=now, attempts=F('attempts') + 1,
+            )
+            if claimed:
+                return Task.objects.get(pk=pk)
+        return None
+
+    def run_task(self, task_row):
+        from .models import Task
+
+        start = time.perf_counter()
+        try:
+            get_task(task_row.name)(**task_row.kwargs)
+        except Exception as exc:
+            self.failed += 1
+            task_row.last_error = traceback.format_exc()
+            task_row.locked_by = ''
+            task_row.locked_at = None
+            if task_row.attempts < task_row.max_attempts and not isinstance(exc, TaskNotFound):
+                delay = self.config['RETRY_DELAY'] * 2 ** (task_row.attempts - 1)
+                task_row.status = Task.Status.PENDING
+                task_row.run_at = timezone.now() + timedelta(seconds=delay)
+                logger.warning("Task %s #%s failed (attempt %d), retrying in %ds: %s",
+                               task_row.name, task_row.pk, task_row.attempts, delay, exc)
+            else:
+                task_row.status = Task.Status.FAILED
+                task_row.finished_at = timezone.now()
+                logger.error("Task %s #%s failed after %d attempt(s): %s",
+                             task_row.name, task_row.pk, task_row.attempts, exc)
+        else:
+            task_row.status = Task.Status.DONE
+            task_row.finished_at = timezone.now()
+            task_row.last_error = ''
+        update_fields = ['status', 'run_at', 'finished_at', 'last_error', 'locked_by', 'locked_at']
+        try:
+            with transaction.atomic():
+                task_row.save(update_fields=update_fields)
+        except IntegrityError:
+            # A retry of a unique task queued again meanwhile: the new one does the work.
+            task_row.status = Task.Status.FAILED
+            task_row.finished_at = timezone.now()
+            task_row.save(update_fields=update_fields)
+        self.processed += 1
+        self.log(f"{task_row.name} #{task_row.pk}: {task_row.status} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def purge_finished(self):
+        from .models import Task
+
+        limit = timezone.now() - timedelta(days=self.config['KEEP_FINISHED_DAYS'])
+        deleted, _ = Task.objects.filter(status=Task.Status.DONE, finished_at__lt=limit).delete()
+        if deleted:
+            logger.info("Deleted %d finished task(s).", deleted)
+
+    def run(self, max_tasks=None, max_seconds=None, until_empty=False):
+        """
+        Runs tasks until stopped, `max_tasks` tasks or `max_seconds` seconds.
+        With `until_empty` it returns when no task is due (for cron).
+        """
+        autodiscover_modules('tasks')
+        start = time.monotonic()
+        self.requeue_lost()
+        self.purge_finished()
+        while not self.stopping:
+            if max_tasks is not None and self.processed >= max_tasks:
+                break
+            if max_seconds is not None and time.monotonic() - start >= max_seconds:
+                break
+            # A long-running worker must not keep a connection the server has closed.
+            close_old_connections()
+            task_row = self.claim()
+            if task_row is not None:
+                self.run_task(task_row)
+                continue
+            if until_empty:
+                break
+            time.sleep(self.config['POLL_INTERVAL'])
+        close_old_connections()
+        return self.processed
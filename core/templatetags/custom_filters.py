@@ -1,17 +1,11 @@
 from django import template
-from bs4 import BeautifulSoup
+
+from core.html_pipeline import add_image_attributes
 
 register = template.Library()
 
 @register.filter
 def add_zoom_class_to_images(html):
-    if not html:
-        return ""
-    
-    soup = BeautifulSoup(html, "html.parser")
-    for img in soup.find_all("img"):
-        existing_class = img.get("class", [])
-        if "zoomable" not in existing_class:
-            existing_class.append("zoomable")
-            img['class'] = existing_class
-    return str(soup)
\ No newline at end of file
+    # Content models store this already transformed (see core/html_pipeline.py
+    # and their 'rendered_content' property). Kept for other HTML fragments.
+    return add_image_attributes(html)
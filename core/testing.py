@@ -0,0 +1,30 @@
+# File: core/testing.py
+"""
+Helpers shared by the test modules of the apps.
+
+The settings cache the pages, feeds and fragments in the file cache of the
+project (BASE_DIR/cache); tests must not read what a running site or
+another test left there, nor leave anything behind.
+"""
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from site_settings.models import SiteConfiguration
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-shared'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LocMemCacheTestCase(TestCase):
+    """ A TestCase with in-memory caches, emptied before each test. """
+
+    def setUp(self):
+        super().setUp()
+        # Created on its first read, and saving it purges the whole site:
+        # done here, not in the middle of the first request of a test.
+        SiteConfiguration.get_solo()
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
@@ -1,3 +1,583 @@
-from django.test import TestCase
+import json
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from blog.models import Comment as BlogComment, Post as BlogPost
+
+from . import page_cache, profiler, sitemaps
+from .archives import rebuild_archive_counts
+from .html_pipeline import render_html
+from .log_handlers import QueuedFileHandler
+from .models import ArchiveMonth, PostViewBucket, Task, ViewFilter
+from .static_export import collect_urls
+from .tasks import Worker, task
+from .testing import LocMemCacheTestCase
+from .trending import current_hour, fold_view_buckets, get_trending, record_view
+from .view_counting import ScalableBloomFilter, count_view, is_first_view
+
+def cache_settings(shared_location, check_interval=0.2):
+    return {
+        'default': {
+            'BACKEND': 'core.cache_backends.TwoTierCache',
+            # Its own LOCATION: a local tier of its own, not the one of the other tests.
+            'LOCATION': f'test-{uuid.uuid4().hex}',
+            'OPTIONS': {'SHARED_ALIAS': 'shared', 'CHECK_INTERVAL': check_interval, 'STATS': False},
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': shared_location,
+        },
+    }
+
+
+# Runs in a separate process (like another Passenger worker) and answers
+# cache.get() for each key read on stdin until stdin is closed. A script
+# rather than a multiprocessing target, since importing this module needs
+# an app registry that a new process doesn't have yet.
+READER_SCRIPT = """
+import json, sys
+import django
+from django.conf import settings
+replies, sys.stdout = sys.stdout, sys.stderr  # keeps what the settings print out of the replies
+settings.CACHES = json.loads(sys.argv[1])
+django.setup()
+from django.core.cache import cache
+for line in sys.stdin:
+    print(json.dumps(cache.get(json.loads(line))), file=replies, flush=True)
+"""
+
+
+class TwoTierCacheCoherenceTests(SimpleTestCase):
+    """
+    Values set or deleted in this process must be seen by other worker
+    processes within one CHECK_INTERVAL of the two-tier cache.
+    """
+    reader_count = 2
+
+    def setUp(self):
+        shared_location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shared_location, ignore_errors=True)
+        self.cache_config = cache_settings(shared_location)
+        settings_override = override_settings(CACHES=self.cache_config)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.cache = caches['default']
+        self.key = f'coherence-check-{uuid.uuid4().hex}'
+
+        # New processes, without a copy of this process's local tier.
+        self.readers = []
+        for _ in range(self.reader_count):
+            reader = subprocess.Popen(
+                [sys.executable, '-c', READER_SCRIPT, json.dumps(self.cache_config)],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=settings.BASE_DIR,
+            )
+            self.readers.append(reader)
+            self.addCleanup(reader.wait, 10)
+            self.addCleanup(reader.stdout.close)
+            self.addCleanup(reader.stdin.close)
+
+    def read_all(self):
+        for reader in self.readers:
+            reader.stdin.write(json.dumps(self.key) + '\n')
+            reader.stdin.flush()
+        return [json.loads(reader.stdout.readline()) for reader in self.readers]
+
+    def assertReadersSee(self, expected):
+        # Within one check the readers may still serve their local copy: wait for it.
+        time.sleep(self.cache._check_interval + 0.1)
+        self.assertEqual(self.read_all(), [expected] * self.reader_count)
+
+    def test_set_replace_and_delete_reach_other_processes(self):
+        self.cache.set(self.key, 'v1', 60)
+        self.assertReadersSee('v1')
+
+        # The readers now hold 'v1' in their local tier.
+        self.cache.set(self.key, 'v2', 60)
+        self.assertReadersSee('v2')
+
+        self.cache.delete(self.key)
+        self.assertReadersSee(None)
+
+    def test_delete_many_reaches_other_processes(self):
+        self.cache.set(self.key, 'v3', 60)
+        self.assertReadersSee('v3')
+        self.cache.delete_many([self.key])
+        self.assertReadersSee(None)
+
+
+class PageCacheTests(LocMemCacheTestCase):
+    """ Full-page cache: storing, purging by tag and stale renders. """
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def render(self, path, *tags, purge_while_rendering=()):
+        """ Does what AnonymousPageCacheMiddleware does around a view emitting `tags`. """
+        request = self.factory.get(path)
+        cache_key = page_cache.get_page_key(request)
+        cached = page_cache.get_cached_response(request, cache_key)
+        if cached is not None:
+            return cached
+        page_cache.start_collecting(request)
+        page_cache.add_surrogate_keys(request, *tags)
+        page_cache.purge(*purge_while_rendering)
+        response = HttpResponse(f'page {path}')
+        page_cache.store_response(request, response, cache_key)
+        return response
+
+    def test_stored_page_is_served_until_one_of_its_tags_is_purged(self):
+        tag = page_cache.model_object_tag(BlogPost, 1)
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'HIT')
+
+        page_cache.purge(page_cache.model_object_tag(BlogPost, 2))
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'HIT')
+
+        page_cache.purge(tag)
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'HIT')
+
+    def test_site_tag_purges_every_page(self):
+        self.render('/a/', 'a')
+        self.render('/b/', 'b')
+        page_cache.purge(page_cache.SITE_TAG)
+        self.assertEqual(self.render('/a/', 'a')['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.render('/b/', 'b')['X-Page-Cache'], 'MISS')
+
+    def test_page_purged_while_rendering_is_not_stored(self):
+        tag = page_cache.model_object_tag(BlogPost, 1)
+        response = self.render('/post/', tag, purge_while_rendering=[tag])
+        self.assertEqual(response['X-Page-Cache'], 'BYPASS')
+        # The next render sees the new data and is stored.
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'HIT')
+
+    def test_views_only_saves_do_not_purge(self):
+        post = BlogPost(pk=1)
+        tag = page_cache.object_tag(post)
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'MISS')
+        page_cache.purge_instance(post, update_fields=['views_count'])
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'HIT')
+        page_cache.purge_instance(post, update_fields=['title', 'views_count'])
+        self.assertEqual(self.render('/post/', tag)['X-Page-Cache'], 'MISS')
+
+
+class HtmlPipelineTests(SimpleTestCase):
+    """ The sanitizing and image transforms of the render-on-save pipeline. """
+
+    def test_scripts_and_event_handlers_are_removed(self):
+        html = render_html(
+            '<p onclick="steal()">Text<script>alert(1)</script></p>'
+            '<a href="javascript:alert(1)">Link</a><img src="/a.png" onerror="steal()">'
+        )
+        self.assertNotIn('script', html)
+        self.assertNotIn('alert', html)
+        self.assertNotIn('onclick', html)
+        self.assertNotIn('onerror', html)
+        self.assertIn('<p>Text</p>', html)
+
+    def test_iframes_are_only_kept_from_whitelisted_https_hosts(self):
+        html = render_html('<iframe src="https://www.youtube.com/embed/x" width="560"></iframe>')
+        self.assertIn('src="https://www.youtube.com/embed/x"', html)
+        self.assertIn('width="560"', html)
+        self.assertNotIn('src=', render_html('<iframe src="https://evil.example/embed"></iframe>'))
+        self.assertNotIn('src=', render_html('<iframe src="http://www.youtube.com/embed/x"></iframe>'))
+
+    def test_inline_styles_keep_only_allowed_properties(self):
+        html = render_html('<p style="color: red; position: fixed; background-image: url(javascript:x)">Text</p>')
+        self.assertIn('color: red', html)
+        self.assertNotIn('position', html)
+        self.assertNotIn('javascript', html)
+
+    def test_images_get_their_attributes(self):
+        html = render_html('<img src="/a.png" alt="A" width="10" data-x="1"><img src="/b.png">')
+        self.assertIn('alt="A"', html)
+        self.assertIn('width="10"', html)
+        self.assertIn('decoding="async"', html)
+        self.assertIn('class="zoomable img-fluid"', html)
+        self.assertNotIn('data-x', html)
+        # Only the images after the first one (often above the fold) are lazy.
+        first, second = html.split('<img')[1:]
+        self.assertNotIn('loading', first)
+        self.assertIn('loading="lazy"', second)
+
+    def test_data_uris_are_only_kept_for_pasted_images(self):
+        image = 'data:image/png;base64,iVBORw0KGgo='
+        self.assertIn(f'src="{image}"', render_html(f'<img src="{image}">'))
+        self.assertNotIn('src=', render_html('<img src="data:text/html;base64,PHNjcmlwdD4=">'))
+        self.assertNotIn('href=', render_html(f'<a href="{image}">Link</a>'))
+        self.assertNotIn('href=', render_html('<a href=" data:text/html,x">Link</a>'))
+
+
+class QueuedFileHandlerTests(SimpleTestCase):
+    """ The records are formatted in the logging thread, written by the listener. """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.filename = f'{directory}/test.log'
+        self.handler = QueuedFileHandler(self.filename)
+        self.handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger(f'core.tests.{uuid.uuid4().hex}')
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def read_log(self):
+        self.handler.stop_listener()
+        with open(self.filename, encoding='utf-8') as log_file:
+            return log_file.read()
+
+    def test_arguments_are_formatted_when_logged(self):
+        items = ['first']
+        self.logger.warning('Items: %s', items)
+        items.append('second')
+        self.assertEqual(self.read_log(), "WARNING Items: ['first']\n")
+
+    def test_tracebacks_are_written_once(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.logger.exception('Failed')
+        log = self.read_log()
+        self.assertTrue(log.startswith('ERROR Failed\nTraceback'))
+        self.assertEqual(log.count('ValueError: boom'), 1)
+
+
+class ScalableBloomFilterTests(SimpleTestCase):
+    """ The "already seen" filter of the view counting. """
+
+    def test_keeps_its_false_positive_rate_as_it_grows(self):
+        seen = ScalableBloomFilter(100, 0.01)
+        for i in range(2000):
+            seen.add(f'visitor-{i}')
+        self.assertGreater(len(seen.slices), 1)
+
+        stored = ScalableBloomFilter(100, 0.01, seen.to_bytes(), seen.items)
+        self.assertTrue(all(f'visitor-{i}' in stored for i in range(2000)))
+        # About 1%: the slices are sized with the usual approximations.
+        false_positives = sum(f'other-{i}' in stored for i in range(10000))
+        self.assertLess(false_positives, 150)
+
+    def test_data_stored_with_other_settings_is_dropped(self):
+        seen = ScalableBloomFilter(100, 0.01)
+        seen.add('visitor')
+        stored = ScalableBloomFilter(1000, 0.01, seen.to_bytes(), seen.items)
+        self.assertNotIn('visitor', stored)
+        self.assertEqual(stored.items, 0)
+
+
+@override_settings(VIEW_COUNTING={'WINDOW': 1800, 'EXPECTED_VISITORS': 10, 'FALSE_POSITIVE_RATE': 0.01})
+class ViewCountingTests(LocMemCacheTestCase):
+    """ Views counted once per visitor and window, without bots. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        cls.post = BlogPost.objects.create(title='Post', slug='post', author=author, content='<p>Text</p>')
+        cls.label = cls.post._meta.label
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def views_count(self):
+        self.post.refresh_from_db(fields=['views_count'])
+        return self.post.views_count
+
+    def test_each_visitor_counts_once_per_window(self):
+        self.assertTrue(is_first_view(self.label, self.post.pk, 'a'))
+        self.assertFalse(is_first_view(self.label, self.post.pk, 'a'))
+        # More visitors than the first slice holds.
+        self.assertTrue(all([is_first_view(self.label, self.post.pk, f'v{i}') for i in range(50)]))
+        self.assertFalse(is_first_view(self.label, self.post.pk, 'v3'))
+        self.assertEqual(ViewFilter.objects.get(post_id=self.post.pk).items, 51)
+
+    def test_a_new_window_starts_empty(self):
+        is_first_view(self.label, self.post.pk, 'a')
+        ViewFilter.objects.filter(post_id=self.post.pk).update(window=1)
+        self.assertTrue(is_first_view(self.label, self.post.pk, 'a'))
+        self.assertEqual(ViewFilter.objects.get(post_id=self.post.pk).items, 1)
+
+    def test_filter_changed_by_another_worker_is_read_again(self):
+        is_first_view(self.label, self.post.pk, 'a')
+        row = ViewFilter.objects.get(post_id=self.post.pk)
+        is_first_view(self.label, self.post.pk, 'b')
+        # Writing the filter read before 'b' was added fails: 'b' isn't lost.
+        self.assertFalse(ViewFilter.objects.filter(pk=row.pk, version=row.version).update(items=0))
+        self.assertFalse(is_first_view(self.label, self.post.pk, 'b'))
+
+    def test_count_view_skips_repeats_bots_and_head_requests(self):
+        browser = 'Mozilla/5.0 (X11; Linux x86_64) Firefox/130.0'
+        self.assertTrue(count_view(self.factory.get('/', HTTP_USER_AGENT=browser), self.label, self.post.pk))
+        self.assertFalse(count_view(self.factory.get('/', HTTP_USER_AGENT=browser), self.label, self.post.pk))
+        self.assertFalse(count_view(self.factory.head('/', HTTP_USER_AGENT='Other'), self.label, self.post.pk))
+        self.assertFalse(count_view(self.factory.get('/', HTTP_USER_AGENT='Googlebot/2.1'), self.label, self.post.pk))
+        self.assertFalse(count_view(self.factory.get('/', HTTP_USER_AGENT='Other', HTTP_SEC_PURPOSE='prefetch'), self.label, self.post.pk))
+        self.assertTrue(count_view(self.factory.get('/', HTTP_USER_AGENT='Other'), self.label, self.post.pk))
+        self.assertEqual(self.views_count(), 2)
+
+
+class QueryBudgetTests(LocMemCacheTestCase):
+    """ Views over their query budget fail with RAISE_ON_BUDGET. """
+
+    def setUp(self):
+        super().setUp()
+        log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_dir, ignore_errors=True)
+        self.log_file = f'{log_dir}/profile.jsonl'
+
+    def profiler_settings(self, budget):
+        return {
+            'ENABLED': True, 'RAISE_ON_BUDGET': True, 'LOG_FILE': self.log_file,
+            'BUDGETS': {'blog:post_list': budget},
+        }
+
+    def test_view_over_budget_raises(self):
+        with override_settings(REQUEST_PROFILER=self.profiler_settings(budget=0)):
+            with self.assertRaises(profiler.QueryBudgetExceeded):
+                self.client.get(reverse('blog:post_list'))
+
+    def test_view_within_budget_is_recorded(self):
+        with override_settings(REQUEST_PROFILER=self.profiler_settings(budget=1000)):
+            response = self.client.get(reverse('blog:post_list'))
+        self.assertEqual(response.status_code, 200)
+
+        profiler._handler.stop_listener()  # writes what's queued
+        with open(self.log_file, encoding='utf-8') as log:
+            record = json.loads(log.readline())
+        self.assertEqual(record['url_name'], 'blog:post_list')
+        self.assertEqual(record['queries'], int(response['X-Profile-Queries']))
+
+
+class ArchiveCountTests(LocMemCacheTestCase):
+    """ Monthly counts of the published posts, kept by the post signals. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author')
+
+    def create_post(self, slug, published_date, status='published'):
+        return BlogPost.objects.create(
+            title=slug, slug=slug, author=self.author, content='<p>Text</p>',
+            published_date=published_date, status=status,
+        )
+
+    def counts(self):
+        return dict(
+            ((year, month), count)
+            for year, month, count in ArchiveMonth.objects.filter(section='blog').values_list('year', 'month', 'count')
+        )
+
+    def test_counts_follow_saves_and_deletes(self):
+        june = datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc)
+        post = self.create_post('first', june)
+        self.create_post('second', june)
+        self.create_post('draft', june, status='draft')
+        self.assertEqual(self.counts(), {(2025, 6): 2})
+
+        post.published_date = datetime(2025, 7, 1, 12, tzinfo=dt_timezone.utc)
+        post.save()
+        self.assertEqual(self.counts(), {(2025, 6): 1, (2025, 7): 1})
+
+        post.status = 'draft'
+        post.save()
+        self.assertEqual(self.counts(), {(2025, 6): 1})
+
+        BlogPost.objects.get(slug='second').delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_views_only_saves_skip_the_counts(self):
+        post = self.create_post('first', datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc))
+        ArchiveMonth.objects.all().delete()
+        post.save(update_fields=['views_count'])
+        self.assertEqual(self.counts(), {})
+
+    def test_rebuild_catches_up_with_bulk_changes(self):
+        self.create_post('first', datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc))
+        BlogPost.objects.update(published_date=datetime(2024, 1, 5, 12, tzinfo=dt_timezone.utc))
+        self.assertEqual(rebuild_archive_counts('blog'), 1)
+        self.assertEqual(self.counts(), {(2024, 1): 1})
+
+
+class TrendingTests(LocMemCacheTestCase):
+    """ Posts ranked by their views with a 24-hour half-life. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        cls.old, cls.recent, cls.draft = [
+            BlogPost.objects.create(title=slug, slug=slug, author=author, content='<p>Text</p>', status=status)
+            for slug, status in (('old', 'published'), ('recent', 'published'), ('draft', 'draft'))
+        ]
+
+    def test_recent_views_weigh_more(self):
+        label = BlogPost._meta.label
+        # Three views two days (two half-lives) ago are worth about 0.75 now.
+        PostViewBucket.objects.create(section='blog', post_id=self.old.pk, hour=current_hour() - timedelta(hours=48), views=3)
+        record_view(label, self.recent.pk)
+        record_view(label, self.recent.pk)
+        for _ in range(5):
+            record_view(label, self.draft.pk)
+
+        self.assertEqual(fold_view_buckets(), 3)
+        self.assertFalse(PostViewBucket.objects.exists())
+
+        trending = get_trending('blog', 5)
+        self.assertEqual(trending, [self.recent, self.old])
+        self.assertAlmostEqual(trending[0].trending_views, 2, delta=0.1)
+        self.assertAlmostEqual(trending[1].trending_views, 0.75, delta=0.05)
+
+
+class StaticExportTests(LocMemCacheTestCase):
+    """ The modification dates used by the incremental static export. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        cls.post = BlogPost.objects.create(
+            title='Post', slug_es='post', slug_en='post', slug_ca='post', author=author, content='<p>Text</p>', status='published',
+        )
+
+    def updated_at(self):
+        url = self.post.get_absolute_url_for_language('es')
+        return next(export_url.updated_at for export_url in collect_urls('es') if export_url.url == url)
+
+    def test_approved_comments_count_as_changes(self):
+        self.assertEqual(self.updated_at(), self.post.updated_at)
+        comment = BlogComment.objects.create(post=self.post, author_name='A', content='Hi', is_approved=True)
+        self.assertEqual(self.updated_at(), comment.created_at)
+
+    def test_posts_with_comments_awaiting_moderation_are_always_rebuilt(self):
+        BlogComment.objects.create(post=self.post, author_name='A', content='Hi')
+        self.assertIsNone(self.updated_at())
+
+
+@task
+def failing_task(key):
+    raise ValueError(key)
+
+
+@override_settings(TASK_QUEUE={'EAGER': False})
+class UniqueTaskTests(LocMemCacheTestCase):
+    """ A unique task is only pending once, even when two requests queue it at once. """
+
+    def test_a_pending_unique_task_is_not_queued_again(self):
+        first = failing_task.enqueue_with({'key': 'a'}, unique=True)
+        self.assertEqual(failing_task.enqueue_with({'key': 'a'}, unique=True), first)
+        self.assertNotEqual(failing_task.enqueue_with({'key': 'b'}, unique=True), first)
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_concurrent_requests_get_the_same_task(self):
+        first = failing_task.enqueue_with({'key': 'a'}, unique=True)
+        # The other request's row isn't visible yet when this one checks.
+        with mock.patch.object(QuerySet, 'first', return_value=None):
+            second = failing_task.enqueue_with({'key': 'a'}, unique=True)
+        self.assertEqual(second, first)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_a_retry_leaves_the_work_to_the_task_queued_again(self):
+        running = failing_task.enqueue_with({'key': 'a'}, unique=True)
+        Task.objects.filter(pk=running.pk).update(status=Task.Status.RUNNING, attempts=1)
+        queued_again = failing_task.enqueue_with({'key': 'a'}, unique=True)
+
+        Worker().run_task(Task.objects.get(pk=running.pk))
+        self.assertEqual(Task.objects.get(pk=running.pk).status, Task.Status.FAILED)
+        self.assertEqual(Task.objects.get(pk=queued_again.pk).status, Task.Status.PENDING)
+
+
+class SitemapTests(LocMemCacheTestCase):
+    """ The sitemap index and its cached shards. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        cls.posts = [
+            BlogPost.objects.create(
+                title=slug, slug_es=slug, slug_en=f'{slug}-en', author=author, content='<p>Text</p>', status='published',
+                published_date=datetime(2025, 6, 14, 12, tzinfo=dt_timezone.utc),
+            )
+            for slug in ('one', 'two', 'three')
+        ]
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(sitemaps, 'SHARD_SIZE', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.shards = sorted({(post.pk - 1) // 2 for post in self.posts})
+        self.section = sitemaps.get_sections()['blog']
+
+    def shard_url(self, number, section='blog'):
+        return reverse('sitemap_shard', kwargs={'section': section, 'number': number})
+
+    def get_content(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, content.decode()
+
+    def cache_key(self, number):
+        count, lastmod = sitemaps.get_shard_state(self.section, number)
+        return sitemaps.get_shard_cache_key(self.section, number, count, lastmod, 'http://testserver')
+
+    def test_index_lists_the_shards(self):
+        _, content = self.get_content(reverse('sitemap_index'))
+        for number in self.shards:
+            self.assertIn(f'<loc>http://testserver{self.shard_url(number)}</loc>', content)
+        self.assertEqual(content.count('/sitemap-blog-'), len(self.shards))
+        self.assertNotIn('/sitemap-pages-', content)
+
+    def test_shards_have_hreflang_alternates(self):
+        post = self.posts[0]
+        _, content = self.get_content(self.shard_url((post.pk - 1) // 2))
+        es_url = f'http://testserver{post.get_absolute_url_for_language("es")}'
+        en_url = f'http://testserver{post.get_absolute_url_for_language("en")}'
+        self.assertIn(f'<loc>{es_url}</loc>', content)
+        self.assertIn(f'<xhtml:link rel="alternate" hreflang="es" href="{es_url}"/>', content)
+        self.assertIn(f'<xhtml:link rel="alternate" hreflang="en" href="{en_url}"/>', content)
+        self.assertIn(f'<xhtml:link rel="alternate" hreflang="x-default" href="{en_url}"/>', content)
+        # Without a slug in Catalan there's no Catalan URL.
+        self.assertNotIn('hreflang="ca"', content)
+
+    def test_second_request_is_served_from_the_cache(self):
+        url = self.shard_url(self.shards[0])
+        response, content = self.get_content(url)
+        self.assertTrue(response.streaming)
+        with self.assertNumQueries(1):
+            response, cached = self.get_content(url)
+        self.assertFalse(response.streaming)
+        self.assertEqual(cached, content)
+
+    def test_an_edit_only_changes_the_key_of_its_shard(self):
+        keys = {number: self.cache_key(number) for number in self.shards}
+        self.assertGreater(len(keys), 1)
+        edited = self.posts[-1]
+        edited.title = 'Edited'
+        edited.save()
+        edited_shard = (edited.pk - 1) // 2
+        for number in self.shards:
+            if number == edited_shard:
+                self.assertNotEqual(self.cache_key(number), keys[number])
+            else:
+                self.assertEqual(self.cache_key(number), keys[number])
+
+    def test_empty_shards_and_unknown_sections_are_not_found(self):
+        self.assertEqual(self.client.get(self.shard_url(self.shards[-1] + 1)).status_code, 404)
+        self.assertEqual(self.client.get(self.shard_url(0, section='unknown')).status_code, 404)
@@ -0,0 +1,177 @@
+# File: core/trending.py
+"""
+Trending posts: views with an exponential decay, so a post that was read a
+lot this week ranks above one read a lot two years ago.
+
+Counting a view (record_view(), called by the post detail views and by the
+page cache when it serves a cached post) adds one to the post's bucket of the
+current hour (PostViewBucket): an UPDATE of one small row. A background task
+(update_trending_scores, queued with the first bucket of each hour) folds the
+buckets into TrendingScore and deletes them.
+
+A bucket of `v` views at hour `h` is worth v * 2^((h - now) / HALF_LIFE_HOURS)
+views now. Since `now` is the same for every post, the score stored is
+
+    log2( sum of v * 2^((h - EPOCH) / HALF_LIFE_HOURS) )
+
+which never has to be decayed again: folding new buckets only touches the
+posts they belong to, and ordering by the stored score is ordering by the
+decayed views at any moment (the log keeps it from overflowing as time goes
+by). The top K is an index range scan on (section, -score).
+"""
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .archives import get_model, get_section
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+HALF_LIFE_HOURS = 24
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+# Posts whose decayed views fall below this leave the table.
+MIN_DECAYED_VIEWS = 0.05
+# Extra rows read for the top K, for the posts unpublished since they were scored.
+TOP_OVERFETCH = 2
+
+# Per process: the hour for which the fold has already been queued.
+_scheduled_hour = None
+
+
+def _level(moment):
+    """ log2 weight of a view at `moment`: its hours since EPOCH in half-lives. """
+    return (moment - EPOCH).total_seconds() / 3600 / HALF_LIFE_HOURS
+
+
+def _log2_add(a, b):
+    """ log2(2^a + 2^b), without computing 2^a or 2^b. """
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def decayed_views(score, now=None):
+    """ The views a stored score is worth at `now`. """
+    return 2 ** (score - _level(now or timezone.now()))
+
+
+def current_hour():
+    return timezone.now().replace(minute=0, second=0, microsecond=0)
+
+
+# --- Counting views ---
+
+def _schedule_fold(hour):
+    global _scheduled_hour
+    if _scheduled_hour == hour:
+        return
+    _scheduled_hour = hour
+    # Once per hour: the buckets of the hour are folded together when it ends.
+    delay = max(0, (hour + timedelta(hours=1) - timezone.now()).total_seconds())
+    update_trending_scores.enqueue_with(delay=int(delay) + 60, unique=True)
+
+
+def record_view(label, pk):
+    """ Counts a view of the post `label` (blog.Post, posts.Post) `pk` in its hourly bucket. """
+    from django.apps import apps
+    from .models import PostViewBucket
+
+    section = get_section(apps.get_model(label))
+    if section is None:
+        return
+    hour = current_hour()
+    buckets = PostViewBucket.objects.filter(section=section, post_id=pk, hour=hour)
+    if buckets.update(views=F('views') + 1):
+        return
+    bucket, created = PostViewBucket.objects.get_or_create(
+        section=section, post_id=pk, hour=hour, defaults={'views': 1},
+    )
+    if not created:
+        buckets.update(views=F('views') + 1)
+    _schedule_fold(hour)
+
+
+# --- Folding the buckets into the scores ---
+
+def fold_view_buckets(until=None):
+    """
+    Adds the buckets before `until` (default: all of them) to the scores,
+    deletes them and drops the scores that decayed away. Returns the number
+    of buckets folded.
+    """
+    from .models import PostViewBucket, TrendingScore
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        buckets = PostViewBucket.objects.select_for_update()
+        if until is not None:
+            buckets = buckets.filter(hour__lt=until)
+        rows = list(buckets.values_list('pk', 'section', 'post_id', 'hour', 'views'))
+        if not rows:
+            return 0
+
+        added = {}
+        for _, section, post_id, hour, views in rows:
+            key = (section, post_id)
+            added[key] = _log2_add(added.get(key), math.log2(views) + _level(hour))
+
+        scores = {}
+        for section in {section for section, _ in added}:
+            post_ids = [post_id for key_section, post_id in added if key_section == section]
+            for score in TrendingScore.objects.filter(section=section, post_id__in=post_ids):
+                scores[(section, score.post_id)] = score
+        now = timezone.now()
+        new_scores = []
+        for (section, post_id), value in added.items():
+            score = scores.get((section, post_id))
+            if score is None:
+                new_scores.append(TrendingScore(section=section, post_id=post_id, score=value, updated_at=now))
+            else:
+                score.score = _log2_add(score.score, value)
+                score.updated_at = now
+        TrendingScore.objects.bulk_update(scores.values(), ['score', 'updated_at'])
+        TrendingScore.objects.bulk_create(new_scores)
+        PostViewBucket.objects.filter(pk__in=[row[0] for row in rows]).delete()
+
+        pruned, _ = TrendingScore.objects.filter(score__lt=_level(now) + math.log2(MIN_DECAYED_VIEWS)).delete()
+    logger.info("Trending scores: %d bucket(s) of %d post(s) folded, %d score(s) pruned in %.0f ms.",
+                len(rows), len(added), pruned, (time.perf_counter() - started) * 1000)
+    return len(rows)
+
+
+@task(priority=5)
+def update_trending_scores():
+    """ Folds the view buckets into the trending scores (core/trending.py). """
+    fold_view_buckets()
+
+
+# --- Reading the top K ---
+
+def get_trending(section, limit):
+    """
+    The `limit` published posts of `section` with the most decayed views,
+    in order, each with its `trending_views`. Two queries of about `limit`
+    rows, whatever the number of posts.
+    """
+    from .models import TrendingScore
+
+    rows = list(
+        TrendingScore.objects.filter(section=section).order_by('-score')
+        .values_list('post_id', 'score')[:limit * TOP_OVERFETCH]
+    )
+    posts = get_model(section).objects.for_list().filter(status='published').in_bulk([pk for pk, _ in rows])
+    now = timezone.now()
+    trending = []
+    for pk, score in rows:
+        post = posts.get(pk)
+        if post is not None:
+            post.trending_views = decayed_views(score, now)
+            trending.append(post)
+    return trending[:limit]
@@ -0,0 +1,233 @@
+# File: core/view_counting.py
+"""
+Which requests count as a view of a post (views_count and the trending
+scores, core/trending.py).
+
+Not counted:
+
+  - anything but a GET: HEAD requests, comment POSTs, and prefetches
+    (Purpose / Sec-Purpose: prefetch);
+  - crawlers, link previews and scripts (BOT_PATTERN on the User-Agent,
+    or no User-Agent at all);
+  - the same visitor seeing the same post again within the same WINDOW:
+    reloads, back and forth navigation.
+
+A visitor is its session, or else a keyed hash of its IP and User-Agent (the
+IP itself is never stored). "Already seen" is a scalable Bloom filter per
+post (ViewFilter), emptied when a new window starts. Its first slice is sized
+for EXPECTED_VISITORS at a FALSE_POSITIVE_RATE (about 1.4 KB for the
+defaults); when it fills up a slice twice as large with half the error rate
+is added, so a busy post keeps the same overall rate at the cost of a few
+more KB rather than saturating. A false positive drops a real view.
+
+The filter is updated with a compare-and-set on its version (like
+Worker.claim() in core/tasks.py): two workers counting the same post at the
+same moment can't overwrite each other's visitor, the second one reads the
+filter again and retries.
+
+Settings (settings.VIEW_COUNTING, merged with DEFAULTS):
+
+    VIEW_COUNTING = {'WINDOW': 1800, 'EXPECTED_VISITORS': 1000, 'FALSE_POSITIVE_RATE': 0.01}
+"""
+import hashlib
+import logging
+import math
+import re
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.crypto import salted_hmac
+
+from .archives import get_section
+from .trending import record_view
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-set retries before a view is counted without dedupe.
+MAX_UPDATE_ATTEMPTS = 5
+
+DEFAULTS = {
+    'ENABLED': True,  # False: every GET counts, as before
+    'WINDOW': 1800,  # seconds during which a visitor counts once per post
+    'EXPECTED_VISITORS': 1000,  # visitors per post and window the first filter slice is sized for
+    'FALSE_POSITIVE_RATE': 0.01,  # repeat views wrongly dropped, at most
+    'BOT_PATTERN': (
+        r'bot|crawl|spider|slurp|archiver|scraper|preview|fetch|externalhit|facebookcatalog|'
+        r'whatsapp|telegram|slack|discord|skype|embedly|quora|pinterest|vkshare|'
+        r'curl|wget|python-|java/|go-http|okhttp|httpclient|libwww|axios|node-fetch|'
+        r'headless|phantomjs|lighthouse|pingdom|uptime|monitor|validator'
+    ),
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'VIEW_COUNTING', {})}
+
+
+class BloomFilter:
+    """ A fixed-size set of strings that can answer "maybe seen" but never forgets one. """
+
+    def __init__(self, size, hashes, data=None):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(data) if data and len(data) * 8 == size else bytearray(size // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate, data=None):
+        """ The smallest filter holding `capacity` items with a false-positive rate of `error_rate`. """
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2 / 8) * 8
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes, data)
+
+    def _positions(self, item):
+        # Double hashing: k positions from the two halves of one digest.
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item):
+        """ Adds `item`; returns False when it was (probably) already there. """
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        return added
+
+    def to_bytes(self):
+        return bytes(self.bits)
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filters that grow with the items added: slice i holds
+    capacity * 2**i items at error_rate / 2**(i + 1), so the overall
+    false-positive rate stays under `error_rate` however many are added.
+    """
+
+    def __init__(self, capacity, error_rate, data=b'', items=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.items = items
+        self.slices = []
+        data = bytes(data or b'')
+        while data:
+            bloom = self._new_slice(len(self.slices))
+            chunk, data = data[:len(bloom.bits)], data[len(bloom.bits):]
+            if len(chunk) < len(bloom.bits):
+                # Stored with other settings: start again.
+                self.slices, self.items = [], 0
+                break
+            bloom.bits[:] = chunk
+            self.slices.append(bloom)
+
+    def _new_slice(self, index):
+        return BloomFilter.for_capacity(self.capacity * 2 ** index, self.error_rate / 2 ** (index + 1))
+
+    def __contains__(self, item):
+        return any(item in bloom for bloom in self.slices)
+
+    def add(self, item):
+        """ Adds `item`; returns False when it was (probably) already there. """
+        if item in self:
+            return False
+        # Slices 0..n-1 hold capacity * (2**n - 1) items in all.
+        if self.items >= self.capacity * (2 ** len(self.slices) - 1):
+            self.slices.append(self._new_slice(len(self.slices)))
+        self.slices[-1].add(item)
+        self.items += 1
+        return True
+
+    def to_bytes(self):
+        return b''.join(bloom.to_bytes() for bloom in self.slices)
+
+
+_bot_patterns = {}
+
+
+def is_bot(user_agent, pattern=None):
+    pattern = pattern or get_config()['BOT_PATTERN']
+    regex = _bot_patterns.get(pattern)
+    if regex is None:
+        regex = _bot_patterns[pattern] = re.compile(pattern, re.IGNORECASE)
+    return not user_agent or bool(regex.search(user_agent))
+
+
+def is_countable(request, config=None):
+    """ The request kinds that never count: not a GET, a prefetch or a bot. """
+    config = config or get_config()
+    if request.method != 'GET':
+        return False
+    purpose = request.META.get('HTTP_SEC_PURPOSE') or request.META.get('HTTP_PURPOSE') or ''
+    if 'prefetch' in purpose.lower():
+        return False
+    return not is_bot(request.META.get('HTTP_USER_AGENT', ''), config['BOT_PATTERN'])
+
+
+def get_visitor_id(request):
+    """ The session, or else a keyed hash of the IP and User-Agent. """
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f's:{session.session_key}'
+    client = '%s|%s' % (request.META.get('REMOTE_ADDR', ''), request.META.get('HTTP_USER_AGENT', ''))
+    return 'a:' + salted_hmac('core.view_counting', client).hexdigest()[:32]
+
+
+def is_first_view(label, pk, visitor, config=None):
+    """ Records that `visitor` saw the post; False when it had (probably) seen it in this window. """
+    from .models import ViewFilter
+
+    config = config or get_config()
+    section = get_section(apps.get_model(label))
+    window = int(time.time() // config['WINDOW'])
+    filters = ViewFilter.objects.filter(section=section, post_id=pk)
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        row = filters.values('pk', 'window', 'bits', 'items', 'version').first()
+        if row is None:
+            seen = ScalableBloomFilter(config['EXPECTED_VISITORS'], config['FALSE_POSITIVE_RATE'])
+            seen.add(visitor)
+            try:
+                with transaction.atomic():
+                    ViewFilter.objects.create(
+                        section=section, post_id=pk, window=window, bits=seen.to_bytes(), items=seen.items,
+                    )
+                return True
+            except IntegrityError:
+                continue  # created by another worker in the meantime
+
+        # The next window starts with an empty filter.
+        data, items = (row['bits'], row['items']) if row['window'] == window else (b'', 0)
+        seen = ScalableBloomFilter(config['EXPECTED_VISITORS'], config['FALSE_POSITIVE_RATE'], data, items)
+        if not seen.add(visitor):
+            return False
+        updated = filters.filter(pk=row['pk'], version=row['version']).update(
+            window=window, bits=seen.to_bytes(), items=seen.items, version=F('version') + 1,
+        )
+        if updated:
+            return True
+    logger.warning("View filter of %s #%s kept changing; view counted without dedupe.", label, pk)
+    return True
+
+
+def count_view(request, label, pk):
+    """
+    Counts a view of the post `label` `pk` (views_count and its trending
+    bucket) if this request is one. Returns whether it was counted.
+    """
+    config = get_config()
+    if config['ENABLED']:
+        if not is_countable(request, config):
+            return False
+        if not is_first_view(label, pk, get_visitor_id(request), config):
+            logger.debug("Repeated view of %s #%s not counted.", label, pk)
+            return False
+    apps.get_model(label).objects.filter(pk=pk).update(views_count=F('views_count') + 1)
+    record_view(label, pk)
+    return True
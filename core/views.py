@@ -1,7 +1,12 @@
 # core/views.py
 import logging
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
 from pages.models import Page
+from core import sitemaps
+from core.page_cache import add_surrogate_keys, list_tag
 
 # Get a logger instance for this module.
 logger = logging.getLogger(__name__)
@@ -11,12 +16,14 @@ def home(request):
     Finds the page marked as the 'homepage' in the database and renders it.
     If no homepage is set, it displays a default view.
     """
-    logger.info(f"Homepage requested by user: {request.user.username or 'Anonymous'}")
+    logger.info("Homepage requested by user: %s", request.user.username or 'Anonymous')
 
     homepage = None
+    # Any page change may change which page is the homepage.
+    add_surrogate_keys(request, list_tag(Page))
     try:
         homepage = Page.objects.filter(is_homepage=True, status='published').latest('updated_at')
-        logger.debug(f"Serving homepage: '{homepage.title}' (ID: {homepage.id})")
+        logger.debug("Serving homepage: '%s' (ID: %s)", homepage.title, homepage.id)
 
     except Page.DoesNotExist:
         # This is a configuration warning, not an error. The site still works.
@@ -26,7 +33,7 @@ def home(request):
     except Exception as e:
         # Catch any other unexpected database or logic errors.
         logger.error(
-            f"An unexpected error occurred while fetching the homepage.",
+            "An unexpected error occurred while fetching the homepage.",
             exc_info=True # Include the full traceback for debugging.
         )
         # In this case, homepage remains None, and the template will show a message.
@@ -36,4 +43,42 @@ def home(request):
         'page': homepage,
     }
 
-    return render(request, 'pages/page_detail.html', context)
\ No newline at end of file
+    return render(request, 'pages/page_detail.html', context)
+
+
+# --- XML sitemaps (core/sitemaps.py) ---
+
+SITEMAP_CONTENT_TYPE = 'application/xml; charset=utf-8'
+
+
+@require_GET
+def sitemap_index(request):
+    base_url = f'{request.scheme}://{request.get_host()}'
+    return StreamingHttpResponse(sitemaps.iter_index(base_url), content_type=SITEMAP_CONTENT_TYPE)
+
+
+@require_GET
+def sitemap_shard(request, section, number):
+    """
+    Serves a shard from the cache while its objects haven't changed, and
+    streams it (caching it) otherwise.
+    """
+    section = sitemaps.get_sections().get(section)
+    if section is None:
+        raise Http404("Unknown sitemap section.")
+    count, lastmod = sitemaps.get_shard_state(section, number)
+    if not count:
+        raise Http404("Empty sitemap shard.")
+
+    base_url = f'{request.scheme}://{request.get_host()}'
+    cache_key = sitemaps.get_shard_cache_key(section, number, count, lastmod, base_url)
+    content = sitemaps.cache.get(cache_key)
+    if content is not None:
+        response = HttpResponse(content, content_type=SITEMAP_CONTENT_TYPE)
+    else:
+        response = StreamingHttpResponse(
+            sitemaps.stream_shard(section, number, base_url, cache_key), content_type=SITEMAP_CONTENT_TYPE,
+        )
+    if lastmod:
+        response['Last-Modified'] = http_date(lastmod.timestamp())
+    return response
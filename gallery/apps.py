@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GalleryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gallery'
+
+    def ready(self):
+        # Connects the signals that invalidate the page cache.
+        import gallery.signals
@@ -0,0 +1,14 @@
+# File: gallery/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.page_cache import purge_instance
+from .models import Image
+
+
+@receiver([post_save, post_delete], sender=Image)
+def purge_page_cache_on_image_change(sender, instance, **kwargs):
+    """
+    Invalidates the cached gallery pages and the image detail page.
+    """
+    purge_instance(instance)
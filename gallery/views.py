@@ -11,6 +11,8 @@ from pages.models import Page # For collecting featured images from pages (assum
 from .models import Image # For images specifically in the gallery app
 from django.utils.translation import gettext
 from django.urls import reverse
+from core.conditional import conditional_content
+from core.page_cache import add_surrogate_keys, list_tag, model_object_tag, object_tag
 import logging
 import datetime
 
@@ -33,16 +35,15 @@ def gallery_view(request):
     """
     gallery_items_data = [] # This list will hold uniform dictionaries for the template
     current_lang = get_language() # Get current language for consistent data retrieval
+    add_surrogate_keys(request, list_tag(Image), list_tag(Post), list_tag(Page))
 
     # --- Get all images from the gallery.Image model ---
-    # Log the number of objects found before processing
-    logger.debug(f"Collecting images from gallery.Image model. Found {Image.objects.count()} objects.")
     for img_obj in Image.objects.all():
         # Ensure image has a file attached before trying to get its URL
         img_url = img_obj.image.url if img_obj.image else '' 
         # get_absolute_url() needs to be correctly defined in Image model
         detail_url = img_obj.get_absolute_url() 
-        logger.debug(f"Processing Image (ID: {img_obj.pk}): URL={img_url}, DetailURL={detail_url}, Title={img_obj.title}")
+        logger.debug("Processing Image (ID: %s): URL=%s, DetailURL=%s, Title=%s", img_obj.pk, img_url, detail_url, img_obj.title)
 
         gallery_items_data.append({
             'image_url': img_url,
@@ -52,15 +53,16 @@ def gallery_view(request):
             'date': img_obj.uploaded_at, # Use uploaded_at for sorting
             'type': 'Image'
         })
+    # Logged after the loop: a count() here would cost a query on every request.
+    logger.debug("Collected %d images from gallery.Image model.", len(gallery_items_data))
     
     # --- Get featured images from blog.Post model ---
     # Filter for published posts that have a featured image
     posts_with_images = Post.objects.filter(
         status='published', 
         featured_image__isnull=False # Ensure featured_image is not null
-    ).exclude(featured_image='').order_by('-published_date') # Exclude empty string
-    
-    logger.debug(f"Collecting featured images from blog.Post model. Found {posts_with_images.count()} objects.")
+    ).exclude(featured_image='').for_list().order_by('-published_date') # Exclude empty string
+
     for post_obj in posts_with_images:
         post_img_url = post_obj.featured_image.url if post_obj.featured_image else ''
         post_detail_url = post_obj.get_absolute_url()
@@ -74,7 +76,7 @@ def gallery_view(request):
         gallery_items_data.append({
             'image_url': post_img_url,
             'title': post_obj.title, # Modeltranslation handles this
-            'description': get_truncated_description(getattr(post_obj, 'meta_description', '') or post_obj.content), 
+            'description': get_truncated_description(getattr(post_obj, 'meta_description', '') or post_obj.excerpt), 
             'detail_url': post_detail_url,
             'date': post_published_date,
             'type': 'Post'
@@ -88,9 +90,8 @@ def gallery_view(request):
             pages_with_images = Page.objects.filter(
                 status='published',
                 featured_image__isnull=False
-            ).exclude(featured_image='').order_by('-updated_at')
-            
-            logger.debug(f"Collecting featured images from pages.Page model. Found {pages_with_images.count()} objects.")
+            ).exclude(featured_image='').for_list().order_by('-updated_at')
+
             for page_obj in pages_with_images:
                 page_img_url = page_obj.featured_image.url if page_obj.featured_image else ''
                 page_detail_url = page_obj.get_absolute_url()
@@ -101,7 +102,7 @@ def gallery_view(request):
                 gallery_items_data.append({
                     'image_url': page_img_url,
                     'title': page_obj.title, # Modeltranslation handles this
-                    'description': get_truncated_description(getattr(page_obj, 'meta_description', '') or page_obj.content),
+                    'description': get_truncated_description(getattr(page_obj, 'meta_description', '') or page_obj.excerpt),
                     'detail_url': page_detail_url,
                     'date': page_updated_at,
                     'type': 'Page'
@@ -110,7 +111,7 @@ def gallery_view(request):
         else:
             logger.debug("Page model does not have 'featured_image' field. Skipping page image collection.")
     except Exception as e:
-        logger.warning(f"Error collecting featured images from Pages: {e}. Check Page model's 'featured_image' field configuration.")
+        logger.warning("Error collecting featured images from Pages: %s. Check Page model's 'featured_image' field configuration.", e)
 
 
     # --- Sort the combined list by date (newest first) ---
@@ -140,7 +141,7 @@ def gallery_view(request):
         else:
             images_on_page = [] # No pages to display if paginator has 0 pages
     
-    logger.info(f"Gallery view accessed. Showing page {getattr(images_on_page, 'number', 0)} of {getattr(images_on_page, 'paginator.num_pages', 0)} images.")
+    logger.info("Gallery view accessed. Showing page %s of %s (%d images).", getattr(images_on_page, 'number', 0), paginator.num_pages, len(gallery_items_data))
     breadcrumbs = [
         {"url": "/", "label": gettext("Home")},
         {"url": "", "label": gettext("Gallery")},
@@ -152,10 +153,22 @@ def gallery_view(request):
 
     return render(request, 'gallery/gallery_page.html', context)
 
+def _image_detail_validators(request, pk):
+    """
+    Conditional GET validators. Images have no 'updated_at', but every save
+    purges the image tag, whose version carries its own timestamp.
+    """
+    uploaded_at = Image.objects.filter(pk=pk).values_list('uploaded_at', flat=True).first()
+    if uploaded_at is None:
+        return None
+    return [model_object_tag(Image, pk)], uploaded_at
+
 # NEW: View for individual image detail (basic placeholder)
+@conditional_content(_image_detail_validators)
 def image_detail_view(request, pk):
     """ Displays details for a single image from the gallery. """
     image = get_object_or_404(Image, pk=pk)
+    add_surrogate_keys(request, object_tag(image))
     context = {
         'image': image,
         'translatable_object': image,
@@ -1,18 +1,116 @@
 # File: menus/signals.py
-from django.db.models.signals import post_save, post_delete
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
+from blog.models import Post
+from categories.models import Category
+from core.page_cache import SITE_TAG, menu_tag, purge, purge_instance
+from pages.models import Page
 from .models import MenuItem, Menu
 
+
+def clear_menu_fragment_caches(menu_slug):
+    """
+    Deletes the cached items of a menu for all languages.
+    The keys must match the ones built in menus/templatetags/menu_tags.py.
+    """
+    from django.conf import settings
+    for lang_code, lang_name in settings.LANGUAGES:
+        cache.delete_many([
+            f'menu_nodes_main_level_{menu_slug}_{lang_code}_v1',
+            f'simple_menu_items_{menu_slug}_{lang_code}_v1',
+        ])
+        if menu_slug == 'social-links':
+            cache.delete(f'social_links_menu_{lang_code}_v1')
+
+
 @receiver([post_save, post_delete], sender=MenuItem)
 def clear_menu_cache(sender, instance, **kwargs):
     """
     Clears the relevant menu cache whenever a MenuItem is saved or deleted.
     """
     # We need to clear the cache for all languages
-    from django.conf import settings
     if instance.menu:
-        for lang_code, lang_name in settings.LANGUAGES:
-            cache_key = f'menu_items_{instance.menu.slug}_{lang_code}_v1'
-            cache.delete(cache_key)
-        print(f"Cache cleared for menu '{instance.menu.slug}'")
\ No newline at end of file
+        clear_menu_fragment_caches(instance.menu.slug)
+        purge_instance(instance, menu_tag(instance.menu.slug))
+        print(f"Cache cleared for menu '{instance.menu.slug}'")
+
+
+@receiver([post_save, post_delete], sender=Menu)
+def clear_cache_on_menu_change(sender, instance, **kwargs):
+    """
+    A renamed or deleted menu may be referenced by any template under its
+    old slug, so the whole page cache is invalidated (menus rarely change).
+    """
+    clear_menu_fragment_caches(instance.slug)
+    purge(SITE_TAG)
+
+
+# --- Menus built from other content ---
+# show_menu() only tags the pages with their menu: a post, page or category
+# change refreshes the menus whose items link to it or list it, not every page.
+
+def refresh_menus(item_lookup):
+    """ Clears the cached items and purges the pages of the menus with items matching `item_lookup`. """
+    slugs = set(MenuItem.objects.filter(item_lookup).values_list('menu__slug', flat=True))
+    for slug in slugs:
+        clear_menu_fragment_caches(slug)
+    purge(*[menu_tag(slug) for slug in slugs])
+
+
+@receiver(post_save, sender=Page)
+def refresh_menus_on_page_save(sender, instance, **kwargs):
+    # The title or slug of a linked page, or the "important pages" list.
+    refresh_menus(Q(link_page=instance) | Q(link_type=MenuItem.LinkType.IMPORTANT_PAGES))
+
+
+@receiver(pre_delete, sender=Page)
+def remember_menus_of_deleted_page(sender, instance, **kwargs):
+    # Once deleted, the items that linked to it no longer point to it (SET_NULL).
+    instance._menu_item_ids = list(MenuItem.objects.filter(link_page=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Page)
+def refresh_menus_on_page_delete(sender, instance, **kwargs):
+    item_ids = getattr(instance, '_menu_item_ids', [])
+    refresh_menus(Q(pk__in=item_ids) | Q(link_type=MenuItem.LinkType.IMPORTANT_PAGES))
+
+
+@receiver([post_save, post_delete], sender=Category)
+def refresh_menus_on_category_change(sender, instance, **kwargs):
+    refresh_menus(Q(link_type=MenuItem.LinkType.ALL_BLOG_CATEGORIES))
+
+
+# The blog categories dropdown only lists categories with published posts:
+# it changes when a post is published, unpublished or deleted, not when a
+# published post is edited.
+
+@receiver(pre_save, sender=Post)
+def remember_post_was_published(sender, instance, update_fields=None, **kwargs):
+    instance._menu_was_published = None
+    if instance.pk is not None and not (update_fields and set(update_fields) <= {'views_count'}):
+        instance._menu_was_published = Post.objects.filter(pk=instance.pk, status=Post.Status.PUBLISHED).exists()
+
+
+@receiver(post_save, sender=Post)
+def refresh_menus_on_post_save(sender, instance, created, **kwargs):
+    was_published = getattr(instance, '_menu_was_published', None)
+    if was_published is None and not created:
+        return
+    if bool(was_published) != (instance.status == Post.Status.PUBLISHED):
+        refresh_menus(Q(link_type=MenuItem.LinkType.ALL_BLOG_CATEGORIES))
+
+
+@receiver(post_delete, sender=Post)
+def refresh_menus_on_post_delete(sender, instance, **kwargs):
+    if instance.status == Post.Status.PUBLISHED:
+        refresh_menus(Q(link_type=MenuItem.LinkType.ALL_BLOG_CATEGORIES))
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def refresh_menus_on_post_categories_change(sender, instance, action, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Category) or instance.status == Post.Status.PUBLISHED:
+        refresh_menus(Q(link_type=MenuItem.LinkType.ALL_BLOG_CATEGORIES))
@@ -9,6 +9,7 @@ from django.db.models import Count, Q # Needed for dynamic children queries
 from ..models import Menu, MenuItem # Relative import for models within the same app
 from pages.models import Page # For Important Pages list
 from categories.models import Category # For Blog Categories list
+from core.page_cache import add_surrogate_keys, menu_tag
 
 logger = logging.getLogger(__name__)
 
@@ -31,12 +32,16 @@ def show_menu(context, menu_slug):
     """
     language_code = context.get('LANGUAGE_CODE', settings.LANGUAGE_CODE)
     cache_key = f'menu_nodes_main_level_{menu_slug}_{language_code}_v1'
+
+    # Tell the page cache that this page depends on the menu. Changes to the
+    # pages, categories and posts shown in it purge this tag too (menus/signals.py).
+    add_surrogate_keys(context.get('request'), menu_tag(menu_slug))
     
     # Try getting the top-level nodes (with attached dynamic_children) from cache
     top_level_nodes = cache.get(cache_key)
 
     if top_level_nodes is None:
-        logger.info(f"CACHE MISS for main level menu '{menu_slug}' (lang: {language_code}). Building.")
+        logger.debug("CACHE MISS for main level menu '%s' (lang: %s). Building.", menu_slug, language_code)
         try:
             menu = Menu.objects.get(slug=menu_slug)
             
@@ -63,7 +68,7 @@ def show_menu(context, menu_slug):
                     important_pages_qs = Page.objects.filter(
                         status='published', 
                         importance_order__lt=99
-                    ).order_by('importance_order', 'title')
+                    ).for_list().order_by('importance_order', 'title')
                     item_obj.dynamic_children = list(important_pages_qs[:important_pages_limit])
 
             # Now, filter for only the top-level nodes (level 0) for the main navbar.
@@ -82,10 +87,10 @@ def show_menu(context, menu_slug):
             top_level_nodes = raw_top_level_nodes
             
         except Menu.DoesNotExist:
-            logger.warning(f"Menu with slug '{menu_slug}' does not exist.")
+            logger.warning("Menu with slug '%s' does not exist.", menu_slug)
             top_level_nodes = [] # Return empty list if menu does not exist
     else:
-        logger.debug(f"CACHE HIT for main level menu '{menu_slug}' (lang: {language_code}). Serving from cache.")
+        logger.debug("CACHE HIT for main level menu '%s' (lang: %s). Serving from cache.", menu_slug, language_code)
             
     return {'nodes': top_level_nodes} # Pass only top-level nodes to _navbar_main_level.html
 
@@ -100,11 +105,12 @@ def show_social_links_menu(context):
     """
     language_code = context.get('LANGUAGE_CODE', settings.LANGUAGE_CODE)
     cache_key = f'social_links_menu_{language_code}_v1'
+    add_surrogate_keys(context.get('request'), menu_tag('social-links'))
     
     menu_items_processed = cache.get(cache_key)
 
     if menu_items_processed is None:
-        logger.info(f"CACHE MISS for 'social-links' menu (lang: {language_code}). Querying database.")
+        logger.debug("CACHE MISS for 'social-links' menu (lang: %s). Querying database.", language_code)
         
         try:
             from site_settings.models import SiteConfiguration # Import here
@@ -123,7 +129,7 @@ def show_social_links_menu(context):
             logger.warning("Menu with slug 'social-links' does not exist. Cannot display social media icons.")
             menu_items_processed = []
     else:
-        logger.debug(f"CACHE HIT for 'social-links' menu (lang: {language_code}). Serving from cache.")
+        logger.debug("CACHE HIT for 'social-links' menu (lang: %s). Serving from cache.", language_code)
 
     return {'nodes': menu_items_processed}
 
@@ -135,11 +141,12 @@ def show_simple_menu(context, menu_slug):
     """
     language_code = context.get('LANGUAGE_CODE', settings.LANGUAGE_CODE)
     cache_key = f'simple_menu_items_{menu_slug}_{language_code}_v1'
+    add_surrogate_keys(context.get('request'), menu_tag(menu_slug))
     
     items = cache.get(cache_key)
 
     if items is None:
-        logger.info(f"CACHE MISS for simple menu '{menu_slug}' (lang: {language_code}). Building.")
+        logger.debug("CACHE MISS for simple menu '%s' (lang: %s). Building.", menu_slug, language_code)
         try:
             menu = Menu.objects.get(slug=menu_slug)
             # Solo queremos los items de nivel 0, ya que es un menú simple.
@@ -154,9 +161,9 @@ def show_simple_menu(context, menu_slug):
             cache.set(cache_key, items, timeout)
             
         except Menu.DoesNotExist:
-            logger.warning(f"Menu with slug '{menu_slug}' does not exist for show_simple_menu.")
+            logger.warning("Menu with slug '%s' does not exist for show_simple_menu.", menu_slug)
             items = []
     else:
-        logger.debug(f"CACHE HIT for simple menu '{menu_slug}' (lang: {language_code}).")
+        logger.debug("CACHE HIT for simple menu '%s' (lang: %s).", menu_slug, language_code)
 
     return {'nodes': items}
\ No newline at end of file
@@ -1,3 +1,60 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
 
-# Create your tests here.
+from blog.models import Post
+from categories.models import Category
+from core.page_cache import get_tag_versions, menu_tag
+from core.testing import LocMemCacheTestCase
+from pages.models import Page
+from .models import Menu, MenuItem
+
+
+class MenuPurgeTests(LocMemCacheTestCase):
+    """ Content changes only purge the menus that link to or list that content. """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('author')
+        cls.page = Page.objects.create(
+            title='About', slug_es='sobre', slug_en='about', slug_ca='sobre', author=author, content='<p>Text</p>', status='published',
+        )
+        cls.category = Category.objects.create(name='News', slug_es='noticias', slug_en='news', slug_ca='noticies')
+        cls.post = Post.objects.create(
+            title='Post', slug_es='post', slug_en='post', slug_ca='post', author=author, content='<p>Text</p>', status='published',
+        )
+
+        cls.blog_menu = Menu.objects.create(title='Blog', slug='blog')
+        MenuItem.objects.create(menu=cls.blog_menu, title='Categories', link_type=MenuItem.LinkType.ALL_BLOG_CATEGORIES)
+        cls.page_menu = Menu.objects.create(title='Footer', slug='footer')
+        MenuItem.objects.create(menu=cls.page_menu, title='About', link_type=MenuItem.LinkType.PAGE, link_page=cls.page)
+        cls.url_menu = Menu.objects.create(title='Social', slug='social')
+        MenuItem.objects.create(menu=cls.url_menu, title='Home', link_url='/')
+
+    def versions(self):
+        return get_tag_versions([menu_tag(menu.slug) for menu in (self.blog_menu, self.page_menu, self.url_menu)])
+
+    def changed_menus(self, change):
+        before = self.versions()
+        change()
+        after = self.versions()
+        return {tag for tag in before if before[tag] != after[tag]}
+
+    def test_editing_a_published_post_purges_no_menu(self):
+        def edit():
+            self.post.title = 'Renamed'
+            self.post.save()
+        self.assertEqual(self.changed_menus(edit), set())
+
+    def test_unpublishing_a_post_purges_the_categories_menu(self):
+        def unpublish():
+            self.post.status = 'draft'
+            self.post.save()
+        self.assertEqual(self.changed_menus(unpublish), {menu_tag('blog')})
+
+    def test_saving_a_category_purges_the_categories_menu(self):
+        self.assertEqual(self.changed_menus(self.category.save), {menu_tag('blog')})
+
+    def test_saving_a_page_purges_the_menus_linking_to_it(self):
+        self.assertEqual(self.changed_menus(self.page.save), {menu_tag('footer')})
+
+    def test_deleting_a_page_purges_the_menus_linking_to_it(self):
+        self.assertEqual(self.changed_menus(self.page.delete), {menu_tag('footer')})
@@ -2,10 +2,12 @@ from django.shortcuts import get_object_or_404, render
 from django.utils.translation import gettext as _
 from django.urls import reverse
 from .models import Menu
+from core.page_cache import add_surrogate_keys, menu_tag
 
 def menu_view(request, slug):
     menu = get_object_or_404(Menu, slug=slug)
     root_items = menu.items.filter(parent__isnull=True)
+    add_surrogate_keys(request, menu_tag(menu.slug))
 
     breadcrumbs = [
         {"url": "/", "label": _("Home")},
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_page_featured_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='content_pipeline_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Content Pipeline Version'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='content_rendered',
+            field=models.TextField(blank=True, editable=False, verbose_name='Rendered Content'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='content_rendered_ca',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Rendered Content'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='content_rendered_en',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Rendered Content'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='content_rendered_es',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='Rendered Content'),
+        ),
+    ]
@@ -5,6 +5,18 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericRelation
 from categories.models import Category
 from django.utils.translation import override 
+from core.html_pipeline import get_rendered_html
+
+
+class PageQuerySet(models.QuerySet):
+    # Full-text columns that lists never show (with modeltranslation, each
+    # name also covers its _es/_en/_ca columns).
+    LIST_DEFERRED_FIELDS = ('content', 'content_rendered', 'content_text')
+
+    def for_list(self):
+        """ Projection for lists and menus: everything except the full-text columns. """
+        return self.defer(*self.LIST_DEFERRED_FIELDS)
+
 
 class Page(models.Model):
     """ Represents a single static page in the CMS, like 'About Us'. """
@@ -17,6 +29,13 @@ class Page(models.Model):
     title = models.CharField(max_length=250, verbose_name=_("Title"))
     slug = models.SlugField(max_length=250, unique=True, verbose_name=_("Slug (URL friendly)"))
     content = models.TextField(verbose_name=_("Content")) # The editor will be applied in admin.py
+    # --- Render-on-save HTML (see core/html_pipeline.py) ---
+    content_rendered = models.TextField(blank=True, editable=False, verbose_name=_("Rendered Content"))
+    content_pipeline_version = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Content Pipeline Version"))
+    # --- Plain-text fields derived from the content (see core/derived_fields.py) ---
+    content_text = models.TextField(blank=True, editable=False, verbose_name=_("Plain Text Content"))
+    excerpt = models.CharField(max_length=255, blank=True, editable=False, verbose_name=_("Excerpt"))
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Reading Time (minutes)"))
     
     author = models.ForeignKey(User, on_delete=models.PROTECT, related_name="pages", verbose_name=_("Author"))
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft', verbose_name=_("Status"))
@@ -51,6 +70,9 @@ class Page(models.Model):
         null=True, 
         verbose_name=_("Featured Image")
     )
+
+    objects = PageQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("page")
         verbose_name_plural = _("pages")
@@ -59,6 +81,11 @@ class Page(models.Model):
     def __str__(self):
         return self.title
 
+    @property
+    def rendered_content(self):
+        """ The content HTML as transformed at save time (see core/html_pipeline.py). """
+        return get_rendered_html(self.content, self.content_rendered, self.content_pipeline_version)
+
     def get_absolute_url(self):
         # Uses the 'pages' namespace to generate the correct URL.
         return reverse('pages:page_detail', kwargs={'slug': self.slug})
@@ -0,0 +1,33 @@
+# File: pages/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.html_pipeline import is_source_saved, render_translated_fields
+from core.page_cache import purge_instance
+from .models import Page
+
+
+@receiver(pre_save, sender=Page)
+def render_page_content(sender, instance, update_fields=None, **kwargs):
+    """
+    Stores the transformed and sanitized content HTML of every language in
+    'content_rendered_<lang>', so templates don't have to parse it per request.
+    """
+    if is_source_saved(update_fields):
+        render_translated_fields(instance)
+
+
+@receiver([post_save, post_delete], sender=Page)
+def purge_page_cache_on_page_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidates the cached pages that show this page (its detail page, the
+    homepage, menus with important pages, the gallery, search results...).
+    """
+    purge_instance(instance, update_fields=update_fields)
+
+
+@receiver(m2m_changed, sender=Page.categories.through)
+def purge_page_cache_on_page_categories_change(sender, instance, action, **kwargs):
+    """ Category listings change when categories are added to or removed from a page. """
+    if action.startswith('post_') and isinstance(instance, Page):
+        purge_instance(instance)
@@ -4,4 +4,4 @@ from .models import Page
     
 @register(Page)
 class PageTranslationOptions(TranslationOptions):
-    fields = ('title', 'slug', 'content', 'meta_title', 'meta_description')
\ No newline at end of file
+    fields = ('title', 'slug', 'content', 'content_rendered', 'content_text', 'excerpt', 'reading_time', 'meta_title', 'meta_description')
\ No newline at end of file
@@ -7,13 +7,30 @@ from django.core.paginator import Paginator # Asegúrate de importar Paginator
 from site_settings.models import SiteConfiguration
 from django.utils.translation import gettext
 from django.urls import reverse
+from django.db.models import Max
+from core.conditional import conditional_content
+from core.page_cache import add_surrogate_keys, list_tag, model_object_tag, object_tag
 
 logger = logging.getLogger(__name__)
 
+def _page_detail_validators(request, slug):
+    """ One lightweight query for the conditional GET validators of a page. """
+    row = Page.objects.filter(slug=slug, status='published').values_list('pk', 'updated_at').first()
+    if row is None:
+        return None
+    pk, updated_at = row
+    return [model_object_tag(Page, pk)], updated_at
+
+def _page_directory_validators(request):
+    last_updated = Page.objects.filter(categories__isnull=False).aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Page), list_tag(Category)], last_updated
+
+@conditional_content(_page_detail_validators)
 def page_detail_view(request, slug):
     # Buscamos una página que coincida con el slug Y que esté publicada.
     # Si no la encuentra, automáticamente devuelve un error 404.
     page = get_object_or_404(Page, slug=slug, status='published')
+    add_surrogate_keys(request, object_tag(page))
 
     breadcrumbs = [
     {"url": "/", "label": gettext("Home")},
@@ -35,7 +52,8 @@ def pages_by_category_view(request, category_slug):
     to a specific category.
     """
     category = get_object_or_404(Category, slug=category_slug)
-    all_pages_in_category = category.pages.filter(status='published').order_by('title')
+    all_pages_in_category = category.pages.filter(status='published').for_list().order_by('title')
+    add_surrogate_keys(request, list_tag(Category), list_tag(Page))
 
     try:
         site_config = SiteConfiguration.get_solo()
@@ -57,8 +75,10 @@ def pages_by_category_view(request, category_slug):
     return render(request, 'pages/pages_by_category.html', context)
 
 
+@conditional_content(_page_directory_validators)
 def pages_with_category_view(request):
-    pages = Page.objects.filter(categories__isnull=False)
+    pages = Page.objects.filter(categories__isnull=False).for_list().prefetch_related('categories')
+    add_surrogate_keys(request, list_tag(Page), list_tag(Category))
 
     breadcrumbs = [
         {"url": "/", "label": gettext("Home")},
@@ -11,4 +11,12 @@ os.environ['DJANGO_SETTINGS_MODULE'] = 'tvt.settings'
 
 # Obtén la aplicación WSGI de Django
 from django.core.wsgi import get_wsgi_application
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Precarga opcional de las cachés (menús, árbol de categorías y zonas de widgets)
+# en todos los idiomas. La caché local en memoria es por proceso, así que hay que
+# hacerlo aquí, dentro del propio proceso de la aplicación. Ver WARM_CACHES_ON_STARTUP en settings.
+from django.conf import settings
+if settings.WARM_CACHES_ON_STARTUP:
+    from core.cache_warmup import warm_caches
+    warm_caches()
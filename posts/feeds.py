@@ -0,0 +1,130 @@
+# File: posts/feeds.py
+from django.conf import settings
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.translation import gettext
+
+from categories.models import Category
+from core.feeds import FEED_SIZE, CachedFeed, language_url_template
+from core.page_cache import list_tag, object_tag
+from tags.models import Tag
+from .models import Post
+
+
+class LatestPostsFeed(CachedFeed):
+    """
+    📰 RSS feed of the latest published posts, in the active language.
+    for_list() joins the authors and prefetches one translation per post
+    (the active language or its fallback); the description is the excerpt
+    stored at save time.
+    """
+
+    def get_cache_tags(self, obj):
+        return [list_tag(Post)]
+
+    def title(self, obj):
+        return gettext("Posts")
+
+    def link(self, obj):
+        return reverse('posts:post_list')
+
+    def description(self, obj):
+        return gettext("Latest posts")
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(status='published')
+
+    def items(self, obj):
+        return list(
+            self.get_queryset(obj).for_list().prefetch_related('categories')
+            .order_by('-published_date')[:FEED_SIZE]
+        )
+
+    def item_title(self, item):
+        return item.safe_translation_getter('title', any_language=True)
+
+    def item_description(self, item):
+        return (item.safe_translation_getter('meta_description', any_language=True)
+                or item.safe_translation_getter('excerpt', any_language=True))
+
+    def item_link(self, item):
+        date = item.published_date
+        link_template = language_url_template('posts:post_detail', 'year', 'month', 'day', 'slug')
+        return link_template.format(
+            year=date.year, month=date.month, day=date.day,
+            slug=item.safe_translation_getter('slug', any_language=True),
+        )
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item):
+        return [category.name for category in item.categories.all()]
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    """ 📂 RSS feed of the latest posts of a category (slug in any language). """
+
+    def get_object(self, request, category_slug):
+        lookup = Q()
+        for lang_code, _ in settings.LANGUAGES:
+            lookup |= Q(**{f"slug_{lang_code}": category_slug})
+        return Category.objects.get(lookup)
+
+    def get_cache_tags(self, obj):
+        return [object_tag(obj), list_tag(Category), list_tag(Post)]
+
+    def title(self, obj):
+        return gettext("Posts: %(name)s") % {'name': obj.name}
+
+    def link(self, obj):
+        return reverse('posts:posts_by_category', kwargs={'category_slug': obj.slug})
+
+    def description(self, obj):
+        return gettext("Latest posts in %(name)s") % {'name': obj.name}
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(status='published', categories=obj)
+
+
+class TagPostsFeed(LatestPostsFeed):
+    """ 🏷️ RSS feed of the latest posts with a tag. """
+
+    def get_object(self, request, tag_slug):
+        return Tag.objects.get(slug=tag_slug)
+
+    def get_cache_tags(self, obj):
+        return [object_tag(obj), list_tag(Post)]
+
+    def title(self, obj):
+        return gettext("Posts: #%(name)s") % {'name': obj}
+
+    def link(self, obj):
+        return reverse('posts:posts_by_tag', kwargs={'tag_slug': obj.slug})
+
+    def description(self, obj):
+        return gettext("Latest posts tagged %(name)s") % {'name': obj}
+
+    def get_queryset(self, obj):
+        return Post.objects.filter(status='published', tags=obj)
+
+
+# --- Atom versions of the same feeds ---
+
+class AtomLatestPostsFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class AtomCategoryPostsFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryPostsFeed.description
+
+
+class AtomTagPostsFeed(TagPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = TagPostsFeed.description
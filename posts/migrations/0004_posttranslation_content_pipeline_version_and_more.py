@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posttranslation',
+            name='content_pipeline_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Content Pipeline Version'),
+        ),
+        migrations.AddField(
+            model_name='posttranslation',
+            name='content_rendered',
+            field=models.TextField(blank=True, editable=False, verbose_name='Rendered Content'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_posttranslation_content_pipeline_version_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posttranslation',
+            name='content_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='Plain Text Content'),
+        ),
+        migrations.AddField(
+            model_name='posttranslation',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='posttranslation',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Reading Time (minutes)'),
+        ),
+    ]
@@ -1,14 +1,42 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _, override
+from parler.managers import TranslatableManager, TranslatableQuerySet
 from parler.models import TranslatableModel, TranslatedFields
+from parler.utils.i18n import get_active_language_choices
 from django.urls import reverse
 from django.utils import timezone
 from categories.models import Category 
 from tags.models import Tag, TaggedPost
+from core.html_pipeline import get_rendered_html
 
 User = get_user_model()
 
+
+class PostQuerySet(TranslatableQuerySet):
+
+    def for_list(self):
+        """
+        📋 Queryset for lists and widgets: the author is joined and one
+        translation per post is prefetched in a single query (instead of one
+        query per post): the active language, or its fallback when missing.
+
+        ⚠️ The translation rows can't use defer(): parler reads every field in
+        TranslatedFieldsModel.__init__, so a deferred column reloads itself
+        endlessly. Loading one row per post is what keeps the payload small.
+        """
+        language, *fallbacks = get_active_language_choices(self._language or get_language())
+        translation_model = self.model._parler_meta.root_model
+        has_active_language = translation_model.objects.filter(master=models.OuterRef('master'), language_code=language)
+        translations = translation_model.objects.filter(
+            models.Q(language_code=language)
+            | models.Q(~models.Exists(has_active_language), language_code__in=fallbacks)
+        )
+        return self.select_related('author').prefetch_related(
+            models.Prefetch('translations', queryset=translations)
+        )
+
+
 class Post(TranslatableModel):
     """
     Represents a blog post with multilingual support using django-parler.
@@ -28,6 +56,13 @@ class Post(TranslatableModel):
         content=models.TextField(
             verbose_name=_("Content")
         ),
+        # ⚙️ Render-on-save HTML (see core/html_pipeline.py)
+        content_rendered=models.TextField(blank=True, editable=False, verbose_name=_("Rendered Content")),
+        content_pipeline_version=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Content Pipeline Version")),
+        # ⚙️ Plain-text fields derived from the content (see core/derived_fields.py)
+        content_text=models.TextField(blank=True, editable=False, verbose_name=_("Plain Text Content")),
+        excerpt=models.CharField(max_length=255, blank=True, editable=False, verbose_name=_("Excerpt")),
+        reading_time=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Reading Time (minutes)")),
         meta_title=models.CharField(
             max_length=70,
             blank=True,
@@ -99,6 +134,8 @@ class Post(TranslatableModel):
         related_name="posts_posts"
     )
 
+    objects = TranslatableManager.from_queryset(PostQuerySet)()
+
     class Meta:
         verbose_name = _("Post")
         verbose_name_plural = _("Posts")
@@ -115,3 +152,24 @@ class Post(TranslatableModel):
             'day': self.published_date.day,
             'slug': self.safe_translation_getter('slug', any_language=True)
         })
+
+    @property
+    def rendered_content(self):
+        """ ⚙️ The content HTML as transformed at save time (see core/html_pipeline.py). """
+        return get_rendered_html(
+            self.safe_translation_getter('content', any_language=True),
+            self.safe_translation_getter('content_rendered', any_language=True),
+            self.safe_translation_getter('content_pipeline_version', any_language=True),
+        )
+
+    def get_absolute_url_for_language(self, language_code):
+        """
+        🌐 URL of this post in the given language (prefix and translated slug).
+        """
+        with override(language_code):
+            return reverse('posts:post_detail', kwargs={
+                'year': self.published_date.year,
+                'month': self.published_date.month,
+                'day': self.published_date.day,
+                'slug': self.safe_translation_getter('slug', language_code=language_code, any_language=True)
+            })
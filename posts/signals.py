@@ -0,0 +1,62 @@
+# File: posts/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.archives import remember_archive_month, update_archive_counts
+from core.html_pipeline import is_source_saved, render_translation
+from core.page_cache import purge_instance, purge_translation_master
+from .models import Post
+
+PostTranslation = Post._parler_meta.root_model
+
+
+@receiver(pre_save, sender=PostTranslation)
+def render_post_content(sender, instance, update_fields=None, **kwargs):
+    """
+    ⚙️ Stores the transformed and sanitized content HTML of this translation,
+    so templates don't have to parse it on every request.
+    """
+    if is_source_saved(update_fields):
+        render_translation(instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_archive_month(sender, instance, update_fields=None, **kwargs):
+    """ 📅 The month the post was archived in before this save (core/archives.py). """
+    remember_archive_month(instance, update_fields)
+
+
+@receiver(post_save, sender=Post)
+def update_archive_on_post_save(sender, instance, update_fields=None, **kwargs):
+    """ 📅 Counts the months the post left and joined again. """
+    update_archive_counts(instance, update_fields=update_fields)
+
+
+@receiver(post_delete, sender=Post)
+def update_archive_on_post_delete(sender, instance, **kwargs):
+    update_archive_counts(instance, deleted=True)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def purge_page_cache_on_post_change(sender, instance, update_fields=None, **kwargs):
+    """
+    ✨ Invalidates every cached page that shows this post: its detail page,
+    the post lists and every page with a posts widget.
+    """
+    purge_instance(instance, update_fields=update_fields)
+
+
+@receiver([post_save, post_delete], sender=PostTranslation)
+def purge_page_cache_on_post_translation_change(sender, instance, **kwargs):
+    """
+    🌐 Parler saves translations after the post itself, so we purge again
+    once the translated title/slug/content are stored.
+    """
+    purge_translation_master(instance)
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def purge_page_cache_on_post_categories_change(sender, instance, action, **kwargs):
+    """ 📂 Category listings change when categories are added or removed. """
+    if action.startswith('post_') and isinstance(instance, Post):
+        purge_instance(instance)
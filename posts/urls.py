@@ -1,6 +1,6 @@
 # File: posts/urls.py
 from django.urls import path
-from . import views
+from . import feeds, views
 
 app_name = "posts"
 
@@ -9,6 +9,18 @@ urlpatterns = [
     
     # URL con fecha + slug
     path('<int:year>/<int:month>/<int:day>/<slug:slug>/', views.post_detail_view, name='post_detail'),
+    # Archivo por fechas: /posts/2025/, /posts/2025/6/, /posts/2025/6/15/
+    path('<int:year>/', views.post_archive_view, name='archive_year'),
+    path('<int:year>/<int:month>/', views.post_archive_view, name='archive_month'),
+    path('<int:year>/<int:month>/<int:day>/', views.post_archive_view, name='archive_day'),
     path('category/<slug:category_slug>/', views.posts_by_category_view, name='posts_by_category'),
     path('tag/<slug:tag_slug>/', views.posts_by_tag_view, name='posts_by_tag'),
+
+    # Feeds RSS y Atom
+    path('feed/', feeds.LatestPostsFeed(), name='feed'),
+    path('feed/atom/', feeds.AtomLatestPostsFeed(), name='feed_atom'),
+    path('category/<slug:category_slug>/feed/', feeds.CategoryPostsFeed(), name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/', feeds.AtomCategoryPostsFeed(), name='category_feed_atom'),
+    path('tag/<slug:tag_slug>/feed/', feeds.TagPostsFeed(), name='tag_feed'),
+    path('tag/<slug:tag_slug>/feed/atom/', feeds.AtomTagPostsFeed(), name='tag_feed_atom'),
 ]
@@ -1,9 +1,10 @@
 # File: posts/views.py
 
 import logging
-from django.db.models import F
+from django.db.models import Max
 from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render
+from django.utils.formats import date_format
 from django.utils.translation import gettext_lazy as _, gettext, get_language
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.urls import reverse
@@ -17,15 +18,51 @@ from tags.models import Tag
 from site_settings.models import SiteConfiguration
 from django.conf import settings
 from django.db.models import Q
+from core.archives import archive_range_or_404, archive_url, get_archive
+from core.conditional import conditional_content
+from core.static_export import is_export_request
+from core.view_counting import count_view
+from core.page_cache import add_surrogate_keys, list_tag, model_object_tag, object_tag, track_view
 
 logger = logging.getLogger(__name__)
 
+def _post_list_validators(request):
+    """ ⚡ Validators for the posts list: any post change or a newer post. """
+    last_updated = Post.objects.filter(status='published').aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Post)], last_updated
+
+def _post_detail_validators(request, year, month, day, slug):
+    """
+    ⚡ Validators for a post detail page from one lightweight query.
+    Approved comments purge the post tag, so they change the validators too.
+    """
+    row = Post.objects.filter(
+        translations__slug=slug,
+        published_date__year=year,
+        published_date__month=month,
+        published_date__day=day,
+        status='published'
+    ).values_list('pk', 'updated_at').first()
+    if row is None:
+        return None
+    pk, updated_at = row
+    return [model_object_tag(Post, pk), list_tag(Category), list_tag(Tag)], updated_at
+
+def _posts_by_category_validators(request, category_slug):
+    lookup = Q()
+    for lang_code, _ in settings.LANGUAGES:
+        lookup |= Q(**{f"categories__slug_{lang_code}": category_slug})
+    last_updated = Post.objects.filter(lookup, status='published').aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Category), list_tag(Post)], last_updated
+
+@conditional_content(_post_list_validators)
 def post_list_view(request):
     """
     📚 Lists all published posts with pagination and breadcrumbs.
     """
     # 1. Get all published posts
-    all_posts = Post.objects.filter(status='published').order_by('-published_date')
+    all_posts = Post.objects.filter(status='published').for_list().order_by('-published_date')
+    add_surrogate_keys(request, list_tag(Post))
 
     # 2. Determine posts per page
     try:
@@ -59,6 +96,59 @@ def post_list_view(request):
         "breadcrumbs": breadcrumbs
     })
 
+def _post_archive_validators(request, year, month=None, day=None):
+    """ ⚡ Validators for a date archive: any post change or a newer post of the period. """
+    start, end = archive_range_or_404(year, month, day)
+    last_updated = Post.objects.filter(status='published', published_date__gte=start, published_date__lt=end) \
+        .aggregate(Max('updated_at'))['updated_at__max']
+    return [list_tag(Post)], last_updated
+
+@conditional_content(_post_archive_validators)
+def post_archive_view(request, year, month=None, day=None):
+    """
+    📅 Lists the published posts of a year, a month or a day, with pagination.
+    The years and months to navigate come from the stored counts (core/archives.py).
+    """
+    # 1. Posts of the period (404 for dates that don't exist, like 2025/2/30)
+    start, end = archive_range_or_404(year, month, day)
+    all_posts = Post.objects.filter(
+        status='published', published_date__gte=start, published_date__lt=end
+    ).for_list().order_by('-published_date')
+    add_surrogate_keys(request, list_tag(Post))
+
+    # 2. Paginate
+    try:
+        posts_per_page = SiteConfiguration.get_solo().blog_items_per_page
+    except SiteConfiguration.DoesNotExist:
+        posts_per_page = 6
+        logger.warning("⚠️ SiteConfiguration missing. Using default of 6 posts per page.")
+    paginator = Paginator(all_posts, posts_per_page)
+    if paginator.count == 0:
+        raise Http404("No posts published in this period.")
+    posts = paginator.get_page(request.GET.get('page'))
+
+    # 3. Breadcrumbs: Home > Posts > 2025 > June 2025 > June 14, 2025
+    period = start.date()
+    breadcrumbs = [
+        {"url": "/", "label": _("Home")},
+        {"url": reverse("posts:post_list"), "label": _("Posts")},
+        {"url": archive_url('posts', year), "label": str(year)},
+    ]
+    if month is not None:
+        breadcrumbs.append({"url": archive_url('posts', year, month), "label": date_format(period, 'YEAR_MONTH_FORMAT')})
+    if day is not None:
+        breadcrumbs.append({"url": "", "label": date_format(period, 'DATE_FORMAT')})
+    breadcrumbs[-1]["url"] = ""
+
+    return render(request, 'posts/post_archive.html', {
+        "posts": posts,
+        "breadcrumbs": breadcrumbs,
+        "archive_label": breadcrumbs[-1]["label"],
+        "archive": get_archive('posts'),
+        "archive_year": year,
+        "archive_month": month,
+    })
+
 def get_category_depth(category):
     depth = 0
     current = category
@@ -86,13 +176,14 @@ def build_category_breadcrumbs(category):
         current = current.parent
     return reversed(path)
 
+@conditional_content(_post_detail_validators)
 def post_detail_view(request, year, month, day, slug):
     """
     🌐 Displays a single multilingual post, handles view count increment,
     comment submission, and breadcrumb generation including categories.
     """
     language = get_language()
-    logger.debug(f"🌐 Language: {language} | Slug: {slug} | 📅 {year}-{month}-{day}")
+    logger.debug("🌐 Language: %s | Slug: %s | 📅 %s-%s-%s", language, slug, year, month, day)
 
     # 1. Retrieve post in current language
     post = get_object_or_404(
@@ -104,9 +195,13 @@ def post_detail_view(request, year, month, day, slug):
         status='published'
     )
 
-    # 2. Increment view count
-    Post.objects.filter(pk=post.pk).update(views_count=F('views_count') + 1)
-    post.refresh_from_db()
+    # 2. Increment view count (not when pre-rendering the static site; bots and
+    #    repeated views of the same visitor don't count, see core/view_counting.py)
+    if not is_export_request(request):
+        if count_view(request, post._meta.label, post.pk):
+            post.refresh_from_db()
+        track_view(request, post)
+    add_surrogate_keys(request, object_tag(post), list_tag(Category), list_tag(Tag))
 
     # 3. Retrieve site config for comment approval
     try:
@@ -144,7 +239,7 @@ def post_detail_view(request, year, month, day, slug):
 
             return HttpResponseRedirect(f"{post.get_absolute_url()}#comments-section")
         else:
-            logger.warning(f"❌ Invalid comment submission: {comment_form.errors.as_json()}")
+            logger.warning("❌ Invalid comment submission: %s", comment_form.errors.as_json())
     else:
         comment_form = CommentForm(user=request.user)
 
@@ -171,6 +266,7 @@ def post_detail_view(request, year, month, day, slug):
         'translatable_object': post,
     })
 
+@conditional_content(_posts_by_category_validators)
 def posts_by_category_view(request, category_slug):
     """
     📂 View para listar los posts publicados de una categoría específica.
@@ -184,7 +280,8 @@ def posts_by_category_view(request, category_slug):
         lookup |= Q(**{f"slug_{lang_code}": category_slug})
 
     category = get_object_or_404(Category, lookup)
-    all_posts = Post.objects.filter(status='published', categories=category).order_by('-published_date')
+    all_posts = Post.objects.filter(status='published', categories=category).for_list().order_by('-published_date')
+    add_surrogate_keys(request, list_tag(Category), list_tag(Post))
 
     try:
         config = SiteConfiguration.get_solo()
@@ -203,7 +300,7 @@ def posts_by_category_view(request, category_slug):
     except EmptyPage:
         posts = paginator.page(paginator.num_pages)
 
-    fallback_posts = Post.objects.language(language).filter(status='published') \
+    fallback_posts = Post.objects.language(language).filter(status='published').for_list() \
                       .exclude(pk__in=[p.pk for p in posts]) \
                       .order_by('-published_date')[:3]
     
@@ -229,12 +326,13 @@ def posts_by_tag_view(request, tag_slug):
     """
     language = get_language()
     tag = get_object_or_404(Tag, slug=tag_slug)
+    add_surrogate_keys(request, object_tag(tag), list_tag(Post))
 
     # Posts that have the selected tag
     all_tagged_posts = Post.objects.language(language).filter(
         tags=tag,
         status='published'
-    ).order_by('-published_date')
+    ).for_list().order_by('-published_date')
 
     # Pagination config
     try:
@@ -255,7 +353,7 @@ def posts_by_tag_view(request, tag_slug):
         posts = paginator.page(paginator.num_pages)
 
     # Fallback: show other recent posts if none found in this tag
-    fallback_posts = Post.objects.language(language).filter(status='published') \
+    fallback_posts = Post.objects.language(language).filter(status='published').for_list() \
         .exclude(pk__in=[p.pk for p in posts]) \
         .order_by('-published_date')[:3]
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PublicationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'publications'
+
+    def ready(self):
+        # Connects the signals that invalidate the page cache.
+        import publications.signals
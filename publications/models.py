@@ -8,7 +8,8 @@ from django.urls import reverse
 from django.utils import timezone
 from categories.models import Category
 from tinymce.models import HTMLField
-from django.utils.translation import get_language
+from django.utils.translation import get_language, override
+from core.html_pipeline import get_rendered_html
 
 User = get_user_model()
 
@@ -23,6 +24,13 @@ class Publication(TranslatableModel):
         slug=models.SlugField(max_length=250, unique=False, verbose_name=_("Slug")),
         abstract=models.TextField(blank=True, verbose_name=_("Abstract")),
         content=HTMLField(verbose_name=_("Full Content")),
+        # ⚙️ Render-on-save HTML (see core/html_pipeline.py)
+        content_rendered=models.TextField(blank=True, editable=False, verbose_name=_("Rendered Content")),
+        content_pipeline_version=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Content Pipeline Version")),
+        # ⚙️ Plain-text fields derived from the content (see core/derived_fields.py)
+        content_text=models.TextField(blank=True, editable=False, verbose_name=_("Plain Text Content")),
+        excerpt=models.CharField(max_length=255, blank=True, editable=False, verbose_name=_("Excerpt")),
+        reading_time=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("Reading Time (minutes)")),
         meta_title=models.CharField(max_length=70, blank=True, null=True, verbose_name=_("Meta Title")),
         meta_description=models.CharField(max_length=160, blank=True, null=True, verbose_name=_("Meta Description")),
     )
@@ -58,6 +66,24 @@ class Publication(TranslatableModel):
         return reverse('publications:publication_detail', kwargs={
             'slug': self.safe_translation_getter("slug", any_language=True)
         })
+
+    @property
+    def rendered_content(self):
+        """ ⚙️ The content HTML as transformed at save time (see core/html_pipeline.py). """
+        return get_rendered_html(
+            self.safe_translation_getter('content', any_language=True),
+            self.safe_translation_getter('content_rendered', any_language=True),
+            self.safe_translation_getter('content_pipeline_version', any_language=True),
+        )
+
+    def get_absolute_url_for_language(self, language_code):
+        """
+        🌐 URL of this publication in the given language (prefix and translated slug).
+        """
+        with override(language_code):
+            return reverse('publications:publication_detail', kwargs={
+                'slug': self.safe_translation_getter("slug", language_code=language_code, any_language=True)
+            })
     
     def get_authors_display(self):
         return ", ".join([a.get_full_name() or a.username for a in self.authors.all()])
@@ -0,0 +1,32 @@
+# File: publications/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core.html_pipeline import is_source_saved, render_translation
+from core.page_cache import purge_instance, purge_translation_master
+from .models import Publication
+
+PublicationTranslation = Publication._parler_meta.root_model
+
+
+@receiver(pre_save, sender=PublicationTranslation)
+def render_publication_content(sender, instance, update_fields=None, **kwargs):
+    """
+    ⚙️ Stores the transformed and sanitized content HTML of this translation.
+    """
+    if is_source_saved(update_fields):
+        render_translation(instance)
+
+
+@receiver([post_save, post_delete], sender=Publication)
+def purge_page_cache_on_publication_change(sender, instance, update_fields=None, **kwargs):
+    """
+    📘 Invalidates the cached detail page of a publication when it changes.
+    """
+    purge_instance(instance, update_fields=update_fields)
+
+
+@receiver([post_save, post_delete], sender=PublicationTranslation)
+def purge_page_cache_on_publication_translation_change(sender, instance, **kwargs):
+    """ 🌐 Translations are saved after the publication itself. """
+    purge_translation_master(instance)
@@ -2,13 +2,28 @@
 from django.shortcuts import get_object_or_404, render
 from django.utils.translation import get_language
 from .models import Publication
+from core.conditional import conditional_content
+from core.page_cache import add_surrogate_keys, model_object_tag, object_tag
 
+def _publication_validators(request, slug):
+    """
+    ⚡ Conditional GET validators from one lightweight query.
+    """
+    row = Publication.objects.filter(translations__slug=slug, is_published=True) \
+                             .values_list('pk', 'updated_at').first()
+    if row is None:
+        return None
+    pk, updated_at = row
+    return [model_object_tag(Publication, pk)], updated_at
+
+@conditional_content(_publication_validators)
 def publication_detail_view(request, slug):
     """
     📘 Shows the detail of a single scientific publication.
     """
     language = get_language()
     publication = get_object_or_404(Publication, translations__slug=slug, is_published=True)
+    add_surrogate_keys(request, object_tag(publication))
 
     context = {
         "publication": publication,
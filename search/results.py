@@ -0,0 +1,263 @@
+# File: search/results.py
+"""
+Cached search results for search_results_view, with their facets.
+
+A search scans the titles and texts of the pages, blog posts, posts and
+publications. Its result is stored as one list of hits per content type,
+already in display order, and each hit carries its facet values:
+
+    (pk, year, (category ids), (tag slugs))
+
+The entry also holds the facet counts of the whole result and the labels of
+its categories and tags. It's keyed by the normalized query and the language,
+and by the page cache versions of the list tags of the searched models and
+of the categories and tags: publishing, editing or deleting any of them bumps
+a version, and the next search for the query runs again.
+
+The filters (type, category, tag, year) and their counts are applied to the
+cached hits in Python, in a single pass: no GROUP BY per facet, and repeated
+searches only load the objects shown on the current page, by id, with a
+highlighted snippet of their plain text (add_snippets()).
+"""
+import hashlib
+import logging
+import unicodedata
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import ExtractYear
+from django.utils.translation import get_language
+from parler.utils.i18n import get_active_language_choices
+from taggit.models import Tag as BlogTag, TaggedItem
+
+from blog.models import Post as BlogPost
+from categories.models import Category
+from core.page_cache import get_tag_versions, list_tag
+from pages.models import Page
+from posts.models import Post
+from publications.models import Publication
+from tags.models import Tag, TaggedPost
+from .snippets import highlight, make_snippet
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TIMEOUT = 6 * 3600
+
+# Content types, in the order of the results page.
+RESULT_TYPES = ('page', 'blog', 'post', 'publication')
+FACETS = ('type', 'category', 'tag', 'year')
+
+
+def clean_query(query):
+    """ The query as searched: surrounding and repeated whitespace removed. """
+    return ' '.join(query.split())
+
+
+def normalize_query(query):
+    """
+    The form of a query in the cache key: two queries with the same form
+    find the same results. icontains ignores case and, on MySQL (utf8mb4
+    collations), accents too; SQLite's LIKE only ignores the case of ASCII
+    letters, so there the other characters are kept as typed.
+    """
+    query = clean_query(query)
+    if connection.vendor == 'mysql':
+        query = unicodedata.normalize('NFKD', query.lower())
+        return ''.join(char for char in query if not unicodedata.combining(char))
+    return ''.join(char.lower() if char.isascii() else char for char in query)
+
+
+# --- Running a search ---
+
+def _text_query(query, *fields):
+    return reduce(or_, (Q(**{f'{field}__icontains': query}) for field in fields))
+
+
+def _parler_search(model, query, *fields):
+    """
+    Objects whose translation in the active language (or its fallback, when
+    missing: the one lists show) matches `query` in any of `fields`.
+    """
+    language, *fallbacks = get_active_language_choices(get_language())
+    translation_model = model._parler_meta.root_model
+    has_active_language = translation_model.objects.filter(master=OuterRef('master'), language_code=language)
+    translations = translation_model.objects.filter(
+        Q(language_code=language) | Q(~Exists(has_active_language), language_code__in=fallbacks),
+        _text_query(query, *fields),
+    )
+    return model.objects.filter(pk__in=translations.values('master_id'))
+
+
+def _search_querysets(query):
+    """ {type: queryset of the matching objects, in display order}. """
+    return {
+        'page': Page.objects.filter(_text_query(query, 'title', 'content_text'), status='published')
+                .order_by('importance_order', 'title'),
+        'blog': BlogPost.objects.filter(_text_query(query, 'title', 'content_text'), status='published')
+                .order_by('-published_date'),
+        'post': _parler_search(Post, query, 'title', 'content_text').filter(status='published')
+                .order_by('-published_date'),
+        'publication': _parler_search(Publication, query, 'title', 'abstract', 'content_text')
+                       .filter(is_published=True).order_by('-publication_date'),
+    }
+
+
+def _m2m_values(manager_field, queryset, target):
+    """ {object pk: [target values]} through an M2M table, filtered by a subquery. """
+    through = manager_field.remote_field.through
+    source = f'{manager_field.m2m_field_name()}_id'
+    values = {}
+    rows = through.objects.filter(**{f'{source}__in': queryset.values('pk')}).values_list(source, target)
+    for pk, value in rows:
+        values.setdefault(pk, []).append(value)
+    return values
+
+
+def _facet_values(kind, queryset):
+    """ {pk: ([category ids], [tag slugs])} of the hits of one type. """
+    model = queryset.model
+    categories = _m2m_values(model._meta.get_field('categories'), queryset, 'category_id')
+    if kind == 'blog':
+        tag_rows = TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(BlogPost), object_id__in=queryset.values('pk'),
+        ).values_list('object_id', 'tag__slug')
+    elif kind == 'post':
+        tag_rows = TaggedPost.objects.filter(post__in=queryset.values('pk')).values_list('post_id', 'tag__slug')
+    else:
+        tag_rows = ()
+    tags = {}
+    for pk, slug in tag_rows:
+        tags.setdefault(pk, []).append(slug)
+    return {pk: (categories.get(pk, ()), tags.get(pk, ())) for pk in categories.keys() | tags.keys()}
+
+
+def _run_search(query):
+    hits = {}
+    for kind, queryset in _search_querysets(query).items():
+        facet_values = _facet_values(kind, queryset)
+        date_field = {'page': None, 'publication': 'publication_date'}.get(kind, 'published_date')
+        if date_field:
+            rows = queryset.annotate(year=ExtractYear(date_field)).values_list('pk', 'year').distinct()
+        else:
+            rows = ((pk, None) for pk in queryset.values_list('pk', flat=True).distinct())
+        hits[kind] = []
+        for pk, year in rows:
+            categories, tags = facet_values.get(pk, ((), ()))
+            hits[kind].append((pk, year, tuple(categories), tuple(tags)))
+    return hits
+
+
+def _facet_labels(counts):
+    """ Names of the categories and tags in the counts, in the active language. """
+    category_ids = list(counts['category'])
+    tag_slugs = list(counts['tag'])
+    labels = {
+        'category': {category.pk: category.name for category in Category.objects.filter(pk__in=category_ids)},
+        'tag': {tag.slug: tag.name for tag in BlogTag.objects.filter(slug__in=tag_slugs)},
+    }
+    for tag in Tag.objects.filter(slug__in=tag_slugs).prefetch_related('translations'):
+        labels['tag'][tag.slug] = str(tag)
+    return labels
+
+
+# --- Facets over the cached hits ---
+
+def filter_hits(hits, filters):
+    """ The hits matching every filter: {'type': ..., 'category': id, 'tag': slug, 'year': int}. """
+    kind = filters.get('type')
+    category = filters.get('category')
+    tag = filters.get('tag')
+    year = filters.get('year')
+    return {
+        result_type: [
+            hit for hit in rows
+            if (category is None or category in hit[2]) and (tag is None or tag in hit[3])
+            and (year is None or hit[1] == year)
+        ] if kind in (None, result_type) else []
+        for result_type, rows in hits.items()
+    }
+
+
+def count_facets(hits):
+    """ {facet: Counter} of a set of hits, in one pass. """
+    counts = {facet: Counter() for facet in FACETS}
+    for result_type, rows in hits.items():
+        counts['type'][result_type] += len(rows)
+        for pk, year, categories, tags in rows:
+            if year:
+                counts['year'][year] += 1
+            counts['category'].update(categories)
+            counts['tag'].update(tags)
+    return counts
+
+
+def get_search_tags():
+    """ Page cache tags of the searched models and of the facet labels. """
+    return [list_tag(model) for model in (Page, BlogPost, Post, Publication, Category, Tag, BlogTag)]
+
+
+def search(query):
+    """
+    The cached search of `query`: {'hits': {type: [hits]}, 'counts': {facet:
+    Counter}, 'labels': {'category': {id: name}, 'tag': {slug: label}}}.
+    """
+    query = clean_query(query)
+    if not query:
+        return {'hits': {kind: [] for kind in RESULT_TYPES}, 'counts': count_facets({}), 'labels': {}}
+
+    versions = get_tag_versions(get_search_tags())
+    state = '|'.join([normalize_query(query), get_language() or '', *sorted(versions.values())])
+    cache_key = f'search:results:{hashlib.md5(state.encode("utf-8")).hexdigest()}'
+    entry = cache.get(cache_key)
+    if entry is None:
+        hits = _run_search(query)
+        counts = count_facets(hits)
+        entry = {'hits': hits, 'counts': counts, 'labels': _facet_labels(counts)}
+        cache.set(cache_key, entry, SEARCH_CACHE_TIMEOUT)
+        logger.debug("Search results cached for %r: %s", query, dict(counts['type']))
+    return entry
+
+
+def hydrate_page(page_obj, queryset):
+    """
+    Replaces the hits of a Paginator page with their objects (from
+    `queryset`, in the same order), in a single query.
+    """
+    ids = [hit[0] for hit in page_obj.object_list]
+    objects = queryset.in_bulk(ids) if ids else {}
+    page_obj.object_list = [objects[pk] for pk in ids if pk in objects]
+    return page_obj
+
+
+def add_snippets(page_obj, kind, query):
+    """
+    Sets `search_title` and `search_snippet` (highlighted, see
+    search/snippets.py) on the objects of a hydrated results page. Only the
+    plain text of these objects is read: for pages and blog posts one query
+    of their content_text (in the active language), for the parler models
+    the translation they already have prefetched.
+    """
+    query = clean_query(query)
+    objects = page_obj.object_list
+    if not query or not objects:
+        return page_obj
+    if kind in ('page', 'blog'):
+        texts = dict(type(objects[0]).objects.filter(pk__in=[obj.pk for obj in objects])
+                     .values_list('pk', 'content_text'))
+    else:
+        # Publications are also searched by their abstract, which comes first.
+        fields = ('abstract', 'content_text') if kind == 'publication' else ('content_text',)
+        texts = {
+            obj.pk: ' '.join(filter(None, (obj.safe_translation_getter(field, any_language=True) for field in fields)))
+            for obj in objects
+        }
+    for obj in objects:
+        title = obj.title if kind in ('page', 'blog') else obj.safe_translation_getter('title', any_language=True)
+        obj.search_title = highlight(title, query)
+        obj.search_snippet = make_snippet(texts.get(obj.pk), query)
+    return page_obj
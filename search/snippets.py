@@ -0,0 +1,104 @@
+# File: search/snippets.py
+"""
+Highlighted excerpts of the search results.
+
+They're cut from the plain text stored with each translation at save time
+(content_text, see core/derived_fields.py), never from the content HTML:
+no markup to skip and no tags to break. Finding the query is a str.find()
+over a folded copy of the text (lowercase, without accents) of the same
+length, so the positions found are also valid in the original text; only
+the first MAX_SCAN_LENGTH characters are scanned, which bounds the cost of
+a hit whatever the length of its text.
+"""
+import unicodedata
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SNIPPET_LENGTH = 240
+MAX_SCAN_LENGTH = 50_000
+# Highlighted occurrences per text (a short query can match everywhere).
+MAX_MATCHES = 20
+
+
+def _build_fold_table():
+    """ Latin letters with diacritics -> their base letter ('á' -> 'a', 'Ç' -> 'C'). """
+    table = {}
+    for code in range(0xC0, 0x250):
+        base = unicodedata.normalize('NFKD', chr(code))[0]
+        if base != chr(code) and base.isascii():
+            table[code] = base
+    return table
+
+
+_FOLD_TABLE = _build_fold_table()
+
+
+def fold(text):
+    """ Lowercase `text` without accents, keeping its length (and so its positions). """
+    folded = text.translate(_FOLD_TABLE).lower()
+    if len(folded) != len(text):
+        # A few characters lowercase to two ('İ'): those are kept as they are.
+        folded = ''.join(char if len(char.lower()) != 1 else char.lower() for char in text.translate(_FOLD_TABLE))
+    return folded
+
+
+def find_matches(text, query, start=0, end=None):
+    """ [(start, end)] of the occurrences of `query` in text[start:end], ignoring case and accents. """
+    needle = fold(query)
+    if not needle:
+        return []
+    end = len(text) if end is None else end
+    haystack = fold(text[start:end])
+    matches = []
+    position = haystack.find(needle)
+    while position != -1 and len(matches) < MAX_MATCHES:
+        matches.append((start + position, start + position + len(needle)))
+        position = haystack.find(needle, position + len(needle))
+    return matches
+
+
+def _render(text, matches, start, end):
+    """ Escaped text[start:end] with the matches in <mark>. """
+    parts = []
+    position = start
+    for match_start, match_end in matches:
+        if match_start < position or match_end > end:
+            continue
+        parts.append(escape(text[position:match_start]))
+        parts.append('<mark>%s</mark>' % escape(text[match_start:match_end]))
+        position = match_end
+    parts.append(escape(text[position:end]))
+    return ''.join(parts)
+
+
+def highlight(text, query):
+    """ The whole `text` (a title) with the occurrences of `query` highlighted. """
+    text = text or ''
+    return mark_safe(_render(text, find_matches(text, query), 0, len(text)))
+
+
+def make_snippet(text, query, length=SNIPPET_LENGTH):
+    """
+    About `length` characters of `text` around the first occurrence of
+    `query` (or its beginning, when the match was in the title), cut at
+    spaces, with the occurrences highlighted.
+    """
+    text = text or ''
+    if not text:
+        return ''
+    scan_end = min(len(text), MAX_SCAN_LENGTH)
+    first = find_matches(text, query, 0, scan_end)[:1]
+    start = 0
+    if first and first[0][1] > length:
+        # Some context before the match, starting at a word.
+        start = max(0, first[0][0] - length // 3)
+        space = text.find(' ', start, first[0][0])
+        start = space + 1 if space != -1 else start
+    end = min(len(text), start + length)
+    if end < len(text):
+        space = text.rfind(' ', start, end)
+        end = space if space > start else end
+    matches = find_matches(text, query, start, end)
+    snippet = _render(text, matches, start, end)
+    return mark_safe(('… ' if start else '') + snippet + (' …' if end < len(text) else ''))
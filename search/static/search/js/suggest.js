@@ -0,0 +1,81 @@
+// File: search/static/search/js/suggest.js
+// Suggestions under the search box, from the suggest endpoint (search/suggest.py).
+
+document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("input[data-suggest-url]").forEach(function (input) {
+        const menu = document.getElementById(input.dataset.suggestMenu);
+        const minLength = 2;
+        let timer = null;
+        let controller = null;
+
+        function hide() {
+            menu.classList.remove("show");
+            menu.replaceChildren();
+        }
+
+        function show(suggestions) {
+            menu.replaceChildren();
+            suggestions.forEach(function (suggestion) {
+                const link = document.createElement("a");
+                link.className = "dropdown-item";
+                link.href = suggestion.url;
+                link.textContent = suggestion.label;
+                const kind = document.createElement("small");
+                kind.className = "text-muted ms-2";
+                kind.textContent = input.dataset["kind" + suggestion.kind.charAt(0).toUpperCase() + suggestion.kind.slice(1)] || "";
+                link.appendChild(kind);
+                menu.appendChild(link);
+            });
+            menu.classList.toggle("show", suggestions.length > 0);
+        }
+
+        input.addEventListener("input", function () {
+            clearTimeout(timer);
+            const query = input.value.trim();
+            if (query.length < minLength) {
+                hide();
+                return;
+            }
+            // Waits for a pause in the typing, and cancels the previous request.
+            timer = setTimeout(function () {
+                if (controller) {
+                    controller.abort();
+                }
+                controller = new AbortController();
+                fetch(input.dataset.suggestUrl + "?q=" + encodeURIComponent(query), {signal: controller.signal})
+                    .then(function (response) { return response.ok ? response.json() : {suggestions: []}; })
+                    .then(function (data) { show(data.suggestions); })
+                    .catch(function () {});
+            }, 150);
+        });
+
+        input.addEventListener("keydown", function (event) {
+            if (event.key === "Escape") {
+                hide();
+            } else if (event.key === "ArrowDown" && menu.firstChild) {
+                event.preventDefault();
+                menu.firstChild.focus();
+            }
+        });
+
+        menu.addEventListener("keydown", function (event) {
+            const item = document.activeElement;
+            if (event.key === "ArrowDown" && item.nextSibling) {
+                event.preventDefault();
+                item.nextSibling.focus();
+            } else if (event.key === "ArrowUp") {
+                event.preventDefault();
+                (item.previousSibling || input).focus();
+            } else if (event.key === "Escape") {
+                hide();
+                input.focus();
+            }
+        });
+
+        document.addEventListener("click", function (event) {
+            if (!menu.contains(event.target) && event.target !== input) {
+                hide();
+            }
+        });
+    });
+});
@@ -0,0 +1,289 @@
+# File: search/suggest.py
+"""
+Suggestions for the search box (search/views.py suggest_view), answered
+from memory, without touching the database.
+
+Each worker builds, the first time it's asked, one PrefixIndex per language
+with the titles of the published content, categories and tags. The index is
+a sorted list of keys, one per word of each title (so "art" finds "Modern
+Art"); a prefix lookup is a bisect into that list. The short prefixes match
+too many keys for that: their first suggestions are stored when the index is
+built.
+
+An index belongs to a version of the page cache tags of its models: when
+content is published, edited or deleted its list tag is purged, and the next
+request rebuilds the index. The tag versions are checked at most every
+VERSION_CHECK_INTERVAL seconds. While one thread rebuilds, the others keep
+answering from the previous index.
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import namedtuple
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import translation
+from modeltranslation.utils import build_localized_fieldname, resolution_order
+from parler.utils.i18n import get_active_language_choices
+
+from core.feeds import url_template
+from core.page_cache import get_tag_versions, list_tag
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_LIMIT = 8
+MIN_PREFIX_LENGTH = 2
+# Prefixes up to this length are answered from the stored suggestions.
+SHORT_PREFIX_LENGTH = 3
+VERSION_CHECK_INTERVAL = 2  # seconds
+
+Suggestion = namedtuple('Suggestion', ['label', 'url', 'kind'])
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """ Lowercase words without accents or punctuation: 'Café-Bar' -> 'cafe bar'. """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_NON_WORD.split(text.lower())).strip()
+
+
+class PrefixIndex:
+    """
+    Suggestions in order of relevance; a query returns the first ones (in
+    that order) with a word starting with the query.
+    """
+
+    def __init__(self, suggestions, stored_limit=SUGGEST_LIMIT):
+        self.suggestions = suggestions
+        self.stored_limit = stored_limit
+        keys = []
+        # {short prefix: positions of its first suggestions}, filled in order of relevance.
+        self._short_prefixes = {}
+        for position, suggestion in enumerate(suggestions):
+            words = normalize(suggestion.label).split()
+            # One key per word: the title from that word on, so that a query
+            # of several words also matches in the middle of a title.
+            title_keys = [' '.join(words[start:]) for start in range(len(words))]
+            keys.extend((key, position) for key in title_keys)
+            prefixes = {
+                key[:length] for key in title_keys
+                for length in range(MIN_PREFIX_LENGTH, SHORT_PREFIX_LENGTH + 1) if len(key) >= length
+            }
+            for prefix in prefixes:
+                positions = self._short_prefixes.setdefault(prefix, [])
+                if len(positions) < stored_limit:
+                    positions.append(position)
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._positions = [position for _, position in keys]
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def search(self, query, limit=SUGGEST_LIMIT):
+        prefix = normalize(query)
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        if len(prefix) <= SHORT_PREFIX_LENGTH and limit <= self.stored_limit:
+            positions = self._short_prefixes.get(prefix, ())[:limit]
+        else:
+            # Longer prefixes only match a few keys.
+            start = bisect.bisect_left(self._keys, prefix)
+            end = bisect.bisect_left(self._keys, prefix + '\uffff', start)
+            positions = heapq.nsmallest(limit, set(self._positions[start:end]))
+        return [self.suggestions[position] for position in positions]
+
+
+# --- Building the index of a language ---
+
+def _modeltranslation_rows(queryset, language, *fields):
+    """
+    Yields (pk, {field: value}) with the value of each translated field in
+    `language`, or in its modeltranslation fallback when empty. The slug has
+    no fallback: the views look it up in the active language only.
+    """
+    languages = resolution_order(language)
+    columns = [build_localized_fieldname(field, code) for field in fields for code in languages]
+    for row in queryset.values_list('pk', *columns):
+        values = iter(row[1:])
+        translated = {}
+        for field in fields:
+            candidates = [next(values) for _ in languages]
+            if field == 'slug':
+                candidates = candidates[:1]
+            translated[field] = next((value for value in candidates if value), '')
+        yield row[0], translated
+
+
+def _parler_rows(model, queryset, language, *fields):
+    """ Same as _modeltranslation_rows() for a parler model, with its fallbacks. """
+    languages = get_active_language_choices(language)
+    translation_model = model._parler_meta.root_model
+    rows = translation_model.objects.filter(
+        master__in=queryset.values('pk'), language_code__in=languages,
+    ).values_list('master_id', 'language_code', *fields)
+    found = {}
+    for master_id, language_code, *values in rows:
+        found.setdefault(master_id, {})[language_code] = values
+    for master_id, by_language in found.items():
+        values = next(by_language[code] for code in languages if code in by_language)
+        yield master_id, dict(zip(fields, values))
+
+
+def _content_suggestions(language):
+    """ Published content, newest first (pages by importance, before the rest). """
+    from blog.models import Post as BlogPost
+    from pages.models import Page
+    from posts.models import Post
+    from publications.models import Publication
+
+    page_url = url_template('pages:page_detail', 'slug')
+    pages = Page.objects.filter(status='published').order_by('importance_order', 'title')
+    suggestions = [
+        Suggestion(values['title'], page_url.format(slug=values['slug']), 'page')
+        for _, values in _modeltranslation_rows(pages, language, 'title', 'slug')
+        if values['title'] and values['slug']
+    ]
+
+    dated = []
+    blog_url = url_template('blog:post_detail', 'year', 'month', 'day', 'slug')
+    blog_posts = BlogPost.objects.filter(status='published')
+    dates = dict(blog_posts.values_list('pk', 'published_date'))
+    for pk, values in _modeltranslation_rows(blog_posts, language, 'title', 'slug'):
+        date = dates[pk]
+        if values['title'] and values['slug']:
+            url = blog_url.format(year=date.year, month=date.month, day=date.day, slug=values['slug'])
+            dated.append((date, Suggestion(values['title'], url, 'blog')))
+
+    post_url = url_template('posts:post_detail', 'year', 'month', 'day', 'slug')
+    posts = Post.objects.filter(status='published')
+    dates = dict(posts.values_list('pk', 'published_date'))
+    for pk, values in _parler_rows(Post, posts, language, 'title', 'slug'):
+        date = dates[pk]
+        url = post_url.format(year=date.year, month=date.month, day=date.day, slug=values['slug'])
+        dated.append((date, Suggestion(values['title'], url, 'post')))
+
+    publication_url = url_template('publications:publication_detail', 'slug')
+    publications = Publication.objects.filter(is_published=True)
+    dates = dict(publications.values_list('pk', 'publication_date'))
+    for pk, values in _parler_rows(Publication, publications, language, 'title', 'slug'):
+        # publication_date is a date: sorted with the posts as its first instant.
+        date = dates[pk]
+        dated.append((datetime(date.year, date.month, date.day, tzinfo=dt_timezone.utc), Suggestion(
+            values['title'], publication_url.format(slug=values['slug']), 'publication',
+        )))
+
+    dated.sort(key=lambda item: item[0], reverse=True)
+    return suggestions + [suggestion for _, suggestion in dated]
+
+
+def _taxonomy_suggestions(language):
+    """ Categories and tags, linked to their post lists. """
+    from categories.models import Category
+    from tags.models import Tag
+    from taggit.models import Tag as BlogTag
+
+    suggestions = []
+    # Same choice as Category.get_absolute_url(), without a query per category.
+    blog_categories = set(Category.objects.filter(blog_posts__isnull=False).values_list('pk', flat=True))
+    blog_category_url = url_template('blog:posts_by_category', 'slug')
+    page_category_url = url_template('pages:pages_by_category', 'slug')
+    categories = Category.objects.order_by('tree_id', 'lft')
+    for pk, values in _modeltranslation_rows(categories, language, 'name', 'slug'):
+        if values['slug']:
+            url = blog_category_url if pk in blog_categories else page_category_url
+            suggestions.append(Suggestion(values['name'], url.format(slug=values['slug']), 'category'))
+
+    tag_url = url_template('posts:posts_by_tag', 'slug')
+    slugs = dict(Tag.objects.values_list('pk', 'slug'))
+    for pk, values in _parler_rows(Tag, Tag.objects.all(), language, 'label'):
+        suggestions.append(Suggestion(values['label'], tag_url.format(slug=slugs[pk]), 'tag'))
+
+    blog_tag_url = url_template('blog:posts_by_tag', 'slug')
+    blog_tags = BlogTag.objects.order_by('name')
+    slugs = dict(blog_tags.values_list('pk', 'slug'))
+    for pk, values in _modeltranslation_rows(blog_tags, language, 'name'):
+        suggestions.append(Suggestion(values['name'], blog_tag_url.format(slug=slugs[pk]), 'tag'))
+    return suggestions
+
+
+def build_index(language):
+    started = time.perf_counter()
+    with translation.override(language):
+        suggestions = _taxonomy_suggestions(language) + _content_suggestions(language)
+    # The same title twice (a tag of both apps, a translated page...) is shown once.
+    seen = set()
+    unique = []
+    for suggestion in suggestions:
+        key = (normalize(suggestion.label), suggestion.kind)
+        if key[0] and key not in seen:
+            seen.add(key)
+            unique.append(suggestion)
+    index = PrefixIndex(unique)
+    logger.info("Suggestion index for '%s' built: %d titles in %.0f ms",
+                language, len(index), (time.perf_counter() - started) * 1000)
+    return index
+
+
+# --- Per-worker indexes ---
+
+def get_index_tags():
+    from blog.models import Post as BlogPost
+    from categories.models import Category
+    from pages.models import Page
+    from posts.models import Post
+    from publications.models import Publication
+    from tags.models import Tag
+    from taggit.models import Tag as BlogTag
+    return [list_tag(model) for model in (Page, BlogPost, Post, Publication, Category, Tag, BlogTag)]
+
+
+class _IndexEntry:
+    def __init__(self, versions, index, checked_at):
+        self.versions = versions
+        self.index = index
+        self.checked_at = checked_at
+
+
+_indexes = {}
+_build_lock = threading.Lock()
+
+
+def _current_versions():
+    return tuple(sorted(get_tag_versions(get_index_tags()).items()))
+
+
+def get_index(language):
+    entry = _indexes.get(language)
+    now = time.monotonic()
+    if entry is not None and now - entry.checked_at < VERSION_CHECK_INTERVAL:
+        return entry.index
+
+    versions = _current_versions()
+    if entry is not None and entry.versions == versions:
+        entry.checked_at = now
+        return entry.index
+
+    # Only one thread builds; with an older index at hand, the others don't wait.
+    if not _build_lock.acquire(blocking=entry is None):
+        return entry.index
+    try:
+        entry = _indexes.get(language)
+        if entry is None or entry.versions != versions:
+            entry = _IndexEntry(versions, build_index(language), now)
+            _indexes[language] = entry
+        return entry.index
+    finally:
+        _build_lock.release()
+
+
+def suggest(query, language=None, limit=SUGGEST_LIMIT):
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    return get_index(language).search(query, limit)
@@ -1,3 +1,204 @@
-from django.test import TestCase
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import translation
+
+from blog.models import Post as BlogPost
+from categories.models import Category
+from core.page_cache import list_tag, purge
+from core.testing import LocMemCacheTestCase
+from . import suggest
+from .results import count_facets, filter_hits, hydrate_page, normalize_query, search
+from .snippets import MAX_MATCHES, find_matches, fold, highlight, make_snippet
+
+
+class SnippetTests(SimpleTestCase):
+    """ Highlighted snippets of the search results. """
+
+    def test_fold_keeps_the_length(self):
+        self.assertEqual(fold('Ámbar Çà'), 'ambar ca')
+        # 'İ' lowercases to two characters: it's kept as it is.
+        self.assertEqual(len(fold('İstanbul')), len('İstanbul'))
+
+    def test_matches_ignore_case_and_accents(self):
+        text = 'La canción de la Cancion'
+        self.assertEqual(find_matches(text, 'CANCIÓN'), [(3, 10), (17, 24)])
+        self.assertEqual(len(find_matches('a' * 100, 'a')), MAX_MATCHES)
+
+    def test_highlight_escapes_the_text(self):
+        self.assertEqual(highlight('<b>Café</b> y café', 'cafe'), '&lt;b&gt;<mark>Café</mark>&lt;/b&gt; y <mark>café</mark>')
+
+    def test_snippet_is_cut_around_the_match(self):
+        text = ' '.join(['palabra'] * 100) + ' encontrada ' + ' '.join(['fin'] * 100)
+        snippet = make_snippet(text, 'Encontrada', length=80)
+        self.assertTrue(snippet.startswith('… palabra'))
+        self.assertTrue(snippet.endswith(' …'))
+        self.assertIn('<mark>encontrada</mark>', snippet)
+        self.assertLess(len(snippet), 80 + len('… <mark></mark> …'))
+
+    def test_snippet_without_match_is_the_beginning(self):
+        text = 'Primera frase. ' * 30
+        snippet = make_snippet(text, 'ausente', length=40)
+        self.assertTrue(snippet.startswith('Primera frase.'))
+        self.assertNotIn('<mark>', snippet)
+
+    def test_snippet_escapes_the_text(self):
+        self.assertEqual(make_snippet('1 < 2 & café', 'cafe'), '1 &lt; 2 &amp; <mark>café</mark>')
+
+
+class NormalizeQueryTests(SimpleTestCase):
+    """ The form of the queries in the cache key follows what the database folds. """
+
+    def test_whitespace_and_ascii_case_are_ignored(self):
+        self.assertEqual(normalize_query('  Café  '), normalize_query('café'))
+
+    def test_accents_are_only_folded_on_mysql(self):
+        self.assertNotEqual(normalize_query('CAFÉ'), normalize_query('cafe'))
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            self.assertEqual(normalize_query('  CAFÉ '), normalize_query('cafe'))
+
+
+class SearchResultsTests(LocMemCacheTestCase):
+    """ The cached hits of a query, their filters and facet counts. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author')
+        cls.news = Category.objects.create(name='News', slug_es='noticias', slug_en='news', slug_ca='noticies')
+        cls.events = Category.objects.create(name='Events', slug_es='eventos', slug_en='events', slug_ca='esdeveniments')
+        cls.posts = [
+            cls.create_post('one', 2024, cls.news, 'art'),
+            cls.create_post('two', 2025, cls.news, 'music'),
+            cls.create_post('three', 2025, cls.events, 'art'),
+        ]
+
+    @classmethod
+    def create_post(cls, slug, year, category, tag):
+        post = BlogPost.objects.create(
+            title=f'Café {slug}', slug_es=slug, slug_en=slug, slug_ca=slug, author=cls.author,
+            content='<p>Text</p>', status='published', published_date=datetime(year, 6, 1, tzinfo=dt_timezone.utc),
+        )
+        post.categories.add(category)
+        post.tags.add(tag)
+        return post
+
+    def test_equivalent_queries_share_the_cache_entry(self):
+        result = search('  Café ')
+        with self.assertNumQueries(0):
+            self.assertEqual(search('café'), result)
+
+    def test_publishing_invalidates_the_cached_results(self):
+        self.assertEqual(len(search('café')['hits']['blog']), 3)
+        with self.assertNumQueries(0):
+            search('café')
+        post = self.create_post('four', 2026, self.events, 'music')
+        hits = search('café')['hits']['blog']
+        self.assertEqual(len(hits), 4)
+        self.assertEqual(hits[0][0], post.pk)
+
+    def test_facets_are_counted_with_the_hits(self):
+        counts = search('café')['counts']
+        self.assertEqual(counts['type'], {'page': 0, 'blog': 3, 'post': 0, 'publication': 0})
+        self.assertEqual(counts['year'], {2024: 1, 2025: 2})
+        self.assertEqual(counts['category'], {self.news.pk: 2, self.events.pk: 1})
+        self.assertEqual(counts['tag'], {'art': 2, 'music': 1})
+
+    def test_each_filter_narrows_the_hits(self):
+        hits = search('café')['hits']
+        one, two, three = (post.pk for post in self.posts)
+
+        def blog_hits(**filters):
+            return {hit[0] for hit in filter_hits(hits, filters)['blog']}
+
+        self.assertEqual(blog_hits(type='page'), set())
+        self.assertEqual(blog_hits(type='blog'), {one, two, three})
+        self.assertEqual(blog_hits(category=self.news.pk), {one, two})
+        self.assertEqual(blog_hits(tag='art'), {one, three})
+        self.assertEqual(blog_hits(year=2025), {two, three})
+        self.assertEqual(blog_hits(category=self.news.pk, tag='art', year=2024), {one})
+
+        with self.assertNumQueries(0):
+            counts = count_facets(filter_hits(hits, {'tag': 'art'}))
+        self.assertEqual(counts['category'], {self.news.pk: 1, self.events.pk: 1})
+
+    def test_hydration_only_loads_the_current_page(self):
+        hits = search('café')['hits']['blog']
+        page = Paginator(hits, 2).get_page(2)
+        with mock.patch.object(QuerySet, 'in_bulk', autospec=True, side_effect=QuerySet.in_bulk) as in_bulk:
+            hydrate_page(page, BlogPost.objects.all())
+        self.assertEqual(in_bulk.call_args.args[1], [hits[2][0]])
+        self.assertEqual([post.pk for post in page.object_list], [hits[2][0]])
+
+
+class PrefixIndexTests(SimpleTestCase):
+    """ The in-memory index of the suggestions. """
+
+    def setUp(self):
+        labels = ['Modern Art', 'Artists of Barcelona', 'Café-Bar', 'The art of tea', 'Arte moderno', 'Bartók']
+        self.index = suggest.PrefixIndex([suggest.Suggestion(label, f'/{n}/', 'page') for n, label in enumerate(labels)])
+
+    def labels(self, query, limit=suggest.SUGGEST_LIMIT):
+        return [suggestion.label for suggestion in self.index.search(query, limit)]
+
+    def test_any_word_matches_in_order_of_relevance(self):
+        self.assertEqual(self.labels('art'), ['Modern Art', 'Artists of Barcelona', 'The art of tea', 'Arte moderno'])
+        self.assertEqual(self.labels('AR', limit=2), ['Modern Art', 'Artists of Barcelona'])
+        self.assertEqual(self.labels('art of'), ['The art of tea'])
+
+    def test_accents_and_punctuation_are_ignored(self):
+        self.assertEqual(self.labels('cafe bar'), ['Café-Bar'])
+        self.assertEqual(self.labels('barto'), ['Bartók'])
+
+    def test_short_queries_find_nothing(self):
+        self.assertEqual(self.labels('a'), [])
+
+    def test_stored_short_prefixes_match_the_full_lookup(self):
+        # A limit above the stored one is answered by the bisect lookup.
+        for query in ('ar', 'art', 'ba', 'bar', 'mo', 'the'):
+            self.assertEqual(self.labels(query), self.labels(query, limit=100)[:suggest.SUGGEST_LIMIT])
+
+
+class SuggestTests(LocMemCacheTestCase):
+    """ The per-worker indexes and the suggest view. """
+
+    def setUp(self):
+        super().setUp()
+        suggest._indexes.clear()
+        self.addCleanup(suggest._indexes.clear)
+        self.author = User.objects.create_user('author')
+        self.create_post('Café con leche', 'cafe')
+
+    def create_post(self, title, slug):
+        return BlogPost.objects.create(
+            title_es=title, title_en=title, title_ca=title, slug_es=slug, slug_en=slug, slug_ca=slug,
+            author=self.author, content='<p>Text</p>',
+            status='published', published_date=datetime(2025, 6, 14, tzinfo=dt_timezone.utc),
+        )
+
+    def test_the_index_is_rebuilt_when_a_list_tag_is_purged(self):
+        index = suggest.get_index('es')
+        self.assertEqual([suggestion.label for suggestion in index.search('caf')], ['Café con leche'])
+        self.assertIs(suggest.get_index('es'), index)
+
+        with mock.patch.object(suggest, 'VERSION_CHECK_INTERVAL', 0):
+            self.assertIs(suggest.get_index('es'), index)
+            BlogPost.objects.filter(slug_es='cafe').update(title_es='Café solo')
+            purge(list_tag(BlogPost))
+            rebuilt = suggest.get_index('es')
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual([suggestion.label for suggestion in rebuilt.search('caf')], ['Café solo'])
+
+    def test_suggest_view(self):
+        with translation.override('es'):
+            url = reverse('search:suggest')
+        response = self.client.get(url, {'q': 'Cafe'})
+        self.assertEqual(response.json(), {'query': 'Cafe', 'suggestions': [
+            {'label': 'Café con leche', 'url': '/es/blog/2025/6/14/cafe/', 'kind': 'blog'},
+        ]})
+        self.assertIn('max-age=60', response['Cache-Control'])
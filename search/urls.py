@@ -6,4 +6,5 @@ app_name = 'search'
 
 urlpatterns = [
     path('', views.search_results_view, name='search_results'),
+    path('suggest/', views.suggest_view, name='suggest'),
 ]
\ No newline at end of file
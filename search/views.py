@@ -1,67 +1,153 @@
 # search/views.py
 import logging
 from django.shortcuts import render
-from django.db.models import Q
 from django.core.paginator import Paginator
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import urlencode
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_GET
 
 from pages.models import Page
-from blog.models import Post
+from blog.models import Post as BlogPost
+from posts.models import Post
+from publications.models import Publication
 from site_settings.models import SiteConfiguration
+from core.page_cache import add_surrogate_keys
+from .results import RESULT_TYPES, add_snippets, count_facets, filter_hits, get_search_tags, hydrate_page, search
+from .suggest import suggest
 
 logger = logging.getLogger(__name__)
 
+# Pagination parameter of each result section.
+PAGE_PARAMS = {'page': 'p_page', 'blog': 'p_post', 'post': 'p_entry', 'publication': 'p_pub'}
+FACET_SIZE = 10
+
+
+def _get_filters(request):
+    """ The valid facet filters of the request; the others are ignored. """
+    filters = {}
+    if request.GET.get('type') in RESULT_TYPES:
+        filters['type'] = request.GET['type']
+    for name in ('category', 'year'):
+        try:
+            filters[name] = int(request.GET[name])
+        except (KeyError, ValueError):
+            pass
+    if request.GET.get('tag'):
+        filters['tag'] = request.GET['tag']
+    return filters
+
+
+def _facet_url(request, name, value):
+    """ The current search with the facet `name` set to `value` (None removes it), from page 1. """
+    query = request.GET.copy()
+    for param in PAGE_PARAMS.values():
+        query.pop(param, None)
+    if value is None:
+        query.pop(name, None)
+    else:
+        query[name] = value
+    return f'?{query.urlencode()}'
+
+
+def _build_facets(request, counts, labels, filters):
+    type_labels = {
+        'page': _("Pages"), 'blog': _("Blog Posts"), 'post': _("Posts"), 'publication': _("Publications"),
+    }
+    facet_values = (
+        ('type', _("Content type"), [(kind, type_labels[kind]) for kind in RESULT_TYPES if counts['type'][kind]]),
+        ('category', _("Categories"), [
+            (pk, labels['category'].get(pk, pk)) for pk, _count in counts['category'].most_common(FACET_SIZE)
+        ]),
+        ('tag', _("Tags"), [
+            (slug, labels['tag'].get(slug, slug)) for slug, _count in counts['tag'].most_common(FACET_SIZE)
+        ]),
+        ('year', _("Year"), [(year, year) for year in sorted(counts['year'], reverse=True)]),
+    )
+    facets = []
+    for name, title, values in facet_values:
+        options = [{
+            'label': label,
+            'count': counts[name][value],
+            'active': filters.get(name) == value,
+            # A click on the active option removes the filter.
+            'url': _facet_url(request, name, None if filters.get(name) == value else value),
+        } for value, label in values]
+        if options:
+            facets.append({'title': title, 'options': options})
+    return facets
+
+
 def search_results_view(request):
     """
-    Performs a search across Pages and Blog Posts, ordering Pages by importance,
-    and paginates the results correctly.
+    Performs a search across Pages, Blog Posts, Posts and Publications, with
+    facets (content type, category, tag and year) to filter the results.
+    Pages are ordered by importance, the rest by date, and each type is
+    paginated on its own.
     """
     try:
         site_config = SiteConfiguration.get_solo()
-        pages_per_page = site_config.search_pages_per_page
-        posts_per_page = site_config.search_posts_per_page
+        per_page = {
+            'page': site_config.search_pages_per_page,
+            'blog': site_config.search_posts_per_page,
+            'post': site_config.search_results_per_page,
+            'publication': site_config.search_results_per_page,
+        }
     except SiteConfiguration.DoesNotExist:
         logger.warning("SiteConfiguration does not exist. Using default pagination settings.")
-        pages_per_page = 5
-        posts_per_page = 5
+        per_page = dict.fromkeys(RESULT_TYPES, 5)
 
     query = request.GET.get('q', '')
-    
-    # Initialize with empty QuerySets
-    page_results_qs = Page.objects.none()
-    post_results_qs = Post.objects.none()
-
-    if query:
-        # Build the Q objects for the search query
-        page_query = Q(title__icontains=query) | Q(content__icontains=query)
-        post_query = Q(title__icontains=query) | Q(content__icontains=query)
-
-        # --- ¡LA LÓGICA CORRECTA! ---
-        # 1. Obtenemos TODAS las páginas que coinciden con la búsqueda.
-        # 2. LUEGO, las ordenamos por importancia y después por título.
-        page_results_qs = Page.objects.filter(page_query, status='published') \
-                                      .distinct() \
-                                      .order_by('importance_order', 'title')
-        
-        post_results_qs = Post.objects.filter(post_query, status='published') \
-                                      .distinct().order_by('-published_date')
-
-    # --- Paginación (ahora sobre los QuerySets correctos) ---
-    page_paginator = Paginator(page_results_qs, pages_per_page)
-    page_page_number = request.GET.get('p_page', 1)
-    paginated_page_results = page_paginator.get_page(page_page_number)
-    
-    post_paginator = Paginator(post_results_qs, posts_per_page)
-    post_page_number = request.GET.get('p_post', 1)
-    paginated_post_results = post_paginator.get_page(post_page_number)
-    
-    # --- Contexto ---
-    total_results = page_results_qs.count() + post_results_qs.count()
+    add_surrogate_keys(request, *get_search_tags())
+
+    # Every hit of the query with its facet values, cached (see search/results.py);
+    # the filters and their counts are applied here, and only the objects of
+    # the current pages are loaded.
+    result = search(query)
+    filters = _get_filters(request)
+    hits = filter_hits(result['hits'], filters) if filters else result['hits']
+    counts = count_facets(hits) if filters else result['counts']
+
+    querysets = {
+        'page': Page.objects.for_list(),
+        'blog': BlogPost.objects.for_list(),
+        'post': Post.objects.for_list(),
+        'publication': Publication.objects.prefetch_related('translations'),
+    }
+    results = {
+        kind: add_snippets(hydrate_page(
+            Paginator(hits[kind], per_page[kind]).get_page(request.GET.get(PAGE_PARAMS[kind], 1)),
+            querysets[kind],
+        ), kind, query)
+        for kind in RESULT_TYPES
+    }
+    total_results = sum(len(rows) for rows in hits.values())
 
     context = {
         'query': query,
-        'page_results': paginated_page_results,
-        'post_results': paginated_post_results,
+        'page_results': results['page'],
+        'post_results': results['blog'],
+        'news_results': results['post'],
+        'publication_results': results['publication'],
         'total_results': total_results,
+        'facets': _build_facets(request, counts, result.get('labels', {}), filters) if query else [],
+        'has_filters': bool(filters),
+        'clear_filters_url': f"?{urlencode({'q': query})}",
     }
 
-    return render(request, 'search/search_results.html', context)
\ No newline at end of file
+    return render(request, 'search/search_results.html', context)
+
+
+@require_GET
+def suggest_view(request):
+    """
+    Suggestions for the search box, as JSON: titles starting with `q` (at any
+    word) in the active language. Served from memory (search/suggest.py).
+    """
+    query = request.GET.get('q', '')[:100]
+    suggestions = [suggestion._asdict() for suggestion in suggest(query)]
+    response = JsonResponse({'query': query, 'suggestions': suggestions})
+    # Short enough for new content to show up soon.
+    patch_cache_control(response, public=True, max_age=60)
+    return response
@@ -1,7 +1,13 @@
 # File: site_settings/admin.py
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.cache import caches
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.translation import gettext_lazy as _
 from solo.admin import SingletonModelAdmin
 from modeltranslation.admin import TabbedTranslationAdmin
+from core.cache_stats import get_cache_stats, reset_cache_stats
 from .models import SiteConfiguration
 
 @admin.register(SiteConfiguration)
@@ -11,4 +17,46 @@ class SiteConfigurationAdmin(SingletonModelAdmin, TabbedTranslationAdmin):
     We keep it simple and let solo and modeltranslation handle the rendering.
     """
     # No 'fields' or 'fieldsets'. Let the libraries do their job.
-    pass
\ No newline at end of file
+    # The template only adds a "Cache statistics" link to the object tools.
+    change_form_template = 'admin/site_settings/siteconfiguration/change_form.html'
+
+    def get_urls(self):
+        custom_urls = [
+            path(
+                'cache-stats/',
+                self.admin_site.admin_view(self.cache_stats_view),
+                name='site_settings_siteconfiguration_cache_stats',
+            ),
+        ]
+        # Before solo's URLs, which catch everything under this model.
+        return custom_urls + super().get_urls()
+
+    def cache_stats_view(self, request):
+        """
+        Dashboard with the hit/miss/latency counters of the cache per key
+        family, added up across all the worker processes.
+        """
+        cache = caches['default']
+        stats = getattr(cache, 'stats', None)
+
+        if request.method == 'POST' and stats is not None and self.has_change_permission(request):
+            reset_cache_stats(cache.shared)
+            messages.success(request, _("Cache statistics reset. Workers start from zero at their next flush."))
+            return HttpResponseRedirect(request.path)
+
+        families, process_count = [], 0
+        if stats is not None:
+            # Include this process's latest numbers.
+            stats.flush(cache.shared)
+            families, process_count = get_cache_stats(cache.shared)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': _("Cache statistics"),
+            'stats_enabled': stats is not None,
+            'backend': cache.__class__.__name__,
+            'families': families,
+            'process_count': process_count,
+        }
+        return TemplateResponse(request, 'admin/site_settings/cache_stats.html', context)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SiteSettingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'site_settings'
+
+    def ready(self):
+        # Connects the signals that invalidate the page cache.
+        import site_settings.signals
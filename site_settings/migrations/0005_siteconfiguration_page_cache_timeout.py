@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('site_settings', '0004_siteconfiguration_user_profile_items_per_page'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='siteconfiguration',
+            name='page_cache_timeout',
+            field=models.PositiveIntegerField(default=600, help_text='How long full pages are cached for anonymous visitors. Pages are refreshed automatically when their content changes. Set to 0 to disable the page cache.', verbose_name='Page Cache Timeout (in seconds)'),
+        ),
+    ]
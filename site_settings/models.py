@@ -76,6 +76,11 @@ class SiteConfiguration(SingletonModel):
         verbose_name=_("Category Tree Cache Timeout (in seconds)"),
         help_text=_("How long the full category tree should be stored in cache. High values are recommended.")
     )
+    page_cache_timeout = models.PositiveIntegerField(
+        default=600, # Default to 10 minutes
+        verbose_name=_("Page Cache Timeout (in seconds)"),
+        help_text=_("How long full pages are cached for anonymous visitors. Pages are refreshed automatically when their content changes. Set to 0 to disable the page cache.")
+    )
     gallery_items_per_page = models.PositiveIntegerField(
         default=9,
         verbose_name=_("Items per Page in Gallery"),
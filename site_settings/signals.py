@@ -0,0 +1,15 @@
+# File: site_settings/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.page_cache import SITE_TAG, purge
+from .models import SiteConfiguration
+
+
+@receiver(post_save, sender=SiteConfiguration)
+def purge_page_cache_on_configuration_change(sender, instance, **kwargs):
+    """
+    The site configuration (logo, slogan, banner, pagination...) affects every
+    page, so the whole page cache is invalidated.
+    """
+    purge(SITE_TAG)
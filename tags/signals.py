@@ -0,0 +1,22 @@
+# File: tags/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.page_cache import purge_instance, purge_translation_master
+from .models import Tag
+
+TagTranslation = Tag._parler_meta.root_model
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def purge_page_cache_on_tag_change(sender, instance, **kwargs):
+    """
+    🏷️ Invalidates the tag page and the post pages that display tag labels.
+    """
+    purge_instance(instance)
+
+
+@receiver([post_save, post_delete], sender=TagTranslation)
+def purge_page_cache_on_tag_translation_change(sender, instance, **kwargs):
+    """ 🌐 Translations are saved after the tag itself. """
+    purge_translation_master(instance)
@@ -1,3 +1,25 @@
-from django.test import TestCase
+from core.page_cache import get_tag_versions, object_tag
+from core.testing import LocMemCacheTestCase
+from .models import Tag
 
-# Create your tests here.
+
+class TagPageCacheTests(LocMemCacheTestCase):
+    """ Tag pages are purged when a translation changes. """
+
+    def setUp(self):
+        super().setUp()
+        self.tag = Tag.objects.create(slug='django')
+        self.tag.set_current_language('en')
+        self.tag.label = 'Django'
+        self.tag.save()
+
+    def test_translation_save_purges_the_tag(self):
+        before = get_tag_versions([object_tag(self.tag)])
+        translation = self.tag.translations.get(language_code='en')
+        translation.label = 'Django 5'
+        translation.save()
+        self.assertNotEqual(get_tag_versions([object_tag(self.tag)]), before)
+
+    def test_deleting_the_tag_with_its_translations(self):
+        self.tag.delete()
+        self.assertFalse(Tag.objects.exists())
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TestimonialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'testimonials'
+
+    def ready(self):
+        # Connects the signals that invalidate the page cache.
+        import testimonials.signals
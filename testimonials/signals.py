@@ -0,0 +1,22 @@
+# File: testimonials/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.page_cache import purge_instance, purge_translation_master
+from .models import Testimonial
+
+TestimonialTranslation = Testimonial._parler_meta.root_model
+
+
+@receiver([post_save, post_delete], sender=Testimonial)
+def purge_page_cache_on_testimonial_change(sender, instance, **kwargs):
+    """
+    Invalidates the testimonial list and the pages with a testimonials widget.
+    """
+    purge_instance(instance)
+
+
+@receiver([post_save, post_delete], sender=TestimonialTranslation)
+def purge_page_cache_on_testimonial_translation_change(sender, instance, **kwargs):
+    """ Translations are saved after the testimonial itself. """
+    purge_translation_master(instance)
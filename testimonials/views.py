@@ -1,9 +1,11 @@
 from django.shortcuts import render
 from .models import Testimonial
+from core.page_cache import add_surrogate_keys, list_tag
 from django.utils.translation import gettext as _
 
 def testimonial_list_view(request):
     testimonials = Testimonial.objects.filter(is_active=True).order_by('-created_at')
+    add_surrogate_keys(request, list_tag(Testimonial))
     
     breadcrumbs = [
         {"url": "/", "label": _("Home")},
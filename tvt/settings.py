@@ -88,9 +88,12 @@ INSTALLED_APPS = [
     'tags',
     'comments',
     'publications',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
+    # First, so that it measures everything below it (core/profiler.py).
+    'core.middleware.RequestProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # <-- ¡Localization!
@@ -99,6 +102,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Full-page cache for anonymous visitors. Must stay after Locale, Csrf and Messages.
+    'core.middleware.AnonymousPageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'tvt.urls'
@@ -168,14 +173,97 @@ if ENVIRONMENT == 'testing' or ENVIRONMENT == 'production':
 # https://docs.djangoproject.com/en/5.2/topics/cache/
 CACHES = {
     'default': {
-        # In-memory cache for development. Fast but resets with every server restart.
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'tavata-cms-unique-cache',
-    }
+        # Two tiers (core/cache_backends.py): a small in-process LRU in front of the
+        # 'shared' cache below, which all the Passenger workers see. An invalidation
+        # made by one worker reaches the others within CHECK_INTERVAL seconds.
+        'BACKEND': 'core.cache_backends.TwoTierCache',
+        'OPTIONS': {
+            'SHARED_ALIAS': 'shared',
+            'LOCAL_MAX_ENTRIES': 500,
+            'CHECK_INTERVAL': 1,
+            # Hit/miss/latency counters per key family (admin > Site configuration > Cache statistics).
+            'STATS': True,
+        },
+    },
+    'shared': {
+        # Persistent and shared between processes, without Redis. The database cache
+        # also works ('django.core.cache.backends.db.DatabaseCache' + createcachetable).
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# --- PAGE CACHE (core.middleware.AnonymousPageCacheMiddleware) ---
+# The timeout is managed from SiteConfiguration.page_cache_timeout (0 disables it).
+# Only these query parameters are part of the page key. Requests carrying any
+# other parameter (except utm_*, fbclid and gclid) are never cached.
+PAGE_CACHE_QUERY_PARAMS = (
+    'page', 'q', 'p_page', 'p_post', 'p_entry', 'p_pub', 'posts_page', 'comments_page',
+    # Search facets.
+    'type', 'category', 'tag', 'year',
+)
+
+# --- CACHE WARM-UP (core/cache_warmup.py) ---
+# The in-process cache tier starts empty in every process. When enabled, passenger_wsgi.py
+# pre-builds the menus, category tree and widget zones as the app is loaded.
+WARM_CACHES_ON_STARTUP = config('WARM_CACHES_ON_STARTUP', default=False, cast=bool)
+
+# --- VIEW COUNTING (core/view_counting.py) ---
+# Las visitas de bots, las peticiones HEAD y las repetidas del mismo visitante
+# dentro de WINDOW segundos no se cuentan. Filtro Bloom escalable por post en la base de datos.
+VIEW_COUNTING = {
+    'ENABLED': True,
+    'WINDOW': 1800,
+    'EXPECTED_VISITORS': 1000,
+    'FALSE_POSITIVE_RATE': 0.01,
+}
+
+# --- BACKGROUND TASKS (core/tasks.py) ---
+# Cola de tareas en la base de datos, ejecutadas por `python manage.py run_worker`
+# (en el hosting, desde cron). En desarrollo, sin worker, se ejecutan en el proceso.
+TASK_QUEUE = {
+    'EAGER': config('TASK_QUEUE_EAGER', default=DEBUG, cast=bool),
+    'RETRY_DELAY': 30,
+    'LOCK_TIMEOUT': 600,
+    'POLL_INTERVAL': 2,
+    'KEEP_FINISHED_DAYS': 7,
+}
+
+# --- REQUEST PROFILER (core/profiler.py) ---
+# SQL, cache and template timings of a sample of the requests, one JSON line per
+# request. A single request can be profiled with the signed X-Profile header.
+REQUEST_PROFILER = {
+    'ENABLED': config('REQUEST_PROFILER_ENABLED', default=False, cast=bool),
+    'SAMPLE_RATE': config('REQUEST_PROFILER_SAMPLE_RATE', default=0.05, cast=float),
+    'LOG_FILE': BASE_DIR / 'logs/request_profile.jsonl',
+    'MAX_BYTES': 1024 * 1024 * 5,  # 5 MB
+    'BACKUP_COUNT': 3,
+    # Max queries per URL name (cold caches, anonymous visitor). Over budget: a
+    # warning in the log, or QueryBudgetExceeded with ENABLED and RAISE_ON_BUDGET on:
+    # every request is then checked (as in the budget tests of core/tests.py).
+    'BUDGETS': {
+        'home': 25,
+        'pages:page_detail': 25,
+        'pages:directory': 12,
+        'blog:post_list': 24,
+        'blog:post_detail': 35,
+        'posts:post_list': 24,
+        'search:search_results': 16,
+        'gallery:gallery_view': 16,
+        'categories:category_list': 12,
+    },
+    'RAISE_ON_BUDGET': config('REQUEST_PROFILER_RAISE_ON_BUDGET', default=False, cast=bool),
+    # Time of each template and template tag in the records (hooks installed at startup).
+    'TEMPLATE_DETAILS': config('REQUEST_PROFILER_TEMPLATE_DETAILS', default=False, cast=bool),
 }
 
-# Para producción, podríamos usar algo más robusto como Redis:
-# 'default': {
+# --- STATIC EXPORT (python manage.py export_static_site) ---
+# Pre-rendered HTML of the public site, one directory per language.
+STATIC_EXPORT_ROOT = BASE_DIR / 'static_export'
+
+# Si algún día hay Redis, puede sustituir a la caché 'shared':
+# 'shared': {
 #     'BACKEND': 'django.core.cache.backends.redis.RedisCache',
 #     'LOCATION': 'redis://127.0.0.1:6379/1',
 # }
@@ -297,6 +385,12 @@ LOGGING = {
         'require_debug_false': {
             '()': 'django.utils.log.RequireDebugFalse',
         },
+        # Solo una fracción de los INFO/DEBUG de los loggers con un mensaje por petición
+        'sample_info': {
+            '()': 'core.log_handlers.SamplingFilter',
+            'rate': config('LOG_INFO_SAMPLE_RATE', default=0.1, cast=float),
+            'loggers': ['core.views', 'gallery.views', 'blog.views', 'posts.views', 'accounts.views', 'widgets', 'menus', 'categories'],
+        },
     },
 
     # --- HANDLERS: A dónde se envía cada log (consola, archivo, email) ---
@@ -308,15 +402,26 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
-        # Handler para guardar en un archivo los warnings y errores
+        # Handler para guardar en un archivo los warnings y errores.
+        # Los escribe un hilo aparte (cola) y la rotación es segura con varios procesos de Passenger.
         'file_error': {
             'level': 'WARNING',
-            'class': 'logging.handlers.RotatingFileHandler',
+            'class': 'core.log_handlers.QueuedFileHandler',
             'filename': BASE_DIR / 'logs/error.log', # Ruta al archivo
             'maxBytes': 1024 * 1024 * 5,  # 5 MB
             'backupCount': 2,
             'formatter': 'verbose',
         },
+        # Handler para los INFO de nuestras apps (muestreados)
+        'file_app': {
+            'level': 'INFO',
+            'filters': ['sample_info'],
+            'class': 'core.log_handlers.QueuedFileHandler',
+            'filename': BASE_DIR / 'logs/app.log',
+            'maxBytes': 1024 * 1024 * 5,  # 5 MB
+            'backupCount': 2,
+            'formatter': 'verbose',
+        },
         # Handler para que los administradores reciban un email en caso de error 500
         'mail_admins': {
             'level': 'ERROR',
@@ -331,7 +436,7 @@ LOGGING = {
         'django': {
             'handlers': ['console', 'file_error', 'mail_admins'],
             'level': 'INFO',
-            'propagate': True,
+            'propagate': False, # Ya tiene sus handlers: no repetirlos en el raíz
         },
         # Podemos crear loggers para nuestras propias apps si queremos
         # 'blog': {
@@ -339,6 +444,11 @@ LOGGING = {
         #     'level': 'DEBUG',
         # },
     },
+    # Logger raíz: recibe los logs de nuestras apps (core, blog, widgets...)
+    'root': {
+        'handlers': ['console', 'file_error', 'file_app'],
+        'level': config('LOG_LEVEL', default='INFO'),
+    },
 }
 
 # URL to redirect to after a successful login.
@@ -5,6 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+from core import views as core_views
 
 
 # ==============================================================================
@@ -21,6 +22,13 @@ urlpatterns = [
     # next_page, we'd define a specific logout path here BEFORE this include.
     path('accounts/', include('django.contrib.auth.urls')),
     path('i18n/', include('django.conf.urls.i18n')), 
+
+    # XML sitemaps: one file for all the languages (hreflang alternates).
+    path('sitemap.xml', core_views.sitemap_index, name='sitemap_index'),
+    path('sitemap-<slug:section>-<int:number>.xml', core_views.sitemap_shard, name='sitemap_shard'),
+
+    # Read-only JSON API (api/views.py); the language is a parameter (?lang=).
+    path('api/', include('api.urls', namespace='api')),
 ]
 
 
@@ -27,6 +27,7 @@ class Widget(models.Model):
     class WidgetType(models.TextChoices):
         RECENT_POSTS = 'recent_posts', _('Recent Blog Posts')
         MOST_VIEWED_POSTS = 'most_viewed_posts', _('Most Viewed Blog Posts')
+        TRENDING_POSTS = 'trending_posts', _('Trending Posts (recent views)')
         MOST_COMMENTED_POSTS = 'most_commented_posts', _('Most Commented Blog Posts')
         BLOG_CATEGORIES = 'blog_categories', _('Blog Category List')
         EDITOR_PICKS_POSTS = 'editor_picks_posts', _("Editor's Picks (Blog Posts)")
@@ -40,6 +41,8 @@ class Widget(models.Model):
         POST_CAROUSEL = 'post_carousel', _("Post Carousel")
         USER_DIRECTORY = 'user_directory', _("User Directory")
         TESTIMONIALS = 'testimonials', _("Testimonials")
+        BLOG_ARCHIVE = 'blog_archive', _("Blog Archive (by month)")
+        POSTS_ARCHIVE = 'posts_archive', _("Posts Archive (by month)")
 
         # We can easily add more types in the future:
         # PAGE_LIST = 'page_list', _('List of Pages')
@@ -1,36 +1,43 @@
 # widgets/signals.py
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.core.cache import cache
-from django.conf import settings
 from blog.models import Post # Importamos Post porque sus cambios afectan a los widgets
-from .models import Widget
+from posts.models import Post as Posts # La mayoría de widgets de posts consultan esta app
+from core.page_cache import SITE_TAG, purge, purge_instance, zone_tag
+from .models import Widget, WidgetZone
+from .tasks import clear_all_widget_caches
 
-def clear_all_widget_caches():
-    """
-    A simple but effective strategy: clear ALL widget caches.
-    A more granular approach is possible but much more complex.
-    """
-    # Obtenemos TODOS los widgets de la base de datos
-    all_widgets = Widget.objects.all()
-    # Para cada widget y cada idioma, construimos la clave y la borramos
-    for widget in all_widgets:
-        for lang_code, _ in settings.LANGUAGES:
-            cache_key = f'widget_items_{widget.id}_{lang_code}_v1'
-            cache.delete(cache_key)
-    print("--- ALL WIDGET CACHES CLEARED ---")
+# La limpieza se hace en segundo plano (core/tasks.py). Varios cambios seguidos
+# dejan una sola tarea pendiente.
+def queue_widget_cache_clear():
+    clear_all_widget_caches.enqueue_with(unique=True)
 
 
 # Si se guarda o borra un Widget
 @receiver([post_save, post_delete], sender=Widget)
 def on_widget_change(sender, instance, **kwargs):
-    clear_all_widget_caches()
+    queue_widget_cache_clear()
+    # Las páginas cacheadas que muestran esta zona deben regenerarse.
+    purge_instance(instance, zone_tag(instance.zone.slug))
+
+# Una zona renombrada puede seguir referenciada con su slug antiguo.
+@receiver([post_save, post_delete], sender=WidgetZone)
+def on_widget_zone_change(sender, instance, **kwargs):
+    purge(SITE_TAG)
 
 # ¡LA PARTE IMPORTANTE!
 # Si se guarda o borra un Post, los widgets de "Recientes", "Vistos", etc.,
 # deben actualizarse.
 @receiver([post_save, post_delete], sender=Post)
 def on_post_change(sender, instance, **kwargs):
-    clear_all_widget_caches()
+    queue_widget_cache_clear()
+
+# Lo mismo para los posts multilingües (app 'posts'), salvo cuando solo
+# cambia el contador de visitas.
+@receiver([post_save, post_delete], sender=Posts)
+def on_posts_change(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'views_count'}:
+        return
+    queue_widget_cache_clear()
 
 # En el futuro, podríamos añadir signals para Comments, Pages, etc.
\ No newline at end of file
@@ -0,0 +1,29 @@
+# widgets/tasks.py
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.page_cache import purge, zone_tag
+from core.tasks import task
+from .models import Widget, WidgetZone
+
+logger = logging.getLogger(__name__)
+
+
+@task(priority=10)
+def clear_all_widget_caches():
+    """
+    A simple but effective strategy: clear ALL widget caches.
+    A more granular approach is possible but much more complex.
+    """
+    keys = [
+        f'widget_items_{widget_id}_{lang_code}_v1'
+        for widget_id in Widget.objects.values_list('id', flat=True)
+        for lang_code, _ in settings.LANGUAGES
+    ]
+    cache.delete_many(keys)
+    # Pages rendered since the change was saved may still hold the old
+    # fragments: their zones are purged again now that they are gone.
+    purge(*[zone_tag(slug) for slug in WidgetZone.objects.values_list('slug', flat=True)])
+    logger.info("Cleared %d widget caches.", len(keys))
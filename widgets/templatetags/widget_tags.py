@@ -6,12 +6,16 @@ from django.core.cache import cache
 from django.conf import settings # Needed for settings.LANGUAGES and settings.LANGUAGE_CODE
 
 # Import all needed models at the top
-from blog.models import Post as Post
+from blog.models import Post as Post, Comment as BlogComment
 from posts.models import Post as Posts
 from categories.models import Category # Universal Category model
 from widgets.models import Widget, WidgetZone
 from accounts.models import User
 from testimonials.models import Testimonial
+from comments.models import Comment
+from core.archives import get_archive
+from core.trending import get_trending
+from core.page_cache import add_surrogate_keys, list_tag, zone_tag
 
 # Ensure static is imported from Django's template tags
 from django.templatetags.static import static 
@@ -19,6 +23,27 @@ from django.templatetags.static import static
 logger = logging.getLogger(__name__)
 register = template.Library()
 
+# --- PAGE CACHE: models whose changes affect each widget type ---
+# A page rendering a widget depends on the list of these models, so saving
+# any instance of them invalidates the cached page (see core/page_cache.py).
+WIDGET_SOURCE_MODELS = {
+    'recent_posts': (Posts,),
+    'most_viewed_posts': (Posts,),
+    'trending_posts': (Posts,),
+    'most_commented_posts': (Posts, Comment),
+    'editor_picks_posts': (Posts,),
+    'blog_categories': (Category, Posts, Post),
+    'post_grid_recent': (Posts,),
+    'post_grid_popular': (Posts,),
+    'post_grid_commented': (Post, BlogComment),
+    'post_grid_editor': (Posts,),
+    'post_carousel': (Posts,),
+    'user_directory': (User,),
+    'testimonials': (Testimonial,),
+    'blog_archive': (Post,),
+    'posts_archive': (Posts,),
+}
+
 # --- HELPER FUNCTION: GET THUMBNAIL URL ---
 def _get_thumbnail_url(obj):
     """
@@ -38,15 +63,23 @@ def show_widget_zone(context, zone_slug):
     Renders all widgets for a specific zone, utilizing a configurable cache
     for each widget to optimize performance.
     """
+    # Tell the page cache which content this zone depends on (even if it doesn't exist yet).
+    request = context.get('request')
+    add_surrogate_keys(request, zone_tag(zone_slug))
+
     try:
         zone = WidgetZone.objects.prefetch_related('widgets').get(slug=zone_slug)
         widgets_queryset = zone.widgets.all()
     except WidgetZone.DoesNotExist:
-        logger.warning(f"Widget zone with slug '{zone_slug}' not found.")
+        logger.warning("Widget zone with slug '%s' not found.", zone_slug)
         return {'processed_widgets': []} # Return empty if zone doesn't exist
 
     processed_widgets = [] # Initialize this list here, outside the loop
 
+    for widget_instance in widgets_queryset:
+        source_models = WIDGET_SOURCE_MODELS.get(widget_instance.widget_type, ())
+        add_surrogate_keys(request, *(list_tag(model) for model in source_models))
+
     # Iterate through each widget configured for this zone
     for widget_instance in widgets_queryset: # Renamed to widget_instance for clarity
         language_code = context.get('LANGUAGE_CODE', settings.LANGUAGE_CODE)
@@ -61,7 +94,7 @@ def show_widget_zone(context, zone_slug):
         # 2. If it's a cache miss, query the database and process.
         if items_to_cache is None:
             if widget_instance.cache_timeout > 0: # Log only if caching was attempted
-                logger.info(f"CACHE MISS for widget '{widget_instance.title}' (ID: {widget_instance.id}). Querying database.")
+                logger.debug("CACHE MISS for widget '%s' (ID: %s). Querying database.", widget_instance.title, widget_instance.id)
             
             # --- WIDGET LOGIC DISPATCHER (match/case) ---
             # This 'items_container' will hold the list of items from the DB query.
@@ -69,22 +102,26 @@ def show_widget_zone(context, zone_slug):
 
             match widget_instance.widget_type:
                 case 'recent_posts':
-                    items_qs = Posts.objects.filter(status='published').order_by('-published_date')
+                    items_qs = Posts.objects.for_list().filter(status='published').order_by('-published_date')
                     items_container = list(items_qs[:widget_instance.item_count]) # Evaluate QuerySet
                 
                 case 'most_viewed_posts':
-                    items_qs = Posts.objects.filter(status='published').order_by('-views_count', '-published_date')
+                    items_qs = Posts.objects.for_list().filter(status='published').order_by('-views_count', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
 
+                case 'trending_posts':
+                    # Top K of the precomputed time-decayed scores (core/trending.py), not a sort of all posts.
+                    items_container = get_trending('posts', widget_instance.item_count)
+
                 case 'most_commented_posts':
-                    items_qs = Posts.objects.filter(status='published') \
+                    items_qs = Posts.objects.for_list().filter(status='published') \
                         .annotate(num_comments=Count('comments', filter=Q(comments__is_approved=True))) \
                         .filter(num_comments__gt=0) \
                         .order_by('-num_comments', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
                 
                 case 'editor_picks_posts':
-                    items_qs = Posts.objects.filter(status='published', editor_rating__gt=0) \
+                    items_qs = Posts.objects.for_list().filter(status='published', editor_rating__gt=0) \
                                            .order_by('-editor_rating', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
                 
@@ -95,23 +132,23 @@ def show_widget_zone(context, zone_slug):
                     items_container = list(categories_qs[:widget_instance.item_count])
                 
                 case 'post_grid_recent':
-                    items_qs = Posts.objects.filter(status='published').order_by('-published_date')
+                    items_qs = Posts.objects.for_list().filter(status='published').order_by('-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
                     # No new thumbnail_url required here, as the template will handle it dynamically.
 
                 case 'post_grid_popular':
-                    items_qs = Posts.objects.filter(status='published').order_by('-views_count', '-published_date')
+                    items_qs = Posts.objects.for_list().filter(status='published').order_by('-views_count', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
 
                 case 'post_grid_commented':
-                    items_qs = Post.objects.filter(status='published') \
+                    items_qs = Post.objects.for_list().filter(status='published') \
                                            .annotate(num_comments=Count('comments', filter=Q(comments__is_approved=True))) \
                                            .filter(num_comments__gt=0) \
                                            .order_by('-num_comments', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
                 
                 case 'post_grid_editor':
-                    items_qs = Posts.objects.filter(status='published', editor_rating__gt=0) \
+                    items_qs = Posts.objects.for_list().filter(status='published', editor_rating__gt=0) \
                                            .order_by('-editor_rating', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
 
@@ -119,7 +156,7 @@ def show_widget_zone(context, zone_slug):
                     # You can configure which posts go into the carousel.
                     # For simplicity, let's use a "top N" most recent posts or highly rated posts.
                     # This example uses editor_rating > 0.
-                    items_qs = Posts.objects.filter(status='published', editor_rating__gt=0) \
+                    items_qs = Posts.objects.for_list().filter(status='published', editor_rating__gt=0) \
                                            .order_by('-editor_rating', '-published_date')
                     items_container = list(items_qs[:widget_instance.item_count])
 
@@ -133,14 +170,19 @@ def show_widget_zone(context, zone_slug):
                     items_qs = Testimonial.objects.filter(is_active=True).order_by('-created_at')
                     items_container = list(items_qs[:widget_instance.item_count])
 
+                case 'blog_archive' | 'posts_archive':
+                    # Years with their months, from the precomputed counts (one small query).
+                    section = 'blog' if widget_instance.widget_type == 'blog_archive' else 'posts'
+                    items_container = get_archive(section)[:widget_instance.item_count]
+
                 case _: # Unrecognized widget type
-                    logger.warning(f"Unrecognized widget type '{widget_instance.widget_type}' for widget '{widget_instance.title}'.")
+                    logger.warning("Unrecognized widget type '%s' for widget '%s'.", widget_instance.widget_type, widget_instance.title)
                     items_container = [] # Empty list for safety.
             
             # --- Common Post-based Processing (Applies only to Post items) ---
             # Attach thumbnail_url to Post objects. This runs once per item on cache miss.
             # This should not run for categories.
-            if widget_instance.widget_type in ['recent_posts', 'most_viewed_posts', 'most_commented_posts', 'editor_picks_posts', 'post_grid_recent', 'post_grid_popular', 'post_grid_commented', 'post_grid_editor', 'post_carousel', 'user_directory', 'testimonials']:
+            if widget_instance.widget_type in ['recent_posts', 'most_viewed_posts', 'trending_posts', 'most_commented_posts', 'editor_picks_posts', 'post_grid_recent', 'post_grid_popular', 'post_grid_commented', 'post_grid_editor', 'post_carousel', 'user_directory', 'testimonials']:
                 for post_obj in items_container: 
                     # post_obj is already a Post instance here (from items_container)
                     post_obj.thumbnail_url = _get_thumbnail_url(post_obj)
@@ -150,9 +192,9 @@ def show_widget_zone(context, zone_slug):
             # 3. Store result in cache if timeout is set.
             if widget_instance.cache_timeout > 0: # Only cache if timeout > 0
                 cache.set(cache_key, items_to_cache, widget_instance.cache_timeout)
-                logger.info(f"CACHE SET for widget '{widget_instance.title}' (ID: {widget_instance.id}) for {widget_instance.cache_timeout} seconds.")
+                logger.debug("CACHE SET for widget '%s' (ID: %s) for %s seconds.", widget_instance.title, widget_instance.id, widget_instance.cache_timeout)
         else: # Cache HIT
-            logger.info(f"CACHE HIT for widget '{widget_instance.title}' (ID: {widget_instance.id}). Serving from cache.")
+            logger.debug("CACHE HIT for widget '%s' (ID: %s). Serving from cache.", widget_instance.title, widget_instance.id)
 
         # --- IMPORTANT: Append to processed_widgets list outside the `if items_to_cache is None` block ---
         # `items_to_cache` will hold either the cached value or the newly fetched value.
@@ -1,3 +1,26 @@
-from django.test import TestCase
+from django.core.cache import cache
 
-# Create your tests here.
+from core.page_cache import get_tag_versions, zone_tag
+from core.testing import LocMemCacheTestCase
+from .models import Widget, WidgetZone
+from .tasks import clear_all_widget_caches
+
+
+class ClearWidgetCachesTests(LocMemCacheTestCase):
+    """ The deferred widget cache clear. """
+
+    def setUp(self):
+        super().setUp()
+        self.zone = WidgetZone.objects.create(name='Sidebar', slug='sidebar')
+        self.widget = Widget.objects.create(zone=self.zone, widget_type=Widget.WidgetType.RECENT_POSTS, title='Recent')
+
+    def test_clears_the_fragments_then_purges_the_zones(self):
+        key = f'widget_items_{self.widget.pk}_en_v1'
+        cache.set(key, ['stale'])
+        # A page rendered between the change and the task keeps the old fragment.
+        before = get_tag_versions([zone_tag(self.zone.slug)])
+
+        clear_all_widget_caches()
+
+        self.assertIsNone(cache.get(key))
+        self.assertNotEqual(get_tag_versions([zone_tag(self.zone.slug)]), before)